@@ -0,0 +1,104 @@
+"""Benchmark parsing EDGAR viewer pages and R-files.
+
+The pages saved in ``benchmarks/fixtures`` are shaped like the ones EDGAR
+serves. Run from the repository root::
+
+    python benchmarks/bench_html.py
+"""
+import io
+from pathlib import Path
+import re
+import timeit
+from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
+import lxml.html
+import pandas as pd
+from financialdatapy.htmltable import find_report_table
+from financialdatapy.htmltable import read_table
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+def legacy_menu(content: bytes) -> dict:
+    """Statement files found in the viewer menu as it was done before."""
+    soup = BeautifulSoup(content.decode('utf-8'), 'html.parser')
+    menu = soup.find(id='menu')
+    a = menu.find_next('a', string='Financial Statements')
+    li = a.find_next('ul').find_all('li')
+    return {
+        x.get_text(): re.search(r'r\d', str(x), flags=re.I).group().upper()
+        for x in li
+    }
+
+
+def strainer_menu(content: bytes) -> dict:
+    """Statement files found by parsing only the menu with lxml in bs4."""
+    soup = BeautifulSoup(content, 'lxml',
+                         parse_only=SoupStrainer(id='menu'))
+    a = soup.find('a', string='Financial Statements')
+    li = a.find_next('ul').find_all('li')
+    return {
+        x.get_text(): re.search(r'r\d', str(x), flags=re.I).group().upper()
+        for x in li
+    }
+
+
+def current_menu(content: bytes) -> dict:
+    """Statement files found in the viewer menu as it is done now."""
+    document = lxml.html.fromstring(content)
+    menu = document.get_element_by_id('menu')
+    a = menu.xpath(
+        "(descendant::a | following::a)[. = 'Financial Statements'][1]"
+    )[0]
+    li = list(a.xpath('following::ul[1]')[0].iter('li'))
+    return {
+        x.text_content(): re.search(
+            r'r\d', lxml.html.tostring(x, encoding='unicode'), flags=re.I
+        ).group().upper()
+        for x in li
+    }
+
+
+def legacy_table(content: bytes) -> pd.DataFrame:
+    """R-file table read as it was done before."""
+    soup = BeautifulSoup(content.decode('utf-8'), 'html.parser')
+    table = soup.find('table', class_='report')
+    return pd.read_html(io.StringIO(str(table)), thousands=None)[0]
+
+
+def strainer_table(content: bytes) -> pd.DataFrame:
+    """R-file table read by parsing only the table with lxml in bs4."""
+    soup = BeautifulSoup(content, 'lxml',
+                         parse_only=SoupStrainer('table', class_='report'))
+    return pd.read_html(io.StringIO(str(soup)), thousands=None)[0]
+
+
+def current_table(content: bytes) -> pd.DataFrame:
+    """R-file table read as it is done now."""
+    document = lxml.html.fromstring(content)
+    return read_table(find_report_table(document))
+
+
+def main() -> None:
+    viewer = (FIXTURES / 'viewer.htm').read_bytes()
+    r_file = (FIXTURES / 'R4.htm').read_bytes()
+
+    assert legacy_menu(viewer) == strainer_menu(viewer) == current_menu(viewer)
+    pd.testing.assert_frame_equal(
+        legacy_table(r_file).astype(object),
+        current_table(r_file).astype(object),
+    )
+
+    for page, content, funcs in [
+        ('viewer', viewer, [legacy_menu, strainer_menu, current_menu]),
+        ('R-file', r_file, [legacy_table, strainer_table, current_table]),
+    ]:
+        for func in funcs:
+            label = func.__name__.split('_')[0]
+            best = min(timeit.repeat(lambda: func(content), number=20,
+                                     repeat=5))
+            print(f'{page:>6} {label:>9}: {best / 20 * 1000:.2f} ms per page')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""Benchmark converting price data to dataframes.
+
+The chart is shaped like the one Yahoo returns for decades of daily prices,
+and the volumes like the ones investing.com writes.
+Run from the repository root::
+
+    python benchmarks/bench_price.py
+"""
+import random
+import timeit
+import warnings
+import pandas as pd
+from financialdatapy.numeric import parse_number
+from financialdatapy.numeric import parse_numbers
+from financialdatapy.price import UsMarket
+
+# 2021-08-03 09:30 in New York
+LAST_OPEN = 1627997400
+
+
+def make_payload(n_days: int = 12_000) -> dict:
+    """Make a response body of Yahoo chart api with daily prices."""
+    random.seed(0)
+    timestamps = [LAST_OPEN - 86400 * i for i in range(n_days)][::-1]
+    close = [round(random.uniform(1, 500), 6) for _ in range(n_days)]
+    quote = {
+        'open': [x * random.uniform(0.98, 1.02) for x in close],
+        'high': [x * random.uniform(1, 1.03) for x in close],
+        'low': [x * random.uniform(0.97, 1) for x in close],
+        'close': close,
+        'volume': [random.randint(0, 10 ** 8) for _ in range(n_days)],
+    }
+    result = {
+        'meta': {'exchangeTimezoneName': 'America/New_York'},
+        'timestamp': timestamps,
+        'indicators': {'quote': [quote]},
+    }
+    return {'chart': {'result': [result], 'error': None}}
+
+
+def legacy_convert(data: dict) -> pd.DataFrame:
+    """Conversion as it was done one timestamp at a time before."""
+    result_data = data['chart']['result'][0]
+    timestamp = result_data['timestamp']
+    price_data = dict(result_data['indicators']['quote'][0])
+    date_range = [pd.to_datetime(x, unit='s').normalize() for x in timestamp]
+    price_data['Date'] = date_range
+    price_table = pd.DataFrame(
+        price_data, columns=['Date', 'close', 'open', 'high', 'low', 'volume']
+    )
+    with warnings.catch_warnings():
+        # the dates were rounded along with the prices
+        warnings.simplefilter('ignore', UserWarning)
+        price_table = price_table.round(2)
+    price_table.columns = [x.capitalize() for x in price_table.columns]
+    return price_table
+
+
+def make_volumes(n_days: int = 12_000) -> pd.Series:
+    """Make volumes abbreviated with K and M, as the legacy parser needs."""
+    random.seed(0)
+    return pd.Series([
+        random.choice([f'{random.uniform(1, 999):.2f}K',
+                       f'{random.uniform(1, 99):.2f}M'])
+        for _ in range(n_days)
+    ])
+
+
+def legacy_volume(volume: pd.Series) -> pd.Series:
+    """Volumes parsed row by row as it was done before."""
+    volume = volume.apply(
+        lambda x: float(x[:-1]) * 1000000 if x[-1] == 'M'
+        else float(x[:-1]) * 1000
+    )
+    return volume.astype('int')
+
+
+def per_value_volume(volume: pd.Series) -> pd.Series:
+    """Volumes parsed one value at a time by the shared parser."""
+    return pd.Series(map(parse_number, volume)).astype('int64')
+
+
+def current_volume(volume: pd.Series) -> pd.Series:
+    """Volumes parsed as it is done now."""
+    return pd.Series(parse_numbers(volume).astype('int64'))
+
+
+class SavedMarket(UsMarket):
+    """UsMarket reading a saved chart instead of requesting it."""
+
+    def __init__(self, data: dict, dtype: str = 'float64') -> None:
+        end = pd.Timestamp('2021-08-03')
+        super().__init__('AAPL', end - pd.Timedelta(days=12_000), end, dtype)
+        self.data = data
+
+    def _get_raw_price_data(self, start: pd.Timestamp,
+                            end: pd.Timestamp) -> dict:
+        return self.data
+
+
+def main() -> None:
+    payload = make_payload()
+    pd.testing.assert_frame_equal(
+        legacy_convert(payload),
+        SavedMarket(payload).get_price_data(),
+    )
+
+    for label, func in [
+        ('legacy', legacy_convert),
+        ('current', lambda x: SavedMarket(x).get_price_data()),
+        ('float32', lambda x: SavedMarket(x, 'float32').get_price_data()),
+    ]:
+        best = min(timeit.repeat(lambda: func(payload), number=5, repeat=5))
+        print(f'{label:>8}: {best / 5 * 1000:.2f} ms per chart')
+
+    volumes = make_volumes()
+    pd.testing.assert_series_equal(legacy_volume(volumes),
+                                   current_volume(volumes))
+
+    for func in [legacy_volume, per_value_volume, current_volume]:
+        label = func.__name__.rsplit('_', 1)[0]
+        best = min(timeit.repeat(lambda: func(volumes), number=5, repeat=5))
+        print(f'{label:>9}: {best / 5 * 1000:.2f} ms per volumes')
+
+
+if __name__ == '__main__':
+    main()
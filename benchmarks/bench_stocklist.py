@@ -0,0 +1,64 @@
+"""Benchmark cleaning the US stock list received from SEC.
+
+Run from the repository root::
+
+    python benchmarks/bench_stocklist.py
+"""
+import random
+import re
+from string import capwords
+import timeit
+import pandas as pd
+from financialdatapy.stocklist import UsStockList
+
+WORDS = ['APPLE', 'inc', 'Corp', 'HOLDINGS', 'group', 'Ltd', '3m', "o'reilly",
+         'coca-cola', 'Trust', 'BANCORP', 'Therapeutics', 'Energy', 'Acme']
+SUFFIXES = [''] * 8 + ['/DE', '\\md', ' /NEW/']
+EXCHANGES = ['Nasdaq', 'NYSE', 'OTC', 'CBOE', None]
+
+
+def make_payload(n_rows: int = 12_000) -> dict:
+    """Make company_tickers_exchange.json shaped like the one from SEC."""
+    random.seed(0)
+    data = []
+    for i in range(n_rows):
+        name = ' '.join(random.choices(WORDS, k=random.randint(1, 5)))
+        data.append([
+            100_000 + i,
+            name + random.choice(SUFFIXES),
+            f'T{i}',
+            random.choice(EXCHANGES),
+        ])
+    return {'fields': ['cik', 'name', 'ticker', 'exchange'], 'data': data}
+
+
+def legacy_clean(cik_data: dict) -> pd.DataFrame:
+    """Cleaning as it was done row by row before."""
+    cik_list = pd.DataFrame(cik_data['data'], columns=cik_data['fields'])
+    cik_list['exchange'] = cik_list['exchange'].str.upper()
+    exchange = cik_list['exchange']
+    cik_list = cik_list[(exchange == 'NASDAQ') | (exchange == 'NYSE')]
+    cik_list = cik_list.reset_index(drop=True)
+    cik_list = cik_list.drop('exchange', axis=1)
+    cik_list['cik'] = cik_list['cik'].astype(str).str.zfill(10)
+    regex = re.compile(r'\s?(\/|\\)[a-zA-Z]*', flags=re.I)
+    cik_list['name'] = [regex.sub('', x) for x in cik_list['name']]
+    cik_list['name'] = [capwords(x) for x in cik_list['name']]
+    return cik_list
+
+
+def main() -> None:
+    payload = make_payload()
+    pd.testing.assert_frame_equal(
+        legacy_clean(payload),
+        UsStockList._clean_stock_list(payload),
+    )
+
+    for label, func in [('legacy', legacy_clean),
+                        ('current', UsStockList._clean_stock_list)]:
+        best = min(timeit.repeat(lambda: func(payload), number=20, repeat=5))
+        print(f'{label:>8}: {best / 20 * 1000:.2f} ms per list')
+
+
+if __name__ == '__main__':
+    main()
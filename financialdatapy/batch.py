@@ -0,0 +1,85 @@
+"""This module retrieves data of many stocks at once."""
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from typing import Optional
+from financialdatapy.stock import Stock
+
+#: Columns of the price data returned by :func:`get_prices`.
+PRICE_COLUMNS = ['Symbol', 'Date', 'Close', 'Open', 'High', 'Low', 'Volume']
+
+
+def _get_price(symbol: str, start: Optional[str], end: Optional[str],
+               country_code: str) -> pd.DataFrame:
+    """Get historical stock price data of a stock with its symbol attached.
+
+    :param symbol: Symbol of a company/stock.
+    :type symbol: str
+    :param start: Start date to query.
+    :type start: str or None
+    :param end: End date to query.
+    :type end: str or None
+    :param country_code: Country where the stock is listed.
+    :type country_code: str
+    :return: Historical stock price data with 'Symbol' column.
+    :rtype: pandas.DataFrame
+    """
+    price = Stock(symbol, country_code).price(start, end)
+    price.insert(0, 'Symbol', symbol)
+    return price
+
+
+def get_prices(
+    symbols: list[str],
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    country_code: str = 'USA',
+    max_workers: int = 8,
+) -> tuple[pd.DataFrame, dict[str, Exception]]:
+    """Get historical stock price data of many stocks concurrently.
+
+    A stock that fails does not stop the others. Its error is reported in
+    the returned failures instead. Symbols are stripped and uppercased, so
+    the same stock given twice is retrieved once.
+
+    :param symbols: Symbols of companies/stocks.
+    :type symbols: list[str]
+    :param start: Start date to query. Format should be in ISO 8601,
+        defaults to None.
+    :type start: str, optional
+    :param end: End date to query. Format should be in ISO 8601, defaults to
+        None.
+    :type end: str, optional
+    :param country_code: Country where the stocks are listed, defaults to
+        'USA'.
+    :type country_code: str, optional
+    :param max_workers: Maximum number of stocks retrieved at the same time,
+        defaults to 8.
+    :type max_workers: int, optional
+    :return: Historical stock price data of every stock retrieved in long
+        format with 'Symbol' column, and the error of each stock failed.
+    :rtype: tuple[pandas.DataFrame, dict[str, Exception]]
+    """
+    symbols = list(dict.fromkeys(x.strip().upper() for x in symbols))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            symbol: executor.submit(_get_price, symbol, start, end,
+                                    country_code)
+            for symbol in symbols
+        }
+
+    prices = []
+    failures = {}
+
+    for symbol, future in futures.items():
+        try:
+            prices.append(future.result())
+        except Exception as error:
+            failures[symbol] = error
+
+    if not prices:
+        return pd.DataFrame(columns=PRICE_COLUMNS), failures
+
+    price_data = pd.concat(prices, ignore_index=True)
+
+    return price_data, failures
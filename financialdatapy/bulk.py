@@ -0,0 +1,268 @@
+"""This module loads bulk archives of EDGAR into a local store."""
+from contextlib import contextmanager
+import json
+from pathlib import Path
+import re
+import shutil
+import sqlite3
+import threading
+import zipfile
+import zlib
+from typing import Iterator, Optional
+from financialdatapy.cache import get_cache_dir
+from financialdatapy.ratelimit import get_rate_limiter
+from financialdatapy.request import get_sec_user_agent
+from financialdatapy.retry import DEFAULT_TIMEOUT
+from financialdatapy.session import get_session_manager
+
+#: Url of the nightly archives of every company's submissions and facts.
+BULK_URL = 'https://www.sec.gov/Archives/edgar/daily-index/bulkdata/'
+
+_FIELDS = ('accessionNumber', 'form', 'primaryDocument', 'filingDate')
+
+_MEMBER = re.compile(r'CIK(\d{10})(-submissions-\d+)?\.json$')
+
+_INSERT_BATCH = 50_000
+
+
+def download_bulk_archive(name: str, path: str | Path) -> Path:
+    """Download a bulk archive of EDGAR, writing it to disk as it arrives.
+
+    :param name: Name of the archive, 'submissions.zip' or
+        'companyfacts.zip'.
+    :type name: str
+    :param path: File to write the archive to.
+    :type path: str or pathlib.Path
+    :return: Path of the archive.
+    :rtype: pathlib.Path
+    """
+    url = BULK_URL + name
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    rate_limiter = get_rate_limiter()
+    if rate_limiter is not None:
+        rate_limiter.acquire(url)
+
+    session = get_session_manager().get_session(url)
+    headers = {'User-Agent': get_sec_user_agent()}
+
+    with session.get(url, headers=headers, stream=True,
+                     timeout=DEFAULT_TIMEOUT) as res:
+        res.raise_for_status()
+        tmp_path = path.with_name(f'.{path.name}.part')
+        with open(tmp_path, 'wb') as f:
+            shutil.copyfileobj(res.raw, f)
+        tmp_path.replace(path)
+
+    return path
+
+
+class BulkStore:
+    """A class storing EDGAR bulk archives in a SQLite file indexed by CIK.
+
+    Members of an archive are read from the zip one at a time, so the
+    archive is never extracted. Filings are kept as rows and the facts of
+    each company as a compressed json document.
+
+    :param path: Path of the SQLite file, defaults to None. If None,
+        ``edgar.sqlite3`` in :func:`financialdatapy.cache.get_cache_dir` is
+        used.
+    :type path: Optional[str | pathlib.Path], optional
+    """
+
+    def __init__(self, path: Optional[str | Path] = None) -> None:
+        """Initialize BulkStore."""
+        if path is None:
+            path = get_cache_dir() / 'edgar.sqlite3'
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._create_tables()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection to the store, committing on success.
+
+        :return: Connection to the SQLite file.
+        :rtype: Iterator[sqlite3.Connection]
+        """
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _create_tables(self) -> None:
+        """Create the tables of the store if they do not exist."""
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS filings ('
+                'cik TEXT NOT NULL, accession_number TEXT NOT NULL, '
+                'form TEXT, primary_document TEXT, filing_date TEXT, '
+                'recent INTEGER NOT NULL, '
+                'PRIMARY KEY (cik, accession_number))'
+            )
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS facts ('
+                'cik TEXT PRIMARY KEY, data BLOB NOT NULL)'
+            )
+
+    @staticmethod
+    def _iter_members(
+            zip_path: str | Path) -> Iterator[tuple[str, bool, dict]]:
+        """Read json members of a bulk archive one at a time.
+
+        :param zip_path: Path of the archive.
+        :type zip_path: str or pathlib.Path
+        :return: CIK of each member, whether it is the main file of the
+            company rather than a page of older filings, and its content.
+        :rtype: Iterator[tuple[str, bool, dict]]
+        """
+        with zipfile.ZipFile(zip_path) as zip_file:
+            for info in zip_file.infolist():
+                match = _MEMBER.search(info.filename)
+                if match is None:
+                    continue
+                with zip_file.open(info) as member:
+                    data = json.load(member)
+                yield match.group(1), match.group(2) is None, data
+
+    def load_submissions(self, zip_path: str | Path) -> int:
+        """Load filings of every company from submissions.zip.
+
+        The filings stored before are replaced, as the archive holds every
+        filing of every company.
+
+        :param zip_path: Path of submissions.zip.
+        :type zip_path: str or pathlib.Path
+        :return: Number of filings loaded.
+        :rtype: int
+        """
+        count = 0
+        rows = []
+
+        with self._lock, self._connect() as conn:
+            conn.execute('DELETE FROM filings')
+            for cik, is_main, data in self._iter_members(zip_path):
+                page = data['filings']['recent'] if is_main else data
+                columns = [page.get(x, []) for x in _FIELDS]
+                for acc, form, doc, date in zip(*columns):
+                    rows.append((cik, acc.replace('-', ''), form, doc, date,
+                                 int(is_main)))
+
+                if len(rows) >= _INSERT_BATCH:
+                    count += self._insert_filings(conn, rows)
+                    rows = []
+
+            count += self._insert_filings(conn, rows)
+
+        return count
+
+    @staticmethod
+    def _insert_filings(conn: sqlite3.Connection, rows: list) -> int:
+        """Insert filings, keeping a filing recent if any file lists it so.
+
+        :param conn: Connection to the store.
+        :type conn: sqlite3.Connection
+        :param rows: Filings to insert.
+        :type rows: list
+        :return: Number of filings inserted.
+        :rtype: int
+        """
+        conn.executemany(
+            'INSERT INTO filings VALUES (?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT (cik, accession_number) '
+            'DO UPDATE SET recent = max(recent, excluded.recent)',
+            rows,
+        )
+        return len(rows)
+
+    def load_companyfacts(self, zip_path: str | Path) -> int:
+        """Load XBRL facts of every company from companyfacts.zip.
+
+        :param zip_path: Path of companyfacts.zip.
+        :type zip_path: str or pathlib.Path
+        :return: Number of companies loaded.
+        :rtype: int
+        """
+        count = 0
+
+        with self._lock, self._connect() as conn:
+            for cik, _, data in self._iter_members(zip_path):
+                blob = zlib.compress(json.dumps(data).encode('utf-8'))
+                conn.execute('INSERT OR REPLACE INTO facts VALUES (?, ?)',
+                             (cik, blob))
+                count += 1
+
+        return count
+
+    def get_submissions(self, cik: str,
+                        full_history: bool = False) -> dict | None:
+        """Get filings of a company in the format of EDGAR submissions.
+
+        :param cik: CIK of a company.
+        :type cik: str
+        :param full_history: Option for getting older filings too, defaults to
+            False.
+        :type full_history: bool, optional
+        :return: Each field of the filings mapped with its values, the
+            latest first, or None if the company is not stored.
+        :rtype: dict or None
+        """
+        query = (
+            'SELECT accession_number, form, primary_document, filing_date '
+            'FROM filings WHERE cik = ?'
+        )
+        if not full_history:
+            query += ' AND recent = 1'
+        query += ' ORDER BY filing_date DESC, accession_number DESC'
+
+        with self._connect() as conn:
+            rows = conn.execute(query, (cik,)).fetchall()
+
+        if not rows:
+            return None
+
+        return dict(zip(_FIELDS, map(list, zip(*rows))))
+
+    def get_company_facts(self, cik: str) -> dict | None:
+        """Get XBRL facts of a company.
+
+        :param cik: CIK of a company.
+        :type cik: str
+        :return: Facts in the format of EDGAR companyfacts, or None if the
+            company is not stored.
+        :rtype: dict or None
+        """
+        with self._connect() as conn:
+            row = conn.execute('SELECT data FROM facts WHERE cik = ?',
+                               (cik,)).fetchone()
+
+        if row is None:
+            return None
+
+        return json.loads(zlib.decompress(row[0]))
+
+
+_bulk_store = None
+
+
+def get_bulk_store() -> BulkStore | None:
+    """Get the bulk store EDGAR data is read from before the web.
+
+    :return: Shared bulk store, or None if it is not enabled.
+    :rtype: BulkStore or None
+    """
+    return _bulk_store
+
+
+def set_bulk_store(bulk_store: BulkStore | None) -> None:
+    """Enable reading EDGAR data from a bulk store, or disable it with None.
+
+    :param bulk_store: Bulk store to share from now on.
+    :type bulk_store: BulkStore or None
+    """
+    global _bulk_store
+    _bulk_store = bulk_store
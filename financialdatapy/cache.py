@@ -0,0 +1,350 @@
+"""This module caches http responses on disk across processes."""
+from contextlib import contextmanager
+import hashlib
+import json
+import os
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from typing import Iterator, Optional
+from urllib.parse import urlsplit
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+#: Seconds a cached response of each host is served without revalidation.
+DEFAULT_TTL = {
+    'www.sec.gov': 24 * 60 * 60,
+    'data.sec.gov': 6 * 60 * 60,
+    'opendart.fss.or.kr': 24 * 60 * 60,
+}
+
+
+def get_cache_dir() -> Path:
+    """Get the directory where financialdatapy keeps cached data.
+
+    The directory can be changed with FINANCIALDATAPY_CACHE_DIR environment
+    variable.
+
+    :return: Path of the cache directory.
+    :rtype: pathlib.Path
+    """
+    cache_dir = os.environ.get('FINANCIALDATAPY_CACHE_DIR')
+
+    if cache_dir is None:
+        return Path.home() / '.cache' / 'financialdatapy'
+
+    return Path(cache_dir)
+
+
+def make_cache_key(method: str, url: str,
+                   params: Optional[dict] = None,
+                   data: Optional[dict] = None) -> str:
+    """Make a key identifying a request.
+
+    :param method: Http method of the request.
+    :type method: str
+    :param url: Url of the request.
+    :type url: str
+    :param params: URL parameters of the request, defaults to None.
+    :type params: Optional[dict], optional
+    :param data: Data of the POST request, defaults to None.
+    :type data: Optional[dict], optional
+    :return: Hash of the request.
+    :rtype: str
+    """
+    request = json.dumps(
+        [method.lower(), url, params or {}, data or {}],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(request.encode('utf-8')).hexdigest()
+
+
+class CachedResponse:
+    """A class representing a response stored in the cache.
+
+    :param url: Url of the request.
+    :type url: str
+    :param content: Body of the response.
+    :type content: bytes
+    :param headers: Http response headers.
+    :type headers: dict
+    :param stored_at: Unix time the response was received or revalidated.
+    :type stored_at: float
+    """
+
+    def __init__(self, url: str, content: bytes,
+                 headers: dict, stored_at: float) -> None:
+        """Initialize CachedResponse."""
+        self.url = url
+        self.content = content
+        self.headers = headers
+        self.stored_at = stored_at
+
+    @property
+    def etag(self) -> str | None:
+        """ETag the source attached to the response.
+
+        :return: ETag or None.
+        :rtype: str or None
+        """
+        return CaseInsensitiveDict(self.headers).get('ETag')
+
+    @property
+    def last_modified(self) -> str | None:
+        """Last-Modified date the source attached to the response.
+
+        :return: Last-Modified date or None.
+        :rtype: str or None
+        """
+        return CaseInsensitiveDict(self.headers).get('Last-Modified')
+
+    def validators(self) -> dict:
+        """Build headers asking the source whether the response changed.
+
+        :return: Conditional request headers.
+        :rtype: dict
+        """
+        headers = {}
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def to_response(self) -> requests.Response:
+        """Rebuild a response object from the cached response.
+
+        :return: Response object.
+        :rtype: requests.Response
+        """
+        res = requests.Response()
+        res.status_code = 200
+        res.url = self.url
+        res.headers = CaseInsensitiveDict(self.headers)
+        res.encoding = get_encoding_from_headers(res.headers)
+        res._content = self.content
+        return res
+
+
+class ResponseCache:
+    """A class storing http responses in a SQLite file.
+
+    Only responses from hosts given a TTL are cached. A stale response is
+    revalidated with its ETag or Last-Modified date, so an unchanged one
+    costs a 304 instead of the whole body. When the cache grows over
+    ``max_size``, the least recently used responses are evicted.
+
+    :param path: Path of the SQLite file, defaults to None. If None,
+        ``responses.sqlite`` in :func:`get_cache_dir` is used.
+    :type path: Optional[str | pathlib.Path], optional
+    :param ttl: Seconds a response of each host stays fresh, defaults to None.
+        If None, :data:`DEFAULT_TTL` is used.
+    :type ttl: Optional[dict], optional
+    :param default_ttl: Seconds a response of a host not in ``ttl`` stays
+        fresh, defaults to None. If None, those responses are not cached.
+    :type default_ttl: Optional[float], optional
+    :param max_size: Maximum total bytes of cached bodies, defaults to 512 MiB.
+    :type max_size: int, optional
+    :param methods: Http methods whose responses are cached,
+        defaults to ('get',).
+    :type methods: tuple, optional
+    """
+
+    def __init__(
+        self,
+        path: Optional[str | Path] = None,
+        ttl: Optional[dict] = None,
+        default_ttl: Optional[float] = None,
+        max_size: int = 512 * 1024 * 1024,
+        methods: tuple = ('get',),
+    ) -> None:
+        """Initialize ResponseCache."""
+        if path is None:
+            path = get_cache_dir() / 'responses.sqlite'
+        self.path = Path(path)
+        self.ttl = DEFAULT_TTL if ttl is None else ttl
+        self.default_ttl = default_ttl
+        self.max_size = max_size
+        self.methods = methods
+        self._lock = threading.Lock()
+        self._create_table()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection to the SQLite file, committing when done.
+
+        :return: Connection to the cache.
+        :rtype: Iterator[sqlite3.Connection]
+        """
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _create_table(self) -> None:
+        """Create the table storing responses if it does not exist."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, url TEXT, headers TEXT, content BLOB, '
+                'size INTEGER, stored_at REAL, accessed_at REAL)'
+            )
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS responses_accessed_at '
+                'ON responses (accessed_at)'
+            )
+
+    def get_ttl(self, url: str) -> float | None:
+        """Get seconds a response from the url stays fresh.
+
+        :param url: Url of the request.
+        :type url: str
+        :return: TTL in seconds, or None if the response is not cached.
+        :rtype: float or None
+        """
+        host = urlsplit(url).hostname or ''
+        return self.ttl.get(host, self.default_ttl)
+
+    def is_cacheable(self, method: str, url: str) -> bool:
+        """Check if the response of the request should be cached.
+
+        :param method: Http method of the request.
+        :type method: str
+        :param url: Url of the request.
+        :type url: str
+        :return: True if the response should be cached.
+        :rtype: bool
+        """
+        return method.lower() in self.methods and self.get_ttl(url) is not None
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        """Check if the cached response can be served without revalidation.
+
+        :param entry: Cached response.
+        :type entry: CachedResponse
+        :return: True if the response is within its TTL.
+        :rtype: bool
+        """
+        ttl = self.get_ttl(entry.url)
+        if ttl is None:
+            return False
+        return time.time() - entry.stored_at < ttl
+
+    def get(self, key: str) -> CachedResponse | None:
+        """Get a cached response and mark it as recently used.
+
+        :param key: Key of the request made by :func:`make_cache_key`.
+        :type key: str
+        :return: Cached response, or None if it is not cached.
+        :rtype: CachedResponse or None
+        """
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                'SELECT url, headers, content, stored_at '
+                'FROM responses WHERE key = ?',
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                'UPDATE responses SET accessed_at = ? WHERE key = ?',
+                (time.time(), key),
+            )
+
+        url, headers, content, stored_at = row
+        return CachedResponse(url, content, json.loads(headers), stored_at)
+
+    def set(self, key: str, url: str, res: requests.Response) -> None:
+        """Store a response, evicting old ones if the cache is full.
+
+        :param key: Key of the request made by :func:`make_cache_key`.
+        :type key: str
+        :param url: Url of the request.
+        :type url: str
+        :param res: Response received from the source.
+        :type res: requests.Response
+        """
+        content = res.content
+        if len(content) > self.max_size:
+            return
+
+        now = time.time()
+        headers = json.dumps(dict(res.headers))
+
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, url, headers, content, len(content), now, now),
+            )
+            self._evict(conn)
+
+    def renew(self, key: str) -> None:
+        """Restart the TTL of a response the source confirmed unchanged.
+
+        :param key: Key of the request made by :func:`make_cache_key`.
+        :type key: str
+        """
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                'UPDATE responses SET stored_at = ?, accessed_at = ? '
+                'WHERE key = ?',
+                (now, now, key),
+            )
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Delete least recently used responses until under max_size.
+
+        :param conn: Open connection to the cache.
+        :type conn: sqlite3.Connection
+        """
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses')
+        excess = total.fetchone()[0] - self.max_size
+
+        if excess <= 0:
+            return
+
+        rows = conn.execute(
+            'SELECT key, size FROM responses ORDER BY accessed_at'
+        )
+        evicted = []
+        for key, size in rows:
+            if excess <= 0:
+                break
+            evicted.append((key,))
+            excess -= size
+
+        conn.executemany('DELETE FROM responses WHERE key = ?', evicted)
+
+    def clear(self) -> None:
+        """Delete every cached response."""
+        with self._lock, self._connect() as conn:
+            conn.execute('DELETE FROM responses')
+
+
+_response_cache = None
+
+
+def get_response_cache() -> ResponseCache | None:
+    """Get the response cache shared by every request.
+
+    :return: Shared response cache, or None if caching is not enabled.
+    :rtype: ResponseCache or None
+    """
+    return _response_cache
+
+
+def set_response_cache(response_cache: ResponseCache | None) -> None:
+    """Enable caching responses of every request, or disable it with None.
+
+    :param response_cache: Response cache to share from now on.
+    :type response_cache: ResponseCache or None
+    """
+    global _response_cache
+    _response_cache = response_cache
@@ -1,34 +1,96 @@
 """This module retrieves company filings data from EDGAR."""
-from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import lxml.html
 import pandas as pd
 import re
+from financialdatapy.bulk import get_bulk_store
+from financialdatapy.cache import DEFAULT_TTL
+from financialdatapy.memo import ttl_cache
 from financialdatapy.request import Request
 
 
-@lru_cache
-def get_filings_list(cik: str) -> pd.DataFrame:
+#: Columns of submissions in EDGAR kept in the filings list.
+SUBMISSION_FIELDS = {
+    'accessionNumber': 'AccessionNumber',
+    'form': 'Form',
+    'primaryDocument': 'PrimaryDocument',
+    'filingDate': 'Date',
+}
+
+
+def _get_submissions(name: str) -> dict:
+    """Retrieve a submissions file of a company in the SEC EDGAR system.
+
+    :param name: Name of the file, e.g. 'CIK0000320193.json'.
+    :type name: str
+    :return: Submissions data.
+    :rtype: dict
+    """
+    url = f'http://data.sec.gov/submissions/{name}'
+    res = Request(url)
+    return res.response_data('json')
+
+
+@ttl_cache(maxsize=256, ttl=DEFAULT_TTL['data.sec.gov'])
+def get_filings_list(cik: str, full_history: bool = False,
+                     max_workers: int = 4) -> pd.DataFrame:
     """Retrieve whole list of filings a company made in the SEC EDGAR system.
 
+    Lists of the 256 companies used last are kept for 6 hours, and every
+    caller gets its own copy of the list. If a bulk store is set with
+    :func:`financialdatapy.bulk.set_bulk_store`, the list is read from it
+    without sending a request, unless the company is not in the store.
+
     :param cik: CIK of a company.
     :type cik: str
-    :return: Dataframe containing all the company filings data.
+    :param full_history: Option for retrieving older filings too, defaults to
+        False. EDGAR lists only the recent filings in the submissions of a
+        company and pages the rest into separate files, which are retrieved
+        concurrently if True.
+    :type full_history: bool, optional
+    :param max_workers: Maximum number of files retrieved at the same time
+        for the full history, defaults to 4.
+    :type max_workers: int, optional
+    :return: Dataframe containing all the company filings data, the latest
+        first. 'Form' is categorical and 'Date' is datetime.
     :rtype: pandas.DataFrame
     """
-    url = f'http://data.sec.gov/submissions/CIK{cik}.json'
-    res = Request(url)
-    data = res.response_data('json')
-    info = data['filings']['recent']
-
-    acc = info['accessionNumber']
-    acc = [s.replace('-', '') for s in acc]
-    form = info['form']
-    doc = info['primaryDocument']
-    date = info['filingDate']
-
-    filings = pd.DataFrame(
-        zip(acc, form, doc, date),
-        columns=['AccessionNumber', 'Form', 'PrimaryDocument', 'Date'],
-    )
+    bulk_store = get_bulk_store()
+    stored = None
+    if bulk_store is not None:
+        stored = bulk_store.get_submissions(cik, full_history)
+
+    if stored is not None:
+        pages = [stored]
+    else:
+        data = _get_submissions(f'CIK{cik}.json')
+        pages = [data['filings']['recent']]
+
+    if stored is None and full_history:
+        names = [x['name'] for x in data['filings'].get('files', [])]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pages += list(executor.map(_get_submissions, names))
+
+    columns = {column: [] for column in SUBMISSION_FIELDS.values()}
+    for page in pages:
+        for field, column in SUBMISSION_FIELDS.items():
+            columns[column] += page[field]
+
+    filings = pd.DataFrame({
+        'AccessionNumber': [
+            s.replace('-', '') for s in columns['AccessionNumber']
+        ],
+        'Form': pd.Categorical(columns['Form']),
+        'PrimaryDocument': columns['PrimaryDocument'],
+        'Date': pd.to_datetime(columns['Date'], format='%Y-%m-%d'),
+    })
+
+    if full_history:
+        filings = (
+            filings.drop_duplicates('AccessionNumber')
+            .sort_values('Date', ascending=False, kind='stable')
+            .reset_index(drop=True)
+        )
 
     return filings
 
@@ -50,16 +112,20 @@ def get_latest_form(cik: str, latest: str) -> dict:
     url = ('https://www.sec.gov/cgi-bin/viewer?action=view&'
            f'cik={cik}&accession_number={latest}&xbrl_type=v')
     res = Request(url)
-    soup = res.response_data('beautifulsoup')
+    document = res.response_data('lxml')
 
-    menu = soup.find(id='menu')
-    a = menu.find_next('a', string='Financial Statements')
-    ul = a.find_next('ul')
-    li = ul.find_all('li')
+    menu = document.get_element_by_id('menu')
+    a = menu.xpath(
+        "(descendant::a | following::a)[. = 'Financial Statements'][1]"
+    )[0]
+    ul = a.xpath('following::ul[1]')[0]
+    li = list(ul.iter('li'))
 
-    element = [x.get_text() for x in li]
+    element = [x.text_content() for x in li]
     filename = [
-        re.search(r'r\d', str(x), flags=re.I).group().upper() for x in li
+        re.search(r'r\d', lxml.html.tostring(x, encoding='unicode'),
+                  flags=re.I).group().upper()
+        for x in li
     ]
     file_list = dict(zip(element, filename))
 
@@ -2,18 +2,193 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
 import io
+import numpy as np
 import pandas as pd
 import string
+import threading
 import webbrowser
+from typing import Callable, Optional
 from financialdatapy import search
+from financialdatapy.cache import DEFAULT_TTL
 from financialdatapy.exception import EmptyDataFrameError
 from financialdatapy.exception import NotAvailable
 from financialdatapy.filings import get_latest_form
 from financialdatapy.filings import get_filings_list
+from financialdatapy.htmltable import find_report_table
+from financialdatapy.htmltable import read_table
+from financialdatapy.memo import TTLCache
+from financialdatapy.numeric import parse_numbers
 from financialdatapy.dartapi import OpenDart
 from financialdatapy.request import Request
 from financialdatapy.stocklist import KorStockList
 from financialdatapy.stocklist import UsStockList
+from financialdatapy.stocklist import get_shared_stock_list
+from financialdatapy.xbrl import build_statement
+from financialdatapy.xbrl import get_company_facts
+
+#: Financial statements retrieved together with ``financial='all'``.
+STATEMENTS = ('income_statement', 'balance_sheet', 'cash_flow')
+
+_MISSING = object()
+
+
+class CompanyContext:
+    """A class keeping what is resolved about a company across requests.
+
+    Identifiers such as CIK and corp_code, and a filing already made, never
+    change, so they are retrieved on first use and kept. The filings list,
+    XBRL facts and reports of the company change when it files again, so
+    they are kept for ``ttl`` seconds only. A company is looked up once
+    however many statements are retrieved, and a long-lived stock still
+    sees a new filing.
+
+    :param symbol: Symbol of a company.
+    :type symbol: str
+    :param ttl: Seconds the filings and reports are kept, defaults to the
+        time filings of data.sec.gov are cached in
+        :data:`financialdatapy.cache.DEFAULT_TTL`.
+    :type ttl: Optional[float], optional
+    """
+
+    def __init__(self, symbol: str,
+                 ttl: Optional[float] = DEFAULT_TTL['data.sec.gov']) -> None:
+        """Initialize CompanyContext."""
+        self.symbol = symbol.upper()
+        self._values = {}
+        self._recent = TTLCache(maxsize=64, ttl=ttl)
+        self._lock = threading.RLock()
+
+    def _memoize(self, key: tuple, func: Callable, *args) -> object:
+        """Get a value kept under the key, or compute and keep it.
+
+        :param key: Key of the value.
+        :type key: tuple
+        :param func: Function computing the value from args.
+        :type func: Callable
+        :return: Value kept under the key.
+        :rtype: object
+        """
+        with self._lock:
+            if key not in self._values:
+                self._values[key] = func(*args)
+            return self._values[key]
+
+    def _memoize_recent(self, key: tuple, func: Callable, *args) -> object:
+        """Get a value kept under the key for ttl, or compute and keep it.
+
+        :param key: Key of the value.
+        :type key: tuple
+        :param func: Function computing the value from args.
+        :type func: Callable
+        :return: Value kept under the key.
+        :rtype: object
+        """
+        with self._lock:
+            value = self._recent.get(key, _MISSING)
+            if value is _MISSING:
+                value = func(*args)
+                self._recent.set(key, value)
+            return value
+
+    @property
+    def cik(self) -> str:
+        """CIK of a company in US.
+
+        :return: CIK of the company.
+        :rtype: str
+        """
+        return self._memoize(
+            ('cik',),
+            get_shared_stock_list(UsStockList).search_cik,
+            self.symbol,
+        )
+
+    def get_filings_list(self) -> pd.DataFrame:
+        """Get the list of filings a company in US made.
+
+        :return: Dataframe containing all the company filings data.
+        :rtype: pandas.DataFrame
+        """
+        return self._memoize_recent(('filings',), get_filings_list,
+                                    self.cik)
+
+    def get_latest_form(self, accession_number: str) -> dict:
+        """Get urls of the financial statements in a filing.
+
+        :param accession_number: Accession number of the filing.
+        :type accession_number: str
+        :return: Each financial statements mapped with their URL to the data.
+        :rtype: dict
+        """
+        return self._memoize(
+            ('form', accession_number),
+            get_latest_form,
+            self.cik,
+            accession_number,
+        )
+
+    def get_company_facts(self) -> dict:
+        """Get every XBRL fact a company in US reported.
+
+        :return: Facts in the format of EDGAR companyfacts.
+        :rtype: dict
+        """
+        return self._memoize_recent(('facts',), get_company_facts, self.cik)
+
+    @property
+    def corp_code(self) -> str:
+        """Corporate code of a company in Korea Exchange.
+
+        :return: Corporate code of the company.
+        :rtype: str
+        """
+        return self._memoize(
+            ('corp_code',),
+            get_shared_stock_list(KorStockList).search_corp_code,
+            self.symbol,
+        )
+
+    @property
+    def open_dart(self) -> OpenDart:
+        """Client of OPEN DART API used for the company.
+
+        :return: :class:`dartapi.OpenDart` instance.
+        :rtype: :class:`dartapi.OpenDart`
+        """
+        return self._memoize(('open_dart',), OpenDart)
+
+    def get_latest_report_info(self, year: int) -> dict:
+        """Get the latest report a company in Korea Exchange submitted.
+
+        :param year: Current year.
+        :type year: int
+        :return: Information of the latest report.
+        :rtype: dict
+        """
+        return self._memoize_recent(
+            ('latest_report', year),
+            self.open_dart.get_latest_report_info,
+            self.corp_code,
+            year,
+        )
+
+    def get_report(self, period: str, year: int) -> pd.DataFrame:
+        """Get every financial statement of a company in Korea Exchange.
+
+        :param period: Either 'annual', '1q', '2q' or '3q'.
+        :type period: str
+        :param year: Business year.
+        :type year: int
+        :return: Financial statements of the company.
+        :rtype: pandas.DataFrame
+        """
+        return self._memoize_recent(
+            ('report', period, year),
+            self.open_dart.get_report,
+            self.corp_code,
+            period,
+            year,
+        )
 
 
 class Financials(ABC):
@@ -27,14 +202,21 @@ class Financials(ABC):
     :type financial: str, optional
     :param period: Either 'annual' or 'quarter', defaults to 'annual'.
     :type period: str, optional
+    :param context: What is resolved about the company so far, defaults to
+        None. If None, a new one is created.
+    :type context: Optional[CompanyContext], optional
     """
 
     def __init__(self, symbol: str, financial: str = 'income_statement',
-                 period: str = 'annual') -> None:
+                 period: str = 'annual',
+                 context: Optional[CompanyContext] = None) -> None:
         """Initialize Financials."""
         self.symbol = symbol
         self.financial = financial
         self.period = period
+        if context is None:
+            context = CompanyContext(self.symbol)
+        self.context = context
 
     @property
     def symbol(self) -> str:
@@ -152,21 +334,18 @@ class Financials(ABC):
         else:
             data_table = self._convert_table_header(data_table, row_idx=1)
 
-        data_table = data_table.replace(r'-$', '0', regex=True)
-
-        for i in data_table:
-            data_table[i] = pd.to_numeric(data_table[i], errors='coerce')
-
+        data_table = pd.DataFrame(
+            parse_numbers(data_table),
+            index=data_table.index,
+            columns=data_table.columns,
+        )
         data_table.dropna(inplace=True)
 
+        # values are in millions except for the ones per share
         values_unit = 1_000_000
-        data_table = data_table * values_unit
-        ignore_word = ['eps', 'dps']
-
-        for i in data_table.index:
-            for word in ignore_word:
-                if word in i.lower():
-                    data_table.loc[i] /= 1_000_000
+        per_share = data_table.index.str.contains('eps|dps', case=False)
+        data_table = data_table.mul(np.where(per_share, 1, values_unit),
+                                    axis=0)
 
         data_table.index.rename(None, inplace=True)
 
@@ -209,13 +388,26 @@ class UsFinancials(Financials):
     :type financial: str, optional
     :param period: Either 'annual' or 'quarter', defaults to 'annual'
     :type period: str, optional
+    :param context: What is resolved about the company so far, defaults to
+        None. If None, a new one is created.
+    :type context: Optional[CompanyContext], optional
+    :param engine: Where the statements are built from, defaults to 'html'.
+        'html' reads the tables of the latest filing in EDGAR viewer, and
+        'xbrl' builds them from XBRL facts of every filing, keeping every
+        period reported.
+    :type engine: str, optional
     """
 
     def __init__(self, symbol: str,
                  financial: str = 'income_statement',
-                 period: str = 'annual') -> None:
+                 period: str = 'annual',
+                 context: Optional[CompanyContext] = None,
+                 engine: str = 'html') -> None:
         """Initializes UsFinancials."""
-        super().__init__(symbol, financial, period)
+        super().__init__(symbol, financial, period, context)
+        if engine not in ('html', 'xbrl'):
+            raise NotAvailable(f'Engine {engine} is not available.')
+        self.engine = engine
 
     def _get_latest_filing_info(self) -> tuple[str, pd.Series]:
         """Retrieve latest filing that is submitted either 10-K or 10-Q.
@@ -230,9 +422,8 @@ class UsFinancials(Financials):
         else:
             form_type = '10-Q'
 
-        cik_list = UsStockList()
-        cik = cik_list.search_cik(self.symbol)
-        submission = get_filings_list(cik)
+        cik = self.context.cik
+        submission = self.context.get_filings_list()
 
         if submission[submission['Form'] == form_type].empty:
             raise EmptyDataFrameError('Failed in getting filings list.')
@@ -276,9 +467,13 @@ class UsFinancials(Financials):
         :return: Financial statement as reported.
         :rtype: pandas.DataFrame
         """
-        cik, latest_filing = self._get_latest_filing_info()
+        if self.engine == 'xbrl':
+            facts = self.context.get_company_facts()
+            return build_statement(facts, self.financial, self.period)
+
+        _, latest_filing = self._get_latest_filing_info()
         accession_number = latest_filing['AccessionNumber']
-        links = get_latest_form(cik, accession_number)
+        links = self.context.get_latest_form(accession_number)
         which_financial = links[self.financial]
         financial_statement = self._get_values(which_financial)
 
@@ -294,9 +489,9 @@ class UsFinancials(Financials):
         """
 
         res = Request(link)
-        soup = res.response_data('beautifulsoup')
-        table = soup.find('table', class_='report')
-        financial_statement = pd.read_html(io.StringIO(str(table)))[0]
+        document = res.response_data('lxml')
+        table = find_report_table(document)
+        financial_statement = read_table(table)
 
         first_column = financial_statement.columns[0]
 
@@ -308,11 +503,11 @@ class UsFinancials(Financials):
         title, _, unit = first_column_header.partition(' - ')
         elements = financial_statement.iloc[:, 0].rename((title, unit))
 
-        values = (
-            financial_statement.iloc[:, 1:]
-            .replace(r'[\$,]', '', regex=True)
-            .replace(r'^\((.*)\)$', r'-\1', regex=True)
-            .apply(pd.to_numeric, errors='coerce')
+        values = financial_statement.iloc[:, 1:]
+        values = pd.DataFrame(
+            parse_numbers(values),
+            index=values.index,
+            columns=values.columns,
         )
 
         return pd.concat([elements, values], axis=1)
@@ -328,14 +523,16 @@ class KorFinancials(Financials):
     :type financial: str, optional
     :param period: Either 'annual' or 'quarter', defaults to 'annual'.
     :type period: str, optional
-    :param api_key: Api key for opendart.fss.or.kr, defaults to None.
-    :type api_key: str
+    :param context: What is resolved about the company so far, defaults to
+        None. If None, a new one is created.
+    :type context: Optional[CompanyContext], optional
     """
 
     def __init__(self, symbol: str, financial: str = 'income_statement',
-                 period: str = 'annual') -> None:
+                 period: str = 'annual',
+                 context: Optional[CompanyContext] = None) -> None:
         """Initialize KorFinancials"""
-        super().__init__(symbol, financial, period)
+        super().__init__(symbol, financial, period, context)
 
     def _get_raw_financials(self) -> tuple[pd.DataFrame, str]:
         """Assign period and year according to the user input.
@@ -345,12 +542,9 @@ class KorFinancials(Financials):
         :return: Uncleaned financial statement and assigned input period
         :rtype: tuple[pandas.DataFrame, str]
         """
-        kor_stock_list = KorStockList()
-        corp_code = kor_stock_list.search_corp_code(self.symbol)
         today = datetime.now()
         year_now = today.year
-        open_dart = OpenDart()
-        latest_report = open_dart.get_latest_report_info(corp_code, year_now)
+        latest_report = self.context.get_latest_report_info(year_now)
         latest_date = latest_report['rcept_dt']
         latest_date = datetime.strptime(latest_date, '%Y%m%d')
 
@@ -359,15 +553,13 @@ class KorFinancials(Financials):
         if input_period == 'annual':
             try:
                 last_year = year_now - 1
-                raw_financial = open_dart.get_report(
-                    corp_code,
+                raw_financial = self.context.get_report(
                     input_period,
                     last_year,
                 )
             except KeyError:
                 two_yrs_ago = year_now - 2
-                raw_financial = open_dart.get_report(
-                    corp_code,
+                raw_financial = self.context.get_report(
                     input_period,
                     two_yrs_ago,
                 )
@@ -382,8 +574,7 @@ class KorFinancials(Financials):
                     year_now = year_now - 1
                     input_period = '3q'
 
-                raw_financial = open_dart.get_report(
-                    corp_code,
+                raw_financial = self.context.get_report(
                     input_period,
                     year_now,
                 )
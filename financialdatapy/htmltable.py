@@ -0,0 +1,159 @@
+"""This module reads html tables parsed by lxml into dataframes."""
+import re
+import pandas as pd
+from lxml import etree
+from lxml.html import HtmlElement
+
+_WHITESPACE = re.compile(r'[\r\n]+|\s{2,}')
+
+
+def _get_text(cell: HtmlElement) -> str:
+    """Get text of a cell with its whitespace collapsed.
+
+    A line break is read as a new line, as :func:`pandas.read_html` does.
+
+    :param cell: Td or th element.
+    :type cell: lxml.html.HtmlElement
+    :return: Text of the cell.
+    :rtype: str
+    """
+    texts = []
+
+    for event, element in etree.iterwalk(cell, events=('start', 'end')):
+        if event == 'start':
+            if element.tag == 'br':
+                texts.append('\n')
+            elif isinstance(element.tag, str) and element.text:
+                texts.append(element.text)
+        elif element is not cell and element.tail:
+            texts.append(element.tail)
+
+    return _WHITESPACE.sub(' ', ''.join(texts)).strip()
+
+
+def _expand_spans(rows: list[HtmlElement]) -> list[list[str]]:
+    """Get texts of the rows, repeating a cell over the cells it spans.
+
+    :param rows: Tr elements.
+    :type rows: list[lxml.html.HtmlElement]
+    :return: Texts of each row.
+    :rtype: list[list[str]]
+    """
+    all_texts = []
+    remainder = []
+
+    for row in rows:
+        texts = []
+        next_remainder = []
+        index = 0
+
+        for cell in row.iterchildren('td', 'th'):
+            while remainder and remainder[0][0] <= index:
+                prev_index, prev_text, prev_rowspan = remainder.pop(0)
+                texts.append(prev_text)
+                if prev_rowspan > 1:
+                    next_remainder.append(
+                        (prev_index, prev_text, prev_rowspan - 1)
+                    )
+                index += 1
+
+            text = _get_text(cell)
+            rowspan = int(cell.get('rowspan') or 1)
+            colspan = int(cell.get('colspan') or 1)
+
+            for _ in range(colspan):
+                texts.append(text)
+                if rowspan > 1:
+                    next_remainder.append((index, text, rowspan - 1))
+                index += 1
+
+        for prev_index, prev_text, prev_rowspan in remainder:
+            texts.append(prev_text)
+            if prev_rowspan > 1:
+                next_remainder.append(
+                    (prev_index, prev_text, prev_rowspan - 1)
+                )
+
+        all_texts.append(texts)
+        remainder = next_remainder
+
+    return all_texts
+
+
+def _make_columns(header: list[list[str]], width: int) -> pd.Index:
+    """Make column labels from the header rows.
+
+    An empty label is named 'Unnamed: i' as :func:`pandas.read_html` does.
+
+    :param header: Texts of the header rows.
+    :type header: list[list[str]]
+    :param width: Number of columns.
+    :type width: int
+    :return: Column labels, with a level per header row.
+    :rtype: pandas.Index
+    """
+    if not header:
+        return pd.RangeIndex(width)
+
+    levels = []
+    for level, texts in enumerate(header):
+        texts = texts + [''] * (width - len(texts))
+        if len(header) == 1:
+            unnamed = 'Unnamed: {}'
+        else:
+            unnamed = f'Unnamed: {{}}_level_{level}'
+        levels.append([x or unnamed.format(i) for i, x in enumerate(texts)])
+
+    if len(levels) == 1:
+        return pd.Index(levels[0])
+
+    return pd.MultiIndex.from_arrays(levels)
+
+
+def read_table(table: HtmlElement) -> pd.DataFrame:
+    """Read a table element into a dataframe of its texts.
+
+    Leading rows made of th cells are the header, like in
+    :func:`pandas.read_html`, but the table is read from the parsed element
+    instead of being serialized and parsed again. Empty cells are NaN, and
+    no value is converted from text.
+
+    :param table: Table element.
+    :type table: lxml.html.HtmlElement
+    :return: Texts of the table.
+    :rtype: pandas.DataFrame
+    """
+    rows = table.xpath('./tr | ./thead/tr | ./tbody/tr | ./tfoot/tr')
+    texts = _expand_spans(rows)
+
+    n_header = 0
+    for row in rows:
+        cells = list(row.iterchildren('td', 'th'))
+        if row.getparent().tag == 'thead' or (
+            cells and all(cell.tag == 'th' for cell in cells)
+        ):
+            n_header += 1
+        else:
+            break
+
+    header, body = texts[:n_header], texts[n_header:]
+    width = max(map(len, texts), default=0)
+    body = [
+        [x or None for x in row] + [None] * (width - len(row))
+        for row in body
+    ]
+
+    return pd.DataFrame(body, columns=_make_columns(header, width))
+
+
+def find_report_table(document: HtmlElement) -> HtmlElement | None:
+    """Find the first table of class 'report' in an EDGAR R-file.
+
+    :param document: Parsed R-file.
+    :type document: lxml.html.HtmlElement
+    :return: Table element, or None if there is none.
+    :rtype: lxml.html.HtmlElement or None
+    """
+    tables = document.find_class('report')
+    tables = [x for x in tables if x.tag == 'table']
+    return tables[0] if tables else None
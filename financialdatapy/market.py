@@ -3,10 +3,13 @@ from datetime import datetime
 import pandas as pd
 from typing import Optional
 from financialdatapy.exception import NotAvailable
+from financialdatapy.financials import CompanyContext
+from financialdatapy.financials import STATEMENTS
 from financialdatapy.financials import KorFinancials
 from financialdatapy.financials import UsFinancials
 from financialdatapy.price import UsMarket
 from financialdatapy.price import KorMarket
+from financialdatapy.session import run_in_executor
 
 
 class Market:
@@ -26,12 +29,15 @@ class Market:
             period: str,
             is_standard: bool,
             web: bool,
-    ) -> Optional[pd.DataFrame]:
+            context: Optional[CompanyContext] = None,
+            engine: str = 'html',
+    ) -> pd.DataFrame | dict[str, pd.DataFrame] | None:
         """Get financial statements.
 
         :param symbol: Symbol of a company/stock.
         :type symbol: str
-        :param financial: Which financial statement to retrieve.
+        :param financial: Which financial statement to retrieve, or 'all' for
+            every one of them.
         :type financial: str
         :param period: Either 'annual' or 'quarter.
         :type period: str
@@ -39,16 +45,28 @@ class Market:
         :type is_standard: bool
         :param web: Option for opening filings in a web browser.
         :type web: bool
+        :param context: What is resolved about the company so far, defaults
+            to None.
+        :type context: Optional[CompanyContext], optional
+        :param engine: Where statements of a company in US are built from,
+            either 'html' or 'xbrl', defaults to 'html'.
+        :type engine: str, optional
         :raises NotAvailable: If the symbol is not listed in the
             stock exchange.
-        :return: Financials as reported or standard financials or None.
-        :rtype: pandas.DataFrame or None
+        :return: Financials as reported or standard financials, each of them
+            mapped with its name if financial is 'all', or None.
+        :rtype: pandas.DataFrame or dict or None
         """
+        if financial.lower() == 'all':
+            return self._all_financial_statements(symbol, period, is_standard,
+                                                  web, context, engine)
+
         match self.country_code:
             case 'USA':
-                stock = UsFinancials(symbol, financial, period)
+                stock = UsFinancials(symbol, financial, period, context,
+                                     engine)
             case 'KOR':
-                stock = KorFinancials(symbol, financial, period)
+                stock = KorFinancials(symbol, financial, period, context)
             case _:
                 raise NotAvailable('Symbol is not found.')        
         if web:
@@ -59,8 +77,54 @@ class Market:
         else:
             return stock.get_financials()
 
+    def _all_financial_statements(
+            self,
+            symbol: str,
+            period: str,
+            is_standard: bool,
+            web: bool,
+            context: Optional[CompanyContext],
+            engine: str,
+    ) -> dict[str, pd.DataFrame] | None:
+        """Get every financial statement sharing what is retrieved for one.
+
+        The filing, or the report in Korea Exchange holding every statement,
+        is retrieved once through the context and used for all of them.
+
+        :param symbol: Symbol of a company/stock.
+        :type symbol: str
+        :param period: Either 'annual' or 'quarter.
+        :type period: str
+        :param is_standard: Option for retrieving standard financial statements.
+        :type is_standard: bool
+        :param web: Option for opening filings in a web browser.
+        :type web: bool
+        :param context: What is resolved about the company so far.
+        :type context: CompanyContext or None
+        :param engine: Where statements of a company in US are built from.
+        :type engine: str
+        :return: Each financial statement mapped with its name, or None.
+        :rtype: dict or None
+        """
+        if context is None:
+            context = CompanyContext(symbol)
+
+        if web:
+            # every statement is in the same filing
+            return self.financial_statement(symbol, STATEMENTS[0], period,
+                                            is_standard, web, context, engine)
+
+        return {
+            financial: self.financial_statement(symbol, financial, period,
+                                                is_standard, web, context,
+                                                engine)
+            for financial in STATEMENTS
+        }
+
     def historical_price(self, symbol: str,
-                         start: datetime, end: datetime) -> pd.DataFrame:
+                         start: datetime, end: datetime,
+                         dtype: str = 'float64',
+                         interval: str = '1d') -> pd.DataFrame:
         """Get historical stock price data.
 
         :param symbol: Symbol of a company/stock.
@@ -69,14 +133,103 @@ class Market:
         :type start: `datetime.datetime`
         :param end: End date to query.
         :type end: `datetime.datetime`
+        :param dtype: Data type of the prices, defaults to 'float64'.
+        :type dtype: str, optional
+        :param interval: Interval between prices, defaults to '1d'.
+        :type interval: str, optional
         :raises NotAvailable: If the symbol is not listed in the
-            stock exchange.
+            stock exchange, or the interval is not supported there.
         :return: Historical stock price data.
         :rtype: pandas.DataFrame
         """
         if self.country_code == 'USA':
-            return UsMarket(symbol, start, end)
+            return UsMarket(symbol, start, end, dtype, interval)
         elif self.country_code == 'KOR':
-            return KorMarket(symbol, start, end)
+            return KorMarket(symbol, start, end, dtype, interval)
         else:
             raise NotAvailable()
+
+
+class AsyncMarket(Market):
+    """Asyncio counterpart of :class:`Market`.
+
+    Data is retrieved in the worker threads of
+    :func:`financialdatapy.session.get_executor`, so statements and prices of
+    many companies can be awaited together from one event loop. The
+    coroutines are added under their own names, so every sync method of
+    :class:`Market` still works on an instance.
+
+    :param country_code: Country where the stock is listed.
+    :type country_code: str
+    """
+
+    async def financial_statement_data(
+            self,
+            symbol: str,
+            financial: str,
+            period: str,
+            is_standard: bool,
+            web: bool,
+            context: Optional[CompanyContext] = None,
+            engine: str = 'html',
+    ) -> pd.DataFrame | dict[str, pd.DataFrame] | None:
+        """Get financial statements in the worker threads.
+
+        :param symbol: Symbol of a company/stock.
+        :type symbol: str
+        :param financial: Which financial statement to retrieve, or 'all' for
+            every one of them.
+        :type financial: str
+        :param period: Either 'annual' or 'quarter.
+        :type period: str
+        :param is_standard: Option for retrieving standard financial statements.
+        :type is_standard: bool
+        :param web: Option for opening filings in a web browser.
+        :type web: bool
+        :param context: What is resolved about the company so far, defaults
+            to None.
+        :type context: Optional[CompanyContext], optional
+        :param engine: Where statements of a company in US are built from,
+            either 'html' or 'xbrl', defaults to 'html'.
+        :type engine: str, optional
+        :raises NotAvailable: If the symbol is not listed in the
+            stock exchange.
+        :return: Financials as reported or standard financials, each of them
+            mapped with its name if financial is 'all', or None.
+        :rtype: pandas.DataFrame or dict or None
+        """
+        return await run_in_executor(
+            self.financial_statement,
+            symbol,
+            financial,
+            period,
+            is_standard,
+            web,
+            context,
+            engine,
+        )
+
+    async def price_data(self, symbol: str,
+                         start: datetime, end: datetime,
+                         dtype: str = 'float64',
+                         interval: str = '1d') -> pd.DataFrame:
+        """Get historical stock price data.
+
+        :param symbol: Symbol of a company/stock.
+        :type symbol: str
+        :param start: Start date to query.
+        :type start: `datetime.datetime`
+        :param end: End date to query.
+        :type end: `datetime.datetime`
+        :param dtype: Data type of the prices, defaults to 'float64'.
+        :type dtype: str, optional
+        :param interval: Interval between prices, defaults to '1d'.
+        :type interval: str, optional
+        :raises NotAvailable: If the symbol is not listed in the
+            stock exchange, or the interval is not supported there.
+        :return: Historical stock price data.
+        :rtype: pandas.DataFrame
+        """
+        price = self.historical_price(symbol, start, end, dtype,
+                                      interval)
+        return await run_in_executor(price.get_price_data)
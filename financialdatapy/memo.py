@@ -0,0 +1,148 @@
+"""This module memoizes results of functions in memory for a limited time."""
+from collections import OrderedDict, namedtuple
+import copy as copy_module
+import functools
+import threading
+import time
+from typing import Callable, Optional
+
+#: Statistics of a :class:`TTLCache` in the form of
+#: :func:`functools.lru_cache`.
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+_MISSING = object()
+
+
+class TTLCache:
+    """A class keeping recently used values for a limited time.
+
+    When ``maxsize`` values are kept, the least recently used one is dropped
+    for a new one. A value older than ``ttl`` is not used.
+
+    :param maxsize: Maximum number of values kept, defaults to 128.
+    :type maxsize: int, optional
+    :param ttl: Seconds a value is used, defaults to 3600. If None, it is
+        used until dropped.
+    :type ttl: Optional[float], optional
+    :param clock: Function returning the current time in seconds,
+        defaults to :func:`time.monotonic`.
+    :type clock: Callable, optional
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = 3600,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize TTLCache."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of values kept, including expired ones not dropped yet.
+
+        :return: Number of values.
+        :rtype: int
+        """
+        return len(self._entries)
+
+    def get(self, key: object, default: object = None) -> object:
+        """Get a value kept under the key.
+
+        :param key: Key of the value.
+        :type key: object
+        :param default: Value returned if the key is missing or expired,
+            defaults to None.
+        :type default: object, optional
+        :return: Value kept, or default.
+        :rtype: object
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[1]
+
+            if entry is not None:
+                del self._entries[key]
+            self._misses += 1
+            return default
+
+    def set(self, key: object, value: object) -> None:
+        """Keep a value under the key, dropping the least recently used.
+
+        :param key: Key of the value.
+        :type key: object
+        :param value: Value to keep.
+        :type value: object
+        """
+        if self.ttl is None:
+            expires_at = float('inf')
+        else:
+            expires_at = self._clock() + self.ttl
+
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every value kept and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def info(self) -> CacheInfo:
+        """Get hits, misses and size of the cache.
+
+        :return: Statistics of the cache.
+        :rtype: CacheInfo
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize,
+                             len(self._entries))
+
+
+def ttl_cache(maxsize: int = 128, ttl: Optional[float] = 3600,
+              copy: bool = True) -> Callable:
+    """Memoize a function in a :class:`TTLCache`.
+
+    Like :func:`functools.lru_cache`, the decorated function has
+    ``cache_info()`` and ``cache_clear()``, and its cache is in ``cache``.
+
+    :param maxsize: Maximum number of results kept, defaults to 128.
+    :type maxsize: int, optional
+    :param ttl: Seconds a result is used, defaults to 3600.
+    :type ttl: Optional[float], optional
+    :param copy: Whether every caller gets its own copy of the result, so
+        changing it does not change the result kept, defaults to True.
+    :type copy: bool, optional
+    :return: Decorator.
+    :rtype: Callable
+    """
+    def decorator(func: Callable) -> Callable:
+        cache = TTLCache(maxsize, ttl)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            result = cache.get(key, _MISSING)
+
+            if result is _MISSING:
+                result = func(*args, **kwargs)
+                cache.set(key, result)
+
+            return copy_module.copy(result) if copy else result
+
+        wrapper.cache = cache
+        wrapper.cache_info = cache.info
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
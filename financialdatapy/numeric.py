@@ -0,0 +1,111 @@
+"""This module parses numbers written the way financial data reports them."""
+import math
+import re
+import numpy as np
+import pandas as pd
+from typing import Iterable
+
+#: Multiplier of each suffix a number is abbreviated with.
+SUFFIXES = {
+    'K': 1e3,
+    'M': 1e6,
+    'B': 1e9,
+    'T': 1e12,
+}
+
+#: Dashes written in place of zero.
+DASHES = frozenset('-‒–—−')
+
+# footnote markers, currency, thousands separators, percent and spaces
+_NOISE = re.compile(r'\[\d+\]|[\s$€£¥₩,%]')
+
+
+def parse_number(value: object) -> float:
+    """Parse a number written in accounting format.
+
+    Currency signs, thousands separators, percent signs and footnote markers
+    such as '[1]' are ignored. A number in parentheses is negative, a dash
+    alone is zero, and a suffix of :data:`SUFFIXES` multiplies the number.
+
+    :param value: Number written in text, or a number.
+    :type value: object
+    :return: Parsed number, or NaN if the value is not a number.
+    :rtype: float
+    """
+    if isinstance(value, (int, float, np.number)) and not isinstance(
+            value, bool):
+        return float(value)
+
+    if not isinstance(value, str):
+        return math.nan
+
+    text = _NOISE.sub('', value)
+    negative = text[:1] == '(' and text[-1:] == ')'
+
+    if negative:
+        text = text[1:-1]
+
+    if text in DASHES:
+        return 0.0
+
+    scale = SUFFIXES.get(text[-1:].upper())
+    if scale is not None:
+        text = text[:-1]
+    else:
+        scale = 1.0
+
+    try:
+        number = float(text) * scale
+    except ValueError:
+        return math.nan
+
+    return -number if negative else number
+
+
+def _parse_abbreviated(values: np.ndarray) -> np.ndarray:
+    """Parse plain numbers with thousands separators and suffixes at once.
+
+    :param values: Flat array of texts.
+    :type values: numpy.ndarray
+    :raises ValueError: If any text is not written that way.
+    :return: Parsed numbers.
+    :rtype: numpy.ndarray
+    """
+    text = np.strings.replace(values.astype(str), ',', '')
+    suffix = np.strings.slice(text, -1, None)
+    scale = np.ones(values.size)
+    for key, multiplier in SUFFIXES.items():
+        scale[(suffix == key) | (suffix == key.lower())] = multiplier
+
+    stop = np.strings.str_len(text) - (scale != 1)
+    text = np.strings.slice(text, 0, stop)
+
+    # float() of each text in C, which raises on any other format
+    return text.astype(object).astype('float64') * scale
+
+
+def parse_numbers(values: Iterable) -> np.ndarray:
+    """Parse a block of numbers written in accounting format at once.
+
+    A block of texts of plain numbers, with thousands separators and a
+    suffix of :data:`SUFFIXES` as prices and volumes are written, is parsed
+    with vectorized string operations. Any other block is parsed one value
+    at a time by :func:`parse_number`.
+
+    :param values: Values of any shape, e.g. a dataframe or a series.
+    :type values: Iterable
+    :return: Parsed numbers in the shape of the values.
+    :rtype: numpy.ndarray
+    """
+    array = np.asarray(values, dtype=object)
+    flat = array.ravel()
+
+    if pd.api.types.infer_dtype(flat, skipna=False) == 'string':
+        try:
+            return _parse_abbreviated(flat).reshape(array.shape)
+        except ValueError:
+            pass
+
+    numbers = np.fromiter(map(parse_number, flat), dtype='float64',
+                          count=flat.size)
+    return numbers.reshape(array.shape)
@@ -1,13 +1,18 @@
 """This module retrieves the historical stock price of a company."""
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 import io
+import numpy as np
 import pandas as pd
+import requests
 from financialdatapy.date import date_to_timestamp
 from financialdatapy.date import convert_date_format
 from financialdatapy.request import Request
 from financialdatapy import search
 from financialdatapy.exception import DataNotAvailableError
+from financialdatapy.exception import NotAvailable
+from financialdatapy.numeric import parse_numbers
 
 
 class Price(ABC):
@@ -19,13 +24,32 @@ class Price(ABC):
     :type start: pandas.Timestamp
     :param end: Ending date to search.
     :type end: pandas.Timestamp
+    :param dtype: Data type of the prices, defaults to 'float64'. 'float32'
+        halves the memory of long price histories.
+    :type dtype: str, optional
+    :param interval: Interval between prices, e.g. '1m', '1h', '1d' or
+        '1wk', defaults to '1d'. The source must support it.
+    :type interval: str, optional
+    :raises NotAvailable: If the source does not support the interval.
     """
 
-    def __init__(self, symbol: str, start: pd.Timestamp, end: pd.Timestamp) -> None:
+    #: Columns of the prices, in the order they are returned.
+    PRICE_COLUMNS = ["Close", "Open", "High", "Low"]
+
+    #: Intervals the source supports.
+    INTERVALS = {}
+
+    def __init__(self, symbol: str, start: pd.Timestamp, end: pd.Timestamp,
+                 dtype: str = "float64", interval: str = "1d") -> None:
         """Initialize Price"""
+        if interval not in self.INTERVALS:
+            raise NotAvailable(f"Interval {interval} is not available.")
+
         self.symbol = symbol
         self.start = start
         self.end = end
+        self.dtype = dtype
+        self.interval = interval
 
     @abstractmethod
     def _get_raw_price_data(self):
@@ -37,59 +61,169 @@ class Price(ABC):
 
 
 class UsMarket(Price):
-    """A class representing stock price of a US company."""
+    """A class representing stock price of a US company.
+
+    Yahoo returns intraday prices of a limited range at once, so a longer
+    range is split into windows retrieved at the same time. Intraday prices
+    are kept for a limited time only, e.g. about 30 days of 1m prices and
+    60 days of 2m to 90m prices, so a window older than that fails and is
+    left out.
+    """
+
+    #: Longest range in days retrieved at once for each interval, or None if
+    #: the range is not limited.
+    INTERVALS = {
+        "1m": 7,
+        "2m": 60,
+        "5m": 60,
+        "15m": 60,
+        "30m": 60,
+        "60m": 730,
+        "90m": 60,
+        "1h": 730,
+        "1d": None,
+        "5d": None,
+        "1wk": None,
+        "1mo": None,
+        "3mo": None,
+    }
+
+    def _get_windows(self) -> list[tuple[pd.Timestamp, pd.Timestamp]]:
+        """Split the dates to search into ranges retrieved at once.
+
+        :return: Start and end of each range, the end excluded.
+        :rtype: list[tuple[pandas.Timestamp, pandas.Timestamp]]
+        """
+        end = self.end + pd.Timedelta(days=1)
+        days = self.INTERVALS[self.interval]
+
+        if days is None:
+            return [(self.start, end)]
+
+        step = pd.Timedelta(days=days)
+        windows = []
+        start = self.start
+        while start < end:
+            windows.append((start, min(start + step, end)))
+            start += step
+
+        return windows
 
-    def _get_raw_price_data(self) -> dict:
+    def _get_raw_price_data(self, start: pd.Timestamp,
+                            end: pd.Timestamp) -> dict:
         """Get historical stock price data from source in a raw form.
 
+        :param start: Start of the range.
+        :type start: pandas.Timestamp
+        :param end: End of the range, excluded.
+        :type end: pandas.Timestamp
         :return: Historical stock price data retrieved in JSON file.
         :rtype: dict
         """
-        one_day_in_timestamp = 86_400
-        start_date_timestamp = date_to_timestamp(self.start)
-        end_date_timestamp = date_to_timestamp(self.end) + one_day_in_timestamp
+        start_date_timestamp = date_to_timestamp(start)
+        end_date_timestamp = date_to_timestamp(end)
         url = (
             "https://query1.finance.yahoo.com/v8/finance/chart/"
             f"{self.symbol}?symbol={self.symbol}"
             f"&period1={start_date_timestamp}&period2={end_date_timestamp}"
-            "&interval=1d&corsDomain=finance.yahoo.com"
+            f"&interval={self.interval}&corsDomain=finance.yahoo.com"
         )
         res = Request(url)
         data = res.response_data("json")
 
         return data
 
-    def get_price_data(self) -> pd.DataFrame:
-        """Get historical stock price data.
+    def _convert_chart(self, result_data: dict) -> pd.DataFrame:
+        """Convert a chart of Yahoo to a dataframe.
 
-        :param data: Historical stock price data in JSON
-        :type data: dict
+        :param result_data: Result of the chart.
+        :type result_data: dict
         :return: Historical stock price data.
         :rtype: pandas.DataFrame
         """
-        raw_data = self._get_raw_price_data()
-        result_data = raw_data["chart"]["result"][0]
+        timezone = result_data.get("meta", {}).get("exchangeTimezoneName")
+        quote = result_data["indicators"]["quote"][0]
+
+        timestamp = np.asarray(result_data["timestamp"], dtype="int64")
+        date = pd.to_datetime(timestamp, unit="s", utc=True)
+        if timezone is not None:
+            date = date.tz_convert(timezone)
+        # prices are dated in the local time of the exchange
+        date = date.tz_localize(None)
+        if self.INTERVALS[self.interval] is None:
+            date = date.normalize()
+
+        price_table = {"Date": date}
+        for column in self.PRICE_COLUMNS:
+            # missing prices come as null, which become NaN
+            values = np.asarray(quote[column.lower()], dtype="float64")
+            price_table[column] = np.round(values, 2).astype(self.dtype,
+                                                             copy=False)
+
+        volume = np.asarray(quote["volume"], dtype="float64")
+        if not np.isnan(volume).any():
+            volume = volume.astype("int64")
+        price_table["Volume"] = volume
+
+        return pd.DataFrame(price_table, copy=False)
+
+    def get_price_data(self, max_workers: int = 4) -> pd.DataFrame:
+        """Get historical stock price data.
 
-        if "timestamp" not in result_data:
+        :param max_workers: Maximum number of windows retrieved at the same
+            time, defaults to 4.
+        :type max_workers: int, optional
+        :raises DataNotAvailableError: If there is no price in the range.
+        :raises: :py:class:`requests.exceptions.HTTPError` If every window
+            failed.
+        :return: Historical stock price data.
+        :rtype: pandas.DataFrame
+        """
+        windows = self._get_windows()
+        charts = []
+
+        if len(windows) == 1:
+            charts.append(self._get_raw_price_data(*windows[0]))
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(self._get_raw_price_data, *window)
+                    for window in windows
+                ]
+            errors = []
+            for future in futures:
+                try:
+                    charts.append(future.result())
+                except requests.HTTPError as e:
+                    # e.g. a window older than Yahoo keeps the interval
+                    errors.append(e)
+            if not charts:
+                raise errors[-1]
+
+        results = []
+        for chart in charts:
+            # a range without prices may come with a null result
+            result = chart["chart"]["result"]
+            if result and "timestamp" in result[0]:
+                results.append(result[0])
+
+        if not results:
             raise DataNotAvailableError(
                 f"No price data found for '{self.symbol}' "
                 f"between {self.start} and {self.end}."
             )
 
-        timestamp = result_data["timestamp"]
-        price_data = result_data["indicators"]["quote"][0]
-        columns = ["Date", "close", "open", "high", "low", "volume"]
-
-        date_range = [pd.to_datetime(x, unit="s").normalize() for x in timestamp]
-        price_data["Date"] = date_range
+        if len(results) == 1:
+            return self._convert_chart(results[0])
 
-        price_table = pd.DataFrame(
-            price_data,
-            columns=columns,
+        # windows share their bounds, so a price may come twice
+        price_table = pd.concat(map(self._convert_chart, results),
+                                ignore_index=True)
+        price_table = (
+            price_table.drop_duplicates("Date", keep="last")
+            .sort_values("Date", kind="stable")
+            .reset_index(drop=True)
         )
-        price_table = price_table.round(2)
-        table_col = price_table.columns.tolist()
-        price_table.columns = [x.capitalize() for x in table_col]
 
         return price_table
 
@@ -97,6 +231,13 @@ class UsMarket(Price):
 class KorMarket(Price):
     """A class representing stock price of a South Korea company."""
 
+    #: Interval of investing.com for each interval supported.
+    INTERVALS = {
+        "1d": "Daily",
+        "1wk": "Weekly",
+        "1mo": "Monthly",
+    }
+
     def _get_raw_price_data(self) -> pd.DataFrame:
         """Get historical stock price data from source in a raw form.
 
@@ -115,7 +256,7 @@ class KorMarket(Price):
             "curr_id": curr_id,
             "st_date": st_date,
             "end_date": end_date,
-            "interval_sec": "Daily",
+            "interval_sec": self.INTERVALS[self.interval],
             "action": "historical_data",
         }
         res = Request(url, method="post", data=data)
@@ -140,10 +281,8 @@ class KorMarket(Price):
 
         data.rename(columns={"Price": "Close", "Vol.": "Volume"}, inplace=True)
 
-        data["Volume"] = data["Volume"].apply(
-            lambda x: float(x[:-1]) * 1000000 if x[-1] == "M" else float(x[:-1]) * 1000
-        )
-        data["Volume"] = data["Volume"].astype("int")
+        data["Volume"] = parse_numbers(data["Volume"]).astype("int64")
+        data[self.PRICE_COLUMNS] = data[self.PRICE_COLUMNS].astype(self.dtype)
         data["Date"] = pd.to_datetime(data["Date"])
 
         return data
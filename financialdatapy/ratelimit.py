@@ -0,0 +1,297 @@
+"""This module throttles requests sent to each data source."""
+from email.utils import parsedate_to_datetime
+import threading
+import time
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+#: Requests per second allowed to each domain and its subdomains.
+DEFAULT_RATES = {
+    'sec.gov': 10,
+    'opendart.fss.or.kr': 15,
+    'investing.com': 2,
+    'finance.yahoo.com': 10,
+}
+
+#: Requests per day allowed to each domain and its subdomains.
+DEFAULT_DAILY_QUOTAS = {
+    'opendart.fss.or.kr': 20_000,
+}
+
+#: Shortest wait between attempts to take a token, in seconds.
+MIN_WAIT = 0.001
+
+#: Status codes a source answers with when it is sent too many requests.
+THROTTLED_STATUS = (403, 429)
+
+
+def parse_retry_after(value: Optional[str]) -> float | None:
+    """Parse Retry-After header into seconds to wait.
+
+    :param value: Retry-After header either in seconds or in http date.
+    :type value: str or None
+    :return: Seconds to wait, or None if the header is missing or invalid.
+    :rtype: float or None
+    """
+    if value is None:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class TokenBucket:
+    """A class allowing requests at a steady rate with short bursts.
+
+    Each request takes a token. Tokens are refilled at ``rate`` per second up
+    to ``capacity``, and a request waits while the bucket is empty. When the
+    source pushes back, the rate is halved and restored gradually as
+    requests succeed again.
+
+    :param rate: Requests allowed per second.
+    :type rate: float
+    :param capacity: Maximum number of requests sent in a burst, defaults to
+        None. If None, one second worth of requests is allowed.
+    :type capacity: Optional[float], optional
+    :param clock: Function returning the current time in seconds,
+        defaults to :func:`time.monotonic`.
+    :type clock: Callable, optional
+    :param sleep: Function pausing for the given seconds,
+        defaults to :func:`time.sleep`.
+    :type sleep: Callable, optional
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep) -> None:
+        """Initialize TokenBucket."""
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = rate if capacity is None else capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Add tokens accumulated since the last update.
+
+        :param now: Current time.
+        :type now: float
+        """
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    def acquire(self) -> float:
+        """Take a token, waiting until one is available.
+
+        :return: Seconds waited.
+        :rtype: float
+        """
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                # tolerate the rounding error left by refilling in fractions
+                if now >= self._paused_until and self._tokens >= 1 - 1e-9:
+                    self._tokens = max(self._tokens - 1, 0.0)
+                    return waited
+                wait = max(
+                    self._paused_until - now,
+                    (1 - self._tokens) / self.rate,
+                    MIN_WAIT,
+                )
+
+            self._sleep(wait)
+            waited += wait
+
+    def penalize(self, retry_after: Optional[float] = None) -> None:
+        """Slow down after the source refused a request for its rate.
+
+        The rate is halved, and no request is sent for ``retry_after``
+        seconds, or for as long as one token takes to refill.
+
+        :param retry_after: Seconds the source asked to wait, defaults to None.
+        :type retry_after: Optional[float], optional
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self.rate = max(self.rate / 2, self.base_rate / 64)
+            pause = 1 / self.rate if retry_after is None else retry_after
+            self._paused_until = max(self._paused_until, now + pause)
+            self._tokens = 0.0
+
+    def reward(self) -> None:
+        """Restore the rate gradually after a request succeeded."""
+        with self._lock:
+            if self.rate < self.base_rate:
+                self.rate = min(self.base_rate, self.rate * 1.1)
+
+
+class RateLimiter:
+    """A class keeping a token bucket for each data source.
+
+    A bucket is shared by a domain and its subdomains, e.g. 'sec.gov' limits
+    www.sec.gov and data.sec.gov together. Requests to hosts without a rate
+    are not throttled.
+
+    A daily quota is kept as a bucket holding a day worth of requests and
+    refilled over the day, so once it is spent requests are spread out
+    instead of being refused by the source.
+
+    :param rates: Requests per second allowed to each domain, defaults to
+        None. If None, :data:`DEFAULT_RATES` is used.
+    :type rates: Optional[dict], optional
+    :param daily_quotas: Requests per day allowed to each domain, defaults to
+        None. If None, :data:`DEFAULT_DAILY_QUOTAS` is used.
+    :type daily_quotas: Optional[dict], optional
+    """
+
+    def __init__(self, rates: Optional[dict] = None,
+                 daily_quotas: Optional[dict] = None) -> None:
+        """Initialize RateLimiter."""
+        self.rates = DEFAULT_RATES if rates is None else rates
+        if daily_quotas is None:
+            daily_quotas = DEFAULT_DAILY_QUOTAS
+        self.daily_quotas = daily_quotas
+        self._buckets = {}
+        self._quotas = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _find_domain(host: str, limits: dict) -> str | None:
+        """Find the most specific domain with a limit the host belongs to.
+
+        :param host: Hostname of the request.
+        :type host: str
+        :param limits: Limits mapped with their domain.
+        :type limits: dict
+        :return: Domain, or None if the host has no limit.
+        :rtype: str or None
+        """
+        domains = [
+            domain for domain in limits
+            if host == domain or host.endswith('.' + domain)
+        ]
+        if not domains:
+            return None
+        return max(domains, key=len)
+
+    def get_bucket(self, url: str) -> TokenBucket | None:
+        """Get the token bucket throttling requests per second to the url.
+
+        :param url: Url of the request.
+        :type url: str
+        :return: Token bucket, or None if the host is not throttled.
+        :rtype: TokenBucket or None
+        """
+        host = urlsplit(url).hostname or ''
+        domain = self._find_domain(host, self.rates)
+
+        if domain is None:
+            return None
+
+        with self._lock:
+            bucket = self._buckets.get(domain)
+            if bucket is None:
+                bucket = TokenBucket(self.rates[domain])
+                self._buckets[domain] = bucket
+
+        return bucket
+
+    def get_quota(self, url: str) -> TokenBucket | None:
+        """Get the token bucket keeping the daily quota of the url.
+
+        :param url: Url of the request.
+        :type url: str
+        :return: Token bucket, or None if the host has no daily quota.
+        :rtype: TokenBucket or None
+        """
+        host = urlsplit(url).hostname or ''
+        domain = self._find_domain(host, self.daily_quotas)
+
+        if domain is None:
+            return None
+
+        with self._lock:
+            quota = self._quotas.get(domain)
+            if quota is None:
+                per_day = self.daily_quotas[domain]
+                quota = TokenBucket(per_day / 86_400, capacity=per_day)
+                self._quotas[domain] = quota
+
+        return quota
+
+    def acquire(self, url: str) -> float:
+        """Wait until a request to the url is allowed.
+
+        :param url: Url of the request.
+        :type url: str
+        :return: Seconds waited.
+        :rtype: float
+        """
+        waited = 0.0
+
+        for bucket in (self.get_quota(url), self.get_bucket(url)):
+            if bucket is not None:
+                waited += bucket.acquire()
+
+        return waited
+
+    def update(self, url: str, status_code: int,
+               retry_after: Optional[str] = None) -> None:
+        """Adjust the rate of the source to how it answered.
+
+        :param url: Url of the request.
+        :type url: str
+        :param status_code: Status code of the response.
+        :type status_code: int
+        :param retry_after: Retry-After header of the response,
+            defaults to None.
+        :type retry_after: Optional[str], optional
+        """
+        bucket = self.get_bucket(url)
+        if bucket is None:
+            return
+
+        if status_code in THROTTLED_STATUS:
+            bucket.penalize(parse_retry_after(retry_after))
+        else:
+            bucket.reward()
+
+
+_rate_limiter = RateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter | None:
+    """Get the rate limiter shared by every request.
+
+    :return: Shared rate limiter, or None if throttling is disabled.
+    :rtype: RateLimiter or None
+    """
+    return _rate_limiter
+
+
+def set_rate_limiter(rate_limiter: RateLimiter | None) -> None:
+    """Replace the shared rate limiter, or disable throttling with None.
+
+    :param rate_limiter: Rate limiter to share from now on.
+    :type rate_limiter: RateLimiter or None
+    """
+    global _rate_limiter
+    _rate_limiter = rate_limiter
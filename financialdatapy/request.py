@@ -1,14 +1,27 @@
 """This module requests data from web."""
 
 from bs4 import BeautifulSoup
+from datetime import datetime
 from dotenv import load_dotenv
+import lxml.html
 import os
 import requests
+import threading
+import time
 from typing import Optional
 from urllib.parse import urlsplit
 from user_agent import generate_user_agent
+from financialdatapy.cache import ResponseCache
+from financialdatapy.cache import get_response_cache
+from financialdatapy.cache import make_cache_key
 from financialdatapy.exception import EmptySecUserAgentException
 from financialdatapy.exception import NotAvailable
+from financialdatapy.ratelimit import RateLimiter
+from financialdatapy.ratelimit import get_rate_limiter
+from financialdatapy.retry import DEFAULT_TIMEOUT
+from financialdatapy.retry import RetryPolicy
+from financialdatapy.session import get_session_manager
+from financialdatapy.session import run_in_executor
 
 
 def get_sec_user_agent() -> str:
@@ -57,6 +70,10 @@ def get_user_agent() -> str:
 class Request:
     """A class sending and receiving http request.
 
+    The request is sent once, on the first access to :attr:`response`, and
+    the response is kept for every later access. Call :meth:`refresh` to
+    send it again.
+
     :param url: Url of the data source.
     :type url: str
     :param method: Which http methods to request, defaults to 'get'.
@@ -67,10 +84,28 @@ class Request:
     :type params: dict, optional
     :param data: Data to pass when making POST request, defaults to None.
     :type data: Optional[dict], optional
+    :param session: Session to send the request with, defaults to None. If
+        None, the pooled session shared for the host is used.
+    :type session: Optional[requests.Session], optional
+    :param cache: Cache to keep the response in across processes, defaults to
+        None. If None, the shared cache set by
+        :func:`financialdatapy.cache.set_response_cache` is used, if any. If
+        False, the response is not cached.
+    :type cache: Optional[ResponseCache | bool], optional
+    :param rate_limiter: Rate limiter throttling the request, defaults to
+        None. If None, the shared rate limiter is used.
+    :type rate_limiter: Optional[RateLimiter], optional
+    :param retry: How a failed request is retried, defaults to None. If None,
+        :class:`financialdatapy.retry.RetryPolicy` with its defaults is used.
+    :type retry: Optional[RetryPolicy], optional
+    :param timeout: Seconds to wait for the source, either one number or a
+        tuple of connect and read timeouts, defaults to
+        :data:`financialdatapy.retry.DEFAULT_TIMEOUT`.
+    :type timeout: float | tuple[float, float], optional
     """
 
     #: Available types of response data.
-    ResponseType = bytes | str | dict | BeautifulSoup
+    ResponseType = bytes | str | dict | BeautifulSoup | lxml.html.HtmlElement
 
     def __init__(
         self,
@@ -79,6 +114,11 @@ class Request:
         headers: Optional[dict] = None,
         params: Optional[dict] = None,
         data: Optional[dict] = None,
+        session: Optional[requests.Session] = None,
+        cache: Optional[ResponseCache | bool] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        timeout: float | tuple[float, float] = DEFAULT_TIMEOUT,
     ) -> None:
         """Initialize Request."""
         self.url = url
@@ -86,6 +126,16 @@ class Request:
         self.headers = headers
         self.params = params
         self.data = data
+        self.session = session
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retry = RetryPolicy() if retry is None else retry
+        self.timeout = timeout
+        self._response = None
+        self._elapsed = None
+        self._fetched_at = None
+        self._from_cache = False
+        self._lock = threading.Lock()
 
     @property
     def headers(self) -> dict:
@@ -125,30 +175,259 @@ class Request:
             "X-Requested-With": "XMLHttpRequest",
         }
 
+    @property
+    def session(self) -> requests.Session:
+        """Getter method of property session.
+
+        :return: Session the request is sent with.
+        :rtype: requests.Session
+        """
+        if self._session is None:
+            return get_session_manager().get_session(self.url)
+        return self._session
+
+    @session.setter
+    def session(self, session: requests.Session | None) -> None:
+        """Setter method of property session.
+
+        :param session: Session to send the request with. If None, the pooled
+            session shared for the host is used.
+        :type session: requests.Session or None
+        """
+        self._session = session
+
+    @property
+    def cache(self) -> ResponseCache | None:
+        """Getter method of property cache.
+
+        :return: Cache the response is kept in, or None if not cached.
+        :rtype: ResponseCache or None
+        """
+        if self._cache is None:
+            return get_response_cache()
+        if self._cache is False:
+            return None
+        return self._cache
+
+    @cache.setter
+    def cache(self, cache: ResponseCache | bool | None) -> None:
+        """Setter method of property cache.
+
+        :param cache: Cache to keep the response in. If None, the shared
+            cache is used, if any. If False, the response is not cached.
+        :type cache: ResponseCache or bool or None
+        """
+        self._cache = cache
+
+    @property
+    def rate_limiter(self) -> RateLimiter | None:
+        """Getter method of property rate_limiter.
+
+        :return: Rate limiter throttling the request, or None if throttling
+            is disabled.
+        :rtype: RateLimiter or None
+        """
+        if self._rate_limiter is None:
+            return get_rate_limiter()
+        return self._rate_limiter
+
+    @rate_limiter.setter
+    def rate_limiter(self, rate_limiter: RateLimiter | None) -> None:
+        """Setter method of property rate_limiter.
+
+        :param rate_limiter: Rate limiter throttling the request. If None,
+            the shared rate limiter is used.
+        :type rate_limiter: RateLimiter or None
+        """
+        self._rate_limiter = rate_limiter
+
     @property
     def response(self) -> requests.Response:
-        """Sends a HTTP request to a data source url.
+        """Response of the HTTP request, sent on the first access only.
 
         :raises: :py:class:`requests.exceptions.HTTPError` An HTTP error occurred.
         :return: A response object from the source.
         :rtype: requests.Response
         """
+        with self._lock:
+            if self._response is None:
+                self._send()
+            return self._response
 
-        if self.method == "post":
-            res = requests.post(self.url, data=self.data, headers=self.headers)
-        else:
-            res = requests.get(self.url, params=self.params, headers=self.headers)
+    def refresh(self) -> requests.Response:
+        """Send the HTTP request again, replacing the kept response.
+
+        A cached response is revalidated with the source even if it is
+        still fresh.
+
+        :raises: :py:class:`requests.exceptions.HTTPError` An HTTP error occurred.
+        :return: A new response object from the source.
+        :rtype: requests.Response
+        """
+        with self._lock:
+            self._send(revalidate=True)
+            return self._response
+
+    def _send(self, revalidate: bool = False) -> None:
+        """Send a HTTP request to a data source url and keep the response.
+
+        :param revalidate: Whether to ask the source about a cached response
+            that is still fresh, defaults to False.
+        :type revalidate: bool, optional
+        :raises: :py:class:`requests.exceptions.HTTPError` An HTTP error occurred.
+        """
+        fetched_at = datetime.now()
+        started = time.perf_counter()
+
+        cache = self.cache
+        key = None
+        entry = None
+        headers = self.headers
+
+        if cache is not None and cache.is_cacheable(self.method, self.url):
+            key = make_cache_key(self.method, self.url, self.params, self.data)
+            entry = cache.get(key)
+
+        if entry is not None:
+            if not revalidate and cache.is_fresh(entry):
+                self._keep(entry.to_response(), started, fetched_at, True)
+                return
+            headers = {**headers, **entry.validators()}
+
+        res = self._send_with_retry(headers)
+
+        if entry is not None and res.status_code == 304:
+            cache.renew(key)
+            self._keep(entry.to_response(), started, fetched_at, True)
+            return
 
         if res.status_code != 200:
             res.raise_for_status()
 
+        # other 2xx responses would be served later as if they were 200
+        if key is not None and res.status_code == 200:
+            cache.set(key, self.url, res)
+
+        self._keep(res, started, fetched_at, False)
+
+    def _send_with_retry(self, headers: dict) -> requests.Response:
+        """Send a HTTP request, retrying it as the retry policy allows.
+
+        :param headers: Http request headers.
+        :type headers: dict
+        :raises: :py:class:`requests.exceptions.RequestException` Sending the
+            request failed on the last try.
+        :return: Response of the last try.
+        :rtype: requests.Response
+        """
+        retry = 0
+
+        while True:
+            try:
+                res = self._send_once(headers)
+            except Exception as error:
+                if (retry >= self.retry.total
+                        or not self.retry.is_retryable_exception(error)):
+                    raise
+                self.retry.sleep(self.retry.get_backoff(retry))
+                retry += 1
+                continue
+
+            if (retry >= self.retry.total
+                    or not self.retry.is_retryable_status(res.status_code)):
+                return res
+
+            retry_after = res.headers.get("Retry-After")
+            self.retry.sleep(self.retry.get_backoff(retry, retry_after))
+            retry += 1
+
+    def _send_once(self, headers: dict) -> requests.Response:
+        """Send a HTTP request once, throttled by the rate limiter.
+
+        :param headers: Http request headers.
+        :type headers: dict
+        :return: Response from the source.
+        :rtype: requests.Response
+        """
+        rate_limiter = self.rate_limiter
+        if rate_limiter is not None:
+            rate_limiter.acquire(self.url)
+
+        if self.method == "post":
+            res = self.session.post(self.url, data=self.data, headers=headers,
+                                    timeout=self.timeout)
+        else:
+            res = self.session.get(self.url, params=self.params,
+                                   headers=headers, timeout=self.timeout)
+
+        if rate_limiter is not None:
+            retry_after = res.headers.get("Retry-After")
+            rate_limiter.update(self.url, res.status_code, retry_after)
+
         return res
 
+    def _keep(self, res: requests.Response, started: float,
+              fetched_at: datetime, from_cache: bool) -> None:
+        """Keep the response with the metadata of its fetch.
+
+        :param res: Response to keep.
+        :type res: requests.Response
+        :param started: Performance counter when the fetch started.
+        :type started: float
+        :param fetched_at: Local time when the fetch started.
+        :type fetched_at: `datetime.datetime`
+        :param from_cache: Whether the body was served from the cache.
+        :type from_cache: bool
+        """
+        self._response = res
+        self._elapsed = time.perf_counter() - started
+        self._fetched_at = fetched_at
+        self._from_cache = from_cache
+
+    @property
+    def elapsed(self) -> float | None:
+        """Seconds taken to receive the kept response.
+
+        :return: Elapsed seconds, or None if the request is not sent yet.
+        :rtype: float or None
+        """
+        return self._elapsed
+
+    @property
+    def fetched_at(self) -> datetime | None:
+        """Local time the kept response was requested at.
+
+        :return: Time of the request, or None if the request is not sent yet.
+        :rtype: `datetime.datetime` or None
+        """
+        return self._fetched_at
+
+    @property
+    def from_cache(self) -> bool:
+        """Whether the body of the kept response was served from the cache.
+
+        :return: True if the body came from the cache.
+        :rtype: bool
+        """
+        return self._from_cache
+
+    @property
+    def size(self) -> int | None:
+        """Size of the kept response body.
+
+        :return: Number of bytes, or None if the request is not sent yet.
+        :rtype: int or None
+        """
+        if self._response is None:
+            return None
+        return len(self._response.content)
+
     def response_data(self, res_type: str) -> ResponseType:
         """Return data depending on the data type.
 
-        :param res_type: Type of response data. 'content', 'text', 'json', or
-            'beautifulsoup'.
+        :param res_type: Type of response data. 'content', 'text', 'json',
+            'beautifulsoup', or 'lxml'. 'lxml' parses html into an element
+            tree in C, much faster than 'beautifulsoup' for large pages.
         :type res_type: str
         :raises NotAvailable: Response data is not available.
         :return: Bytes, text, or json file containing requested data.
@@ -163,5 +442,87 @@ class Request:
                 return self.response.json()
             case "beautifulsoup":
                 return BeautifulSoup(self.response.text, "html.parser")
+            case "lxml":
+                return lxml.html.fromstring(self.response.content)
             case _:
                 raise NotAvailable("Response type is not valid.")
+
+
+class AsyncRequest:
+    """Asyncio counterpart of :class:`Request`.
+
+    No async http client is among the dependencies, so the request is sent
+    from the worker threads of :func:`financialdatapy.session.get_executor`
+    over the same pooled sessions, with the same cache, rate limiter and
+    retries. Many requests can be awaited together from one event loop.
+
+    :param url: Url of the data source.
+    :type url: str
+    :param method: Which http methods to request, defaults to 'get'.
+    :type method: str, optional
+    :param headers: Http request headers, defaults to None.
+    :type headers: dict, optional
+    :param params: URL parameters to attach, defaults to None.
+    :type params: dict, optional
+    :param data: Data to pass when making POST request, defaults to None.
+    :type data: Optional[dict], optional
+    :param session: Session to send the request with, defaults to None.
+    :type session: Optional[requests.Session], optional
+    :param cache: Cache to keep the response in, defaults to None. If False,
+        the response is not cached.
+    :type cache: Optional[ResponseCache | bool], optional
+    :param rate_limiter: Rate limiter throttling the request, defaults to None.
+    :type rate_limiter: Optional[RateLimiter], optional
+    :param retry: How a failed request is retried, defaults to None.
+    :type retry: Optional[RetryPolicy], optional
+    :param timeout: Seconds to wait for the source, defaults to
+        :data:`financialdatapy.retry.DEFAULT_TIMEOUT`.
+    :type timeout: float | tuple[float, float], optional
+    """
+
+    def __init__(
+        self,
+        url: str,
+        method: str = "get",
+        headers: Optional[dict] = None,
+        params: Optional[dict] = None,
+        data: Optional[dict] = None,
+        session: Optional[requests.Session] = None,
+        cache: Optional[ResponseCache | bool] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        timeout: float | tuple[float, float] = DEFAULT_TIMEOUT,
+    ) -> None:
+        """Initialize AsyncRequest."""
+        self.request = Request(url, method, headers, params, data, session,
+                               cache, rate_limiter, retry, timeout)
+
+    async def response(self) -> requests.Response:
+        """Send the HTTP request on the first call and return the response.
+
+        :raises: :py:class:`requests.exceptions.HTTPError` An HTTP error occurred.
+        :return: A response object from the source.
+        :rtype: requests.Response
+        """
+        return await run_in_executor(lambda: self.request.response)
+
+    async def refresh(self) -> requests.Response:
+        """Send the HTTP request again, replacing the kept response.
+
+        :raises: :py:class:`requests.exceptions.HTTPError` An HTTP error occurred.
+        :return: A new response object from the source.
+        :rtype: requests.Response
+        """
+        return await run_in_executor(self.request.refresh)
+
+    async def response_data(self, res_type: str) -> Request.ResponseType:
+        """Return data depending on the data type.
+
+        :param res_type: Type of response data. 'content', 'text', 'json',
+            'beautifulsoup', or 'lxml'.
+        :type res_type: str
+        :raises NotAvailable: Response data is not available.
+        :return: Bytes, text, or json file containing requested data.
+        :rtype: Request.ResponseType
+        """
+        return await run_in_executor(self.request.response_data, res_type)
@@ -0,0 +1,112 @@
+"""This module decides when and how long to wait before retrying requests."""
+import random
+import time
+from typing import Callable, Optional
+import requests
+from financialdatapy.ratelimit import parse_retry_after
+
+#: Seconds to wait for connecting to a source and for reading its response.
+DEFAULT_TIMEOUT = (10, 60)
+
+
+class RetryPolicy:
+    """A class representing how a failed request is retried.
+
+    A request is retried when the source answers with one of
+    ``status_forcelist`` or sending it raises one of ``exceptions``. The wait
+    before each retry grows exponentially with full jitter, unless the source
+    asks for a wait with Retry-After header.
+
+    :param total: Maximum number of retries, defaults to 3. 0 disables retry.
+    :type total: int, optional
+    :param status_forcelist: Status codes to retry, defaults to
+        (429, 500, 502, 503, 504).
+    :type status_forcelist: tuple, optional
+    :param exceptions: Exceptions to retry, defaults to connection errors and
+        timeouts.
+    :type exceptions: tuple, optional
+    :param backoff_factor: Seconds the wait is based on, defaults to 0.5. The
+        n-th retry waits up to ``backoff_factor * 2 ** n`` seconds.
+    :type backoff_factor: float, optional
+    :param backoff_max: Maximum seconds of the wait, defaults to 60.
+    :type backoff_max: float, optional
+    :param jitter: Whether to randomize the wait, defaults to True.
+    :type jitter: bool, optional
+    :param respect_retry_after: Whether to wait as long as Retry-After header
+        asks, defaults to True.
+    :type respect_retry_after: bool, optional
+    :param retry_after_max: Maximum seconds of a wait asked by Retry-After
+        header, defaults to 300. A longer wait is cut to it, so a source
+        asking for hours does not stall every worker for that long.
+    :type retry_after_max: float, optional
+    :param sleep: Function pausing for the given seconds,
+        defaults to :func:`time.sleep`.
+    :type sleep: Callable, optional
+    """
+
+    def __init__(
+        self,
+        total: int = 3,
+        status_forcelist: tuple = (429, 500, 502, 503, 504),
+        exceptions: tuple = (requests.ConnectionError, requests.Timeout),
+        backoff_factor: float = 0.5,
+        backoff_max: float = 60,
+        jitter: bool = True,
+        respect_retry_after: bool = True,
+        retry_after_max: float = 300,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Initialize RetryPolicy."""
+        self.total = total
+        self.status_forcelist = status_forcelist
+        self.exceptions = exceptions
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.respect_retry_after = respect_retry_after
+        self.retry_after_max = retry_after_max
+        self.sleep = sleep
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        """Check if a response with the status code should be retried.
+
+        :param status_code: Status code of the response.
+        :type status_code: int
+        :return: True if the request should be retried.
+        :rtype: bool
+        """
+        return status_code in self.status_forcelist
+
+    def is_retryable_exception(self, error: Exception) -> bool:
+        """Check if a request raising the error should be retried.
+
+        :param error: Error raised while sending the request.
+        :type error: Exception
+        :return: True if the request should be retried.
+        :rtype: bool
+        """
+        return isinstance(error, self.exceptions)
+
+    def get_backoff(self, retry: int,
+                    retry_after: Optional[str] = None) -> float:
+        """Get seconds to wait before a retry.
+
+        :param retry: Number of retries made so far.
+        :type retry: int
+        :param retry_after: Retry-After header of the response,
+            defaults to None.
+        :type retry_after: Optional[str], optional
+        :return: Seconds to wait.
+        :rtype: float
+        """
+        if self.respect_retry_after:
+            seconds = parse_retry_after(retry_after)
+            if seconds is not None:
+                return min(seconds, self.retry_after_max)
+
+        backoff = min(self.backoff_max, self.backoff_factor * 2 ** retry)
+
+        if self.jitter:
+            return random.uniform(0, backoff)
+
+        return backoff
@@ -1,7 +1,153 @@
 """This module searches pair_id of a company from investing.com."""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import json
+import os
+from pathlib import Path
+import tempfile
+import threading
+from typing import Iterable, Optional
 from financialdatapy.request import Request
 
 
+class PairIdCache:
+    """A class keeping pair_id of each symbol searched.
+
+    A pair_id rarely changes, so it is reused for ``ttl`` instead of being
+    searched for every request to investing.com. When a path is given, the
+    pair_ids are also kept in a json file and reused by later processes.
+
+    :param path: Json file to keep pair_ids in, defaults to None. If None,
+        pair_ids are kept in memory only.
+    :type path: Optional[str | pathlib.Path], optional
+    :param ttl: How long a pair_id is reused, defaults to 30 days. If None,
+        it is reused until cleared.
+    :type ttl: Optional[datetime.timedelta], optional
+    """
+
+    def __init__(self, path: Optional[str | Path] = None,
+                 ttl: Optional[timedelta] = timedelta(days=30)) -> None:
+        """Initialize PairIdCache."""
+        self.path = None if path is None else Path(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    @staticmethod
+    def _make_key(symbol: str) -> str:
+        """Make a key of a symbol, ignoring its case and spaces around.
+
+        :param symbol: Stock symbol.
+        :type symbol: str
+        :return: Key of the symbol.
+        :rtype: str
+        """
+        return symbol.strip().upper()
+
+    def _load(self) -> dict:
+        """Load pair_ids kept in the json file.
+
+        :return: Pair_id and when it was searched mapped with each symbol.
+        :rtype: dict
+        """
+        if self.path is None:
+            return {}
+
+        try:
+            entries = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+        return entries if isinstance(entries, dict) else {}
+
+    def _save(self) -> None:
+        """Write pair_ids to the json file, replacing it at once."""
+        if self.path is None:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(prefix=f'.{self.path.name}-',
+                                        dir=self.path.parent)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_file, self.path)
+
+    def get(self, symbol: str) -> str | None:
+        """Get pair_id of a symbol searched before.
+
+        :param symbol: Stock symbol.
+        :type symbol: str
+        :return: Pair_id, or None if it is not kept or expired.
+        :rtype: str or None
+        """
+        with self._lock:
+            entry = self._entries.get(self._make_key(symbol))
+
+        if entry is None:
+            return None
+
+        if self.ttl is not None:
+            searched_at = datetime.fromisoformat(entry['searched_at'])
+            if datetime.now() - searched_at >= self.ttl:
+                return None
+
+        return entry['pair_id']
+
+    def set(self, symbol: str, pair_id: str) -> None:
+        """Keep pair_id of a symbol.
+
+        :param symbol: Stock symbol.
+        :type symbol: str
+        :param pair_id: Pair_id of the symbol.
+        :type pair_id: str
+        """
+        self.update({symbol: pair_id})
+
+    def update(self, pair_ids: dict[str, str]) -> None:
+        """Keep pair_ids of many symbols, writing the json file once.
+
+        :param pair_ids: Pair_id mapped with each symbol.
+        :type pair_ids: dict[str, str]
+        """
+        searched_at = datetime.now().isoformat()
+
+        with self._lock:
+            for symbol, pair_id in pair_ids.items():
+                self._entries[self._make_key(symbol)] = {
+                    'pair_id': pair_id,
+                    'searched_at': searched_at,
+                }
+            self._save()
+
+    def clear(self) -> None:
+        """Remove every pair_id kept."""
+        with self._lock:
+            self._entries = {}
+            self._save()
+
+
+_pair_id_cache = PairIdCache()
+
+
+def get_pair_id_cache() -> PairIdCache | None:
+    """Get the pair_id cache shared by every search.
+
+    :return: Shared pair_id cache, or None if caching is disabled.
+    :rtype: PairIdCache or None
+    """
+    return _pair_id_cache
+
+
+def set_pair_id_cache(pair_id_cache: PairIdCache | None) -> None:
+    """Replace the shared pair_id cache, or disable caching with None.
+
+    :param pair_id_cache: Pair_id cache to share from now on.
+    :type pair_id_cache: PairIdCache or None
+    """
+    global _pair_id_cache
+    _pair_id_cache = pair_id_cache
+
+
 class Company:
     """A class representing a company name.
 
@@ -16,6 +162,28 @@ class Company:
     def search_pair_id(self) -> str:
         """Search pair_id of a company from investing.com.
 
+        A pair_id found in the shared :class:`PairIdCache` is returned
+        without sending a request.
+
+        :return: pair_id of a company.
+        :rtype: str
+        """
+        pair_id_cache = get_pair_id_cache()
+        if pair_id_cache is not None:
+            pair_id = pair_id_cache.get(self.symbol)
+            if pair_id is not None:
+                return pair_id
+
+        pair_id = self._search_pair_id()
+
+        if pair_id_cache is not None:
+            pair_id_cache.set(self.symbol, pair_id)
+
+        return pair_id
+
+    def _search_pair_id(self) -> str:
+        """Send a search for pair_id of a company to investing.com.
+
         :return: pair_id of a company.
         :rtype: str
         """
@@ -29,3 +197,46 @@ class Company:
         pair_id = first_quote_result['pairId']
 
         return pair_id
+
+
+def prewarm(symbols: Iterable[str],
+            max_workers: int = 4) -> dict[str, Exception]:
+    """Search pair_ids of many symbols concurrently into the shared cache.
+
+    Symbols whose pair_id is already cached are not searched again.
+
+    :param symbols: Stock symbols.
+    :type symbols: Iterable[str]
+    :param max_workers: Maximum number of searches sent at the same time,
+        defaults to 4.
+    :type max_workers: int, optional
+    :return: Error of each symbol failed.
+    :rtype: dict[str, Exception]
+    """
+    pair_id_cache = get_pair_id_cache()
+    if pair_id_cache is None:
+        return {}
+
+    symbols = [
+        symbol for symbol in dict.fromkeys(symbols)
+        if pair_id_cache.get(symbol) is None
+    ]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            symbol: executor.submit(Company(symbol)._search_pair_id)
+            for symbol in symbols
+        }
+
+    pair_ids = {}
+    failures = {}
+
+    for symbol, future in futures.items():
+        try:
+            pair_ids[symbol] = future.result()
+        except Exception as error:
+            failures[symbol] = error
+
+    pair_id_cache.update(pair_ids)
+
+    return failures
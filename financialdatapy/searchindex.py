@@ -0,0 +1,249 @@
+"""This module searches company names in the stock lists without network."""
+from bisect import bisect_left
+from collections import Counter
+import re
+import threading
+import unicodedata
+import pandas as pd
+from typing import Iterable
+from financialdatapy.exception import EmptyDataFrameError
+from financialdatapy.stocklist import KorStockList
+from financialdatapy.stocklist import UsStockList
+from financialdatapy.stocklist import get_shared_stock_list
+
+#: Words of a company's legal form ignored when matching names.
+LEGAL_FORMS = frozenset([
+    'inc', 'corp', 'corporation', 'co', 'company', 'ltd', 'limited', 'plc',
+    'llc', 'lp', 'sa', 'ag', 'nv', 'the', '주', '주식회사', '유',
+])
+
+_WORD = re.compile(r'\w+')
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a company name into a key for matching.
+
+    Width and letter case are folded, punctuation and spaces are removed, and
+    words of a legal form such as 'Inc' or '(주)' are dropped.
+
+    :param name: Company name.
+    :type name: str
+    :return: Normalized name.
+    :rtype: str
+    """
+    name = unicodedata.normalize('NFKC', name).casefold()
+    words = [x for x in _WORD.findall(name) if x not in LEGAL_FORMS]
+    return ''.join(words)
+
+
+def _ngrams(key: str, n: int = 3) -> set[str]:
+    """Split a normalized name into character n-grams.
+
+    Hangul syllables are decomposed into their letters first, so a name
+    with one wrong letter still shares most of its n-grams.
+
+    :param key: Normalized name.
+    :type key: str
+    :param n: Length of an n-gram, defaults to 3.
+    :type n: int, optional
+    :return: N-grams of the name.
+    :rtype: set[str]
+    """
+    letters = unicodedata.normalize('NFD', key)
+    padded = f' {letters} '
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+class NameIndex:
+    """A class searching companies by their name in memory.
+
+    Names are matched exactly, by prefix, or fuzzily by the share of
+    character trigrams they have in common. Only an exact match is trusted
+    to pick a company, as similar names are often different stocks, e.g.
+    common and preferred shares. Prefix and fuzzy matches are suggestions.
+
+    :param names: Company names.
+    :type names: Iterable[str]
+    :param codes: Code of each company, e.g. ticker or stock code.
+    :type codes: Iterable[str]
+    """
+
+    def __init__(self, names: Iterable[str], codes: Iterable[str]) -> None:
+        """Initialize NameIndex."""
+        self.names = []
+        self.codes = []
+        self._exact = {}
+        self._ambiguous = set()
+        self._grams = []
+        self._postings = {}
+        keys = []
+
+        for name, code in zip(names, codes):
+            if not isinstance(name, str) or not name:
+                continue
+            key = normalize_name(name)
+            if not key:
+                continue
+            i = len(self.names)
+            self.names.append(name)
+            self.codes.append(code)
+            keys.append(key)
+            first = self._exact.setdefault(key, i)
+            if self.codes[first] != code:
+                self._ambiguous.add(key)
+            grams = _ngrams(key)
+            self._grams.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(i)
+
+        self._sorted = sorted(zip(keys, range(len(keys))))
+        self._sorted_keys = [key for key, _ in self._sorted]
+
+    def __len__(self) -> int:
+        """Number of names in the index.
+
+        :return: Number of names.
+        :rtype: int
+        """
+        return len(self.names)
+
+    def prefix(self, query: str, limit: int = 10) -> list[tuple[str, str]]:
+        """Find companies whose name starts with the query.
+
+        :param query: Beginning of a company name.
+        :type query: str
+        :param limit: Maximum number of companies returned, defaults to 10.
+        :type limit: int, optional
+        :return: Name and code of the companies, shortest name first.
+        :rtype: list[tuple[str, str]]
+        """
+        key = normalize_name(query)
+        if not key:
+            return []
+
+        start = bisect_left(self._sorted_keys, key)
+        matches = []
+
+        for candidate, i in self._sorted[start:]:
+            if not candidate.startswith(key):
+                break
+            matches.append((len(candidate), i))
+
+        matches.sort()
+        return [(self.names[i], self.codes[i]) for _, i in matches[:limit]]
+
+    def search(self, query: str,
+               limit: int = 10) -> list[tuple[str, str, float]]:
+        """Find companies whose name is similar to the query.
+
+        :param query: Company name to search.
+        :type query: str
+        :param limit: Maximum number of companies returned, defaults to 10.
+        :type limit: int, optional
+        :return: Name, code and similarity between 0 and 1 of the companies,
+            most similar first. An exact match scores 1.
+        :rtype: list[tuple[str, str, float]]
+        """
+        key = normalize_name(query)
+        if not key:
+            return []
+
+        grams = _ngrams(key)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+
+        scores = {
+            i: 2 * count / (len(grams) + self._grams[i])
+            for i, count in shared.items()
+        }
+        exact = self._exact.get(key)
+        if exact is not None:
+            scores[exact] = 1.0
+
+        best = sorted(scores.items(), key=lambda x: (-x[1], x[0]))[:limit]
+        return [(self.names[i], self.codes[i], score) for i, score in best]
+
+    def resolve(self, query: str) -> str:
+        """Get the code of the company named as the query.
+
+        Names are compared after :func:`normalize_name`. A misspelled name is
+        not resolved, so it never picks a similar but different stock. Use
+        :meth:`search` to suggest names instead.
+
+        :param query: Company name to search.
+        :type query: str
+        :raises EmptyDataFrameError: If no company, or more than one company
+            with different codes, has the name.
+        :return: Code of the company.
+        :rtype: str
+        """
+        key = normalize_name(query)
+        i = self._exact.get(key)
+        if i is None or key in self._ambiguous:
+            raise EmptyDataFrameError('Cannot search for the company name.')
+        return self.codes[i]
+
+    @classmethod
+    def from_us_stock_list(cls, stock_list: pd.DataFrame) -> 'NameIndex':
+        """Build an index of ticker by name from :class:`UsStockList`.
+
+        :param stock_list: Stock list of US exchange.
+        :type stock_list: pandas.DataFrame
+        :return: Index of the stock list.
+        :rtype: NameIndex
+        """
+        return cls(stock_list['name'], stock_list['ticker'])
+
+    @classmethod
+    def from_kor_stock_list(cls, stock_list: pd.DataFrame) -> 'NameIndex':
+        """Build an index of stock code by Korean and English name.
+
+        :param stock_list: Stock list of Korea Exchange from
+            :class:`KorStockList`.
+        :type stock_list: pandas.DataFrame
+        :return: Index of the stock list.
+        :rtype: NameIndex
+        """
+        names = list(stock_list['corp_name'])
+        codes = list(stock_list['stock_code'])
+        if 'corp_eng_name' in stock_list:
+            names += list(stock_list['corp_eng_name'])
+            codes += list(stock_list['stock_code'])
+        return cls(names, codes)
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_name_index(country_code: str) -> NameIndex:
+    """Get the name index of a stock exchange built from its shared list.
+
+    The index is rebuilt when the shared stock list is reloaded.
+
+    :param country_code: Country of the stock exchange, 'USA' or 'KOR'.
+    :type country_code: str
+    :raises EmptyDataFrameError: If there is no stock list of the country.
+    :return: Name index.
+    :rtype: NameIndex
+    """
+    match country_code.upper():
+        case 'USA':
+            stock_list = get_shared_stock_list(UsStockList)
+            build = NameIndex.from_us_stock_list
+        case 'KOR':
+            stock_list = get_shared_stock_list(KorStockList)
+            build = NameIndex.from_kor_stock_list
+        case _:
+            raise EmptyDataFrameError('Stock list is not available.')
+
+    with _indexes_lock:
+        entry = _indexes.get(country_code.upper())
+        if entry is None or entry[0] is not stock_list:
+            entry = (stock_list, build(stock_list.stock_list))
+            _indexes[country_code.upper()] = entry
+
+    return entry[1]
@@ -0,0 +1,184 @@
+"""This module keeps http sessions and worker threads shared by requests."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+from http.cookiejar import DefaultCookiePolicy
+import threading
+from typing import Any, Callable
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+#: Default number of worker threads sending requests for the async api, and
+#: of connections kept alive per host so that every worker reuses one.
+DEFAULT_MAX_WORKERS = 32
+
+
+class SessionManager:
+    """A class handing out one pooled keep-alive session per host.
+
+    Reusing a session keeps the TCP and TLS connection to a host open, so
+    consecutive requests to the same source skip the handshake. A session is
+    shared by every thread, so by default it keeps no cookies and each
+    request is sent as statelessly as a bare :func:`requests.get`.
+
+    :param pool_maxsize: Maximum number of connections kept alive per host,
+        defaults to :data:`DEFAULT_MAX_WORKERS`.
+    :type pool_maxsize: int, optional
+    :param pool_block: Whether to wait for a free connection instead of
+        opening a throwaway one when the pool is exhausted, defaults to False.
+    :type pool_block: bool, optional
+    :param keep_cookies: Whether to keep cookies a host sets and send them
+        back with later requests, defaults to False.
+    :type keep_cookies: bool, optional
+    """
+
+    def __init__(self, pool_maxsize: int = DEFAULT_MAX_WORKERS,
+                 pool_block: bool = False,
+                 keep_cookies: bool = False) -> None:
+        """Initialize SessionManager."""
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_cookies = keep_cookies
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get_session(self, url: str) -> requests.Session:
+        """Get the session bound to the host of the url.
+
+        :param url: Url of the data source.
+        :type url: str
+        :return: Session shared by every request to the host.
+        :rtype: requests.Session
+        """
+        host = urlsplit(url).hostname or ''
+
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._create_session()
+                self._sessions[host] = session
+
+        return session
+
+    def _create_session(self) -> requests.Session:
+        """Create a session whose adapter keeps connections alive.
+
+        :return: New session.
+        :rtype: requests.Session
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        if not self.keep_cookies:
+            # no domain is allowed, so every cookie is rejected
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+        return session
+
+    def close(self) -> None:
+        """Close every session and release their connections."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+
+        for session in sessions:
+            session.close()
+
+
+_session_manager = SessionManager()
+
+
+def get_session_manager() -> SessionManager:
+    """Get the session manager shared by every request.
+
+    :return: Shared session manager.
+    :rtype: SessionManager
+    """
+    return _session_manager
+
+
+def set_session_manager(session_manager: SessionManager) -> None:
+    """Replace the shared session manager, e.g. to resize the pools.
+
+    Sessions of the previous manager are closed.
+
+    :param session_manager: Session manager to share from now on.
+    :type session_manager: SessionManager
+    """
+    global _session_manager
+    previous = _session_manager
+    _session_manager = session_manager
+
+    if previous is not session_manager:
+        previous.close()
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get the worker threads sending requests for the async api.
+
+    :return: Shared thread pool.
+    :rtype: concurrent.futures.ThreadPoolExecutor
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=DEFAULT_MAX_WORKERS,
+                thread_name_prefix='financialdatapy',
+            )
+
+    return _executor
+
+
+def set_max_workers(max_workers: int) -> None:
+    """Resize the worker threads sending requests for the async api.
+
+    The shared session manager is replaced with one keeping as many
+    connections alive per host, so every worker sending to the same host
+    reuses its connection instead of opening a throwaway one.
+
+    :param max_workers: Maximum number of requests sent at the same time.
+    :type max_workers: int
+    """
+    global _executor
+
+    manager = get_session_manager()
+    set_session_manager(SessionManager(
+        pool_maxsize=max_workers,
+        pool_block=manager.pool_block,
+        keep_cookies=manager.keep_cookies,
+    ))
+
+    with _executor_lock:
+        previous = _executor
+        _executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='financialdatapy',
+        )
+
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+
+async def run_in_executor(func: Callable, *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking function in the shared worker threads.
+
+    :param func: Function to run.
+    :type func: Callable
+    :return: Return value of the function.
+    :rtype: Any
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(func, *args, **kwargs)
+    return await loop.run_in_executor(get_executor(), call)
@@ -0,0 +1,217 @@
+"""This module stores cleaned stock lists on disk for fast loading."""
+from datetime import datetime, timedelta
+import json
+import os
+from pathlib import Path
+import shutil
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from typing import Optional
+from financialdatapy.cache import get_cache_dir
+
+#: Version of the snapshot layout. Snapshots of other versions are ignored.
+SNAPSHOT_VERSION = 2
+
+# seconds data replaced by a newer save is kept for processes still using
+# it, and for a slower save switching the manifest back to its data
+_GRACE_PERIOD = 3600
+
+
+class SnapshotStore:
+    """A class storing dataframes column by column in NumPy files.
+
+    Each save writes one ``.npy`` file per column to a new directory, then
+    switches the manifest of the snapshot to it with an atomic rename, so a
+    process loading or saving at the same time never sees a half-written
+    snapshot. The manifest holds the version, creation time and columns.
+    Replaced data is removed by a later save after an hour.
+
+    Numeric columns stay memory-mapped after loading, so they cost little
+    more than the pages used. Text columns are kept as fixed-width unicode
+    with a mask of missing values, and are read into Python strings on load,
+    as pandas holds them as objects.
+
+    :param path: Directory of the snapshots, defaults to None. If None,
+        ``snapshots`` in :func:`financialdatapy.cache.get_cache_dir` is used.
+    :type path: Optional[str | pathlib.Path], optional
+    :param max_age: How long a snapshot is used, defaults to one day. If
+        None, it is used until overwritten.
+    :type max_age: Optional[datetime.timedelta], optional
+    """
+
+    def __init__(self, path: Optional[str | Path] = None,
+                 max_age: Optional[timedelta] = timedelta(days=1)) -> None:
+        """Initialize SnapshotStore."""
+        if path is None:
+            path = get_cache_dir() / 'snapshots'
+        self.path = Path(path)
+        self.max_age = max_age
+
+    def save(self, name: str, df: pd.DataFrame) -> None:
+        """Store a dataframe as a snapshot, replacing the previous one.
+
+        :param name: Name of the snapshot.
+        :type name: str
+        :param df: Dataframe to store.
+        :type df: pandas.DataFrame
+        """
+        snapshot_dir = self.path / name
+        snapshot_dir.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix='.', dir=snapshot_dir))
+        columns = []
+
+        for i, column in enumerate(df.columns):
+            values = df[column]
+            if (pd.api.types.is_numeric_dtype(values)
+                    or pd.api.types.is_bool_dtype(values)):
+                np.save(tmp_dir / f'{i}.npy', values.to_numpy())
+                kind = 'numeric'
+            else:
+                mask = values.isna().to_numpy()
+                text = values.fillna('').astype(str).to_numpy(dtype=str)
+                np.save(tmp_dir / f'{i}.npy', text)
+                np.save(tmp_dir / f'{i}.mask.npy', mask)
+                kind = 'text'
+            columns.append({'name': str(column), 'kind': kind})
+
+        data_dir = snapshot_dir / tmp_dir.name[1:]
+        tmp_dir.rename(data_dir)
+
+        manifest = {
+            'version': SNAPSHOT_VERSION,
+            'created_at': datetime.now().isoformat(),
+            'directory': data_dir.name,
+            'rows': len(df),
+            'columns': columns,
+        }
+        fd, tmp_path = tempfile.mkstemp(prefix='.manifest-', dir=snapshot_dir)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, snapshot_dir / 'manifest.json')
+
+        self._remove_old_data(snapshot_dir, data_dir.name)
+
+    @staticmethod
+    def _remove_old_data(snapshot_dir: Path, current: str) -> None:
+        """Remove data replaced, and saves abandoned, long enough ago.
+
+        :param snapshot_dir: Directory of the snapshot.
+        :type snapshot_dir: pathlib.Path
+        :param current: Directory of the data saved last.
+        :type current: str
+        """
+        now = time.time()
+
+        for path in snapshot_dir.iterdir():
+            if path.name in ('manifest.json', current):
+                continue
+            try:
+                if now - path.stat().st_mtime < _GRACE_PERIOD:
+                    continue
+            except OSError:
+                continue
+
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
+
+    def get_manifest(self, name: str) -> dict | None:
+        """Get version, creation time and columns of a snapshot.
+
+        :param name: Name of the snapshot.
+        :type name: str
+        :return: Manifest, or None if there is no usable snapshot.
+        :rtype: dict or None
+        """
+        try:
+            manifest_file = self.path / name / 'manifest.json'
+            manifest = json.loads(manifest_file.read_text())
+        except (OSError, ValueError):
+            return None
+
+        if manifest.get('version') != SNAPSHOT_VERSION:
+            return None
+
+        return manifest
+
+    def is_fresh(self, manifest: dict) -> bool:
+        """Check if a snapshot is younger than max_age.
+
+        :param manifest: Manifest of the snapshot.
+        :type manifest: dict
+        :return: True if the snapshot can be used.
+        :rtype: bool
+        """
+        if self.max_age is None:
+            return True
+        created_at = datetime.fromisoformat(manifest['created_at'])
+        return datetime.now() - created_at < self.max_age
+
+    def load(self, name: str) -> pd.DataFrame | None:
+        """Load a snapshot, memory-mapping its columns.
+
+        A snapshot that cannot be read, e.g. as another process replaced it
+        in the meantime, is treated as missing.
+
+        :param name: Name of the snapshot.
+        :type name: str
+        :return: Stored dataframe, or None if there is no fresh snapshot.
+        :rtype: pandas.DataFrame or None
+        """
+        manifest = self.get_manifest(name)
+        if manifest is None or not self.is_fresh(manifest):
+            return None
+
+        try:
+            return self._read_data(manifest, self.path / name)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @staticmethod
+    def _read_data(manifest: dict, snapshot_dir: Path) -> pd.DataFrame:
+        """Read the columns a manifest points to.
+
+        :param manifest: Manifest of the snapshot.
+        :type manifest: dict
+        :param snapshot_dir: Directory of the snapshot.
+        :type snapshot_dir: pathlib.Path
+        :return: Stored dataframe.
+        :rtype: pandas.DataFrame
+        """
+        data_dir = snapshot_dir / manifest['directory']
+        data = {}
+
+        for i, column in enumerate(manifest['columns']):
+            values = np.load(data_dir / f'{i}.npy', mmap_mode='r')
+            if column['kind'] == 'text':
+                mask = np.load(data_dir / f'{i}.mask.npy')
+                values = pd.Series(values).mask(mask)
+            data[column['name']] = values
+
+        return pd.DataFrame(data, index=pd.RangeIndex(manifest['rows']),
+                            copy=False)
+
+
+_snapshot_store = None
+
+
+def get_snapshot_store() -> SnapshotStore | None:
+    """Get the snapshot store shared by every stock list.
+
+    :return: Shared snapshot store, or None if snapshots are not enabled.
+    :rtype: SnapshotStore or None
+    """
+    return _snapshot_store
+
+
+def set_snapshot_store(snapshot_store: SnapshotStore | None) -> None:
+    """Enable loading stock lists from snapshots, or disable it with None.
+
+    :param snapshot_store: Snapshot store to share from now on.
+    :type snapshot_store: SnapshotStore or None
+    """
+    global _snapshot_store
+    _snapshot_store = snapshot_store
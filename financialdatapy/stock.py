@@ -3,9 +3,17 @@ from financialdatapy.date import validate_date
 import pandas as pd
 import re
 from typing import Optional
+import requests
 from financialdatapy.stocklist import KorStockList
 from financialdatapy.exception import CountryCodeValidationFailed
+from financialdatapy.exception import DartError
+from financialdatapy.exception import EmptyApiKeyException
+from financialdatapy.exception import EmptyDataFrameError
+from financialdatapy.financials import CompanyContext
+from financialdatapy.market import AsyncMarket
 from financialdatapy.market import Market
+from financialdatapy.searchindex import get_name_index
+from financialdatapy.session import run_in_executor
 
 
 class Stock:
@@ -18,8 +26,13 @@ class Stock:
     :type country_code: str, optional
     """
 
+    #: Class of the stock exchange the stock is retrieved from.
+    market_class = Market
+
     def __init__(self, symbol: str, country_code: str = 'USA') -> None:
         """Initialize Stock."""
+        self._market = None
+        self._context = None
         self.country_code = country_code
         self.symbol = symbol
 
@@ -62,19 +75,41 @@ class Stock:
         """
         country_code = self._validate_country_code(country_code)
         self._country_code = country_code.upper()
+        self._market = None
 
     @property
     def market(self) -> Market:
         """Property of :class:`market.Market` instance.
 
+        The instance is created once and reused by every call.
+
         :return: :class:`market.Market` instance.
         :rtype: :class:`market.Market`
         """
-        return Market(self.country_code)
+        if self._market is None:
+            self._market = self.market_class(self.country_code)
+        return self._market
+
+    @property
+    def context(self) -> CompanyContext:
+        """What is resolved about the company, shared by every call.
+
+        :return: :class:`financials.CompanyContext` instance.
+        :rtype: :class:`financials.CompanyContext`
+        """
+        symbol = self.symbol.upper()
+        if self._context is None or self._context.symbol != symbol:
+            self._context = CompanyContext(symbol)
+        return self._context
 
     def _convert_symbol_to_code_in_krx(self, symbol: str) -> str:
         """Convert symbol to company code for stocks in Korea Exchange.
 
+        A company name is looked up exactly in the local name index of the
+        stock list first, and searched in Korea Exchange only if no company
+        has that name there. A name merely similar to a listed one, e.g. of
+        the preferred share of a company, is searched in Korea Exchange too.
+
         :param symbol: Symbol of a company/stock.
         :type symbol: str
         :return: Company code
@@ -83,7 +118,11 @@ class Stock:
         try:
             isinstance(int(symbol), int)
         except ValueError:
-            return KorStockList.search_stock_code(symbol)
+            try:
+                return get_name_index('KOR').resolve(symbol)
+            except (EmptyDataFrameError, EmptyApiKeyException, DartError,
+                    requests.RequestException):
+                return KorStockList.search_stock_code(symbol)
         else:
             return symbol
 
@@ -113,12 +152,14 @@ class Stock:
         period: str = 'annual',
         is_standard: bool = False,
         web: bool = False,
-    ) -> pd.DataFrame | None:
+        engine: str = 'html',
+    ) -> pd.DataFrame | dict[str, pd.DataFrame] | None:
         """Get financial statements as reported.
 
         :param financial: Which financial statement to retrieve. Input string
                 should be either 'income_statement', 'balance_sheet', or
-                'cash_flow', defaults to 'income_statement'
+                'cash_flow', or 'all' for every one of them, defaults to
+                'income_statement'
         :type financial: str, optional
         :param period: Either 'annual' or 'quarter', defaults to 'annual'.
         :type period: str, optional
@@ -128,8 +169,26 @@ class Stock:
         :param web: Option for opening filings in a web browser,
             defaults to False.
         :type web: bool, optional
-        :return: Financial statement as reported.
-        :rtype: pandas.DataFrame
+        :param engine: Where statements of a company in US are built from,
+            defaults to 'html'. 'html' reads the tables of the latest filing,
+            and 'xbrl' builds them from XBRL facts with every period reported.
+        :type engine: str, optional
+        :return: Financial statement as reported, or each of them mapped with
+            its name if financial is 'all'.
+        :rtype: pandas.DataFrame or dict
+        """
+        return self._financials(financial, period, is_standard, web, engine)
+
+    def _financials(self, financial: str, period: str, is_standard: bool,
+                    web: bool, engine: str) -> pd.DataFrame | dict | None:
+        """Get financial statements in the calling thread.
+
+        Parameters are the ones of :meth:`financials`, which
+        :class:`AsyncStock` runs in the worker threads through this method.
+
+        :return: Financial statement as reported, or each of them mapped with
+            its name if financial is 'all'.
+        :rtype: pandas.DataFrame or dict
         """
         financial_statement = self.market.financial_statement(
             self.symbol,
@@ -137,11 +196,15 @@ class Stock:
             period,
             is_standard,
             web,
+            self.context,
+            engine,
         )
         return financial_statement
 
     def price(self, start: Optional[str] = None,
-              end: Optional[str] = None) -> pd.DataFrame:
+              end: Optional[str] = None,
+              dtype: str = 'float64',
+              interval: str = '1d') -> pd.DataFrame:
         """Get historical stock price data.
 
         :param start: Start date to query. Format should be in ISO 8601,
@@ -150,13 +213,33 @@ class Stock:
         :param end: End date to query. Format should be in ISO 8601, defaults to
             None.
         :type end: str, optional
+        :param dtype: Data type of the prices, defaults to 'float64'. Use
+            'float32' to halve the memory of long price histories.
+        :type dtype: str, optional
+        :param interval: Interval between prices, e.g. '1m', '5m', '1h', '1d'
+            or '1wk', defaults to '1d'. A long range of intraday prices is
+            retrieved in windows at the same time.
+        :type interval: str, optional
+        :return: Historical stock price data.
+        :rtype: pandas.DataFrame
+        """
+        return self._price(start, end, dtype, interval)
+
+    def _price(self, start: Optional[str], end: Optional[str], dtype: str,
+               interval: str) -> pd.DataFrame:
+        """Get historical stock price data in the calling thread.
+
+        Parameters are the ones of :meth:`price`, which :class:`AsyncStock`
+        runs in the worker threads through this method.
+
         :return: Historical stock price data.
         :rtype: pandas.DataFrame
         """
         start = validate_date(start, start=True)
         end = validate_date(end)
 
-        price = self.market.historical_price(self.symbol, start, end)
+        price = self.market.historical_price(self.symbol, start, end,
+                                             dtype, interval)
         price_data = price.get_price_data()
 
         return price_data
@@ -168,3 +251,130 @@ class Stock:
         :rtype: str
         """
         return f"Stock(symbol='{self.symbol}', country_code='{self.country_code}')"
+
+
+class AsyncStock(Stock):
+    """Asyncio counterpart of :class:`Stock`.
+
+    :meth:`financials` and :meth:`price` are coroutines returning the same
+    data as :class:`Stock`, so many companies can be awaited together with
+    :func:`asyncio.gather`. They run the sync internals of :class:`Stock` in
+    the worker threads, and the market is a :class:`market.AsyncMarket`,
+    which keeps every sync method of :class:`market.Market`. A company name given for a stock in Korea
+    Exchange is converted to its code in the worker threads on the first
+    call, so creating an instance never blocks the event loop.
+
+    :param symbol: Symbol of a company/stock.
+    :type symbol: str
+    :param country_code: Country where the stock is listed. The format should
+        follow alpha-3 code (ISO 3166), defaults to 'USA'.
+    :type country_code: str, optional
+    """
+
+    market_class = AsyncMarket
+
+    @property
+    def symbol(self) -> str:
+        """Getter method of property symbol.
+
+        :return: Symbol of a company/stock, or the company name given if it
+            is not converted to its code yet.
+        :rtype: str
+        """
+        return self._symbol
+
+    @symbol.setter
+    def symbol(self, symbol: str) -> None:
+        """Setter method of property symbol
+
+        :param symbol: Symbol of a company/stock.
+        :type symbol: str
+        """
+        self._symbol = symbol
+        self._is_symbol_resolved = (
+            self.country_code != 'KOR' or symbol.isdigit()
+        )
+
+    async def _resolve_symbol(self) -> str:
+        """Convert a company name to its code in Korea Exchange if needed.
+
+        :return: Symbol of a company/stock.
+        :rtype: str
+        """
+        if not self._is_symbol_resolved:
+            self._symbol = await run_in_executor(
+                self._convert_symbol_to_code_in_krx,
+                self._symbol,
+            )
+            self._is_symbol_resolved = True
+        return self._symbol
+
+    async def financials(
+        self,
+        financial: str = 'income_statement',
+        period: str = 'annual',
+        is_standard: bool = False,
+        web: bool = False,
+        engine: str = 'html',
+    ) -> pd.DataFrame | dict[str, pd.DataFrame] | None:
+        """Get financial statements as reported.
+
+        :param financial: Which financial statement to retrieve. Input string
+                should be either 'income_statement', 'balance_sheet', or
+                'cash_flow', or 'all' for every one of them, defaults to
+                'income_statement'
+        :type financial: str, optional
+        :param period: Either 'annual' or 'quarter', defaults to 'annual'.
+        :type period: str, optional
+        :param is_standard: Option for retrieving standard financial statements,
+            defaults to False.
+        :type is_standard: bool, optional
+        :param web: Option for opening filings in a web browser,
+            defaults to False.
+        :type web: bool, optional
+        :param engine: Where statements of a company in US are built from,
+            defaults to 'html'. 'html' reads the tables of the latest filing,
+            and 'xbrl' builds them from XBRL facts with every period reported.
+        :type engine: str, optional
+        :return: Financial statement as reported, or each of them mapped with
+            its name if financial is 'all'.
+        :rtype: pandas.DataFrame or dict
+        """
+        await self._resolve_symbol()
+        return await run_in_executor(self._financials, financial, period,
+                                     is_standard, web, engine)
+
+    async def price(self, start: Optional[str] = None,
+                    end: Optional[str] = None,
+                    dtype: str = 'float64',
+                    interval: str = '1d') -> pd.DataFrame:
+        """Get historical stock price data.
+
+        :param start: Start date to query. Format should be in ISO 8601,
+            defaults to None.
+        :type start: str, optional
+        :param end: End date to query. Format should be in ISO 8601, defaults to
+            None.
+        :type end: str, optional
+        :param dtype: Data type of the prices, defaults to 'float64'. Use
+            'float32' to halve the memory of long price histories.
+        :type dtype: str, optional
+        :param interval: Interval between prices, e.g. '1m', '5m', '1h', '1d'
+            or '1wk', defaults to '1d'. A long range of intraday prices is
+            retrieved in windows at the same time.
+        :type interval: str, optional
+        :return: Historical stock price data.
+        :rtype: pandas.DataFrame
+        """
+        await self._resolve_symbol()
+        return await run_in_executor(self._price, start, end, dtype,
+                                     interval)
+
+    def __repr__(self) -> str:
+        """Returns representational string of :class:`AsyncStock`.
+
+        :return: Representational string of :class:`AsyncStock`.
+        :rtype: str
+        """
+        return (f"AsyncStock(symbol='{self.symbol}', "
+                f"country_code='{self.country_code}')")
@@ -2,16 +2,40 @@
 from abc import ABC, abstractmethod
 from functools import cached_property
 from io import BytesIO
-import json
 import pandas as pd
 import re
-from string import capwords
-import xmltodict
+import threading
+import time
+from typing import Callable, IO, Optional
+from xml.etree import ElementTree
 from zipfile import ZipFile
 from financialdatapy.dartapi import OpenDart
 from financialdatapy.exception import DartError
 from financialdatapy.exception import EmptyDataFrameError
 from financialdatapy.request import Request
+from financialdatapy.snapshot import get_snapshot_store
+
+
+# remove all characters after '\' or '/' in a company name
+# ex) Qualcomm inc\de -> Qualcomm inc
+_STATE_SUFFIX = re.compile(r'\s?(\/|\\)[a-zA-Z]*', flags=re.I)
+
+
+def _clean_company_name(name: str) -> str:
+    """Clean a company name in a single pass.
+
+    Same as removing the state suffix and then applying
+    :func:`string.capwords`, but the regex only runs on names containing a
+    slash.
+
+    :param name: Company name received from SEC.
+    :type name: str
+    :return: Cleaned company name.
+    :rtype: str
+    """
+    if '/' in name or '\\' in name:
+        name = _STATE_SUFFIX.sub('', name)
+    return ' '.join(map(str.capitalize, name.split()))
 
 
 class StockList(ABC):
@@ -19,7 +43,30 @@ class StockList(ABC):
 
     @cached_property
     def stock_list(self) -> pd.DataFrame:
-        return self.get_stock_list()
+        """Stock list, loaded from its snapshot if snapshots are enabled.
+
+        :return: Stock list.
+        :rtype: pandas.DataFrame
+        """
+        store = get_snapshot_store()
+        if store is None:
+            return self.get_stock_list()
+
+        stock_list = store.load(self.snapshot_name)
+        if stock_list is None:
+            stock_list = self.get_stock_list()
+            store.save(self.snapshot_name, stock_list)
+
+        return stock_list
+
+    @property
+    def snapshot_name(self) -> str:
+        """Name the stock list is stored with in the snapshot store.
+
+        :return: Name of the snapshot.
+        :rtype: str
+        """
+        return type(self).__name__
 
     @abstractmethod
     def get_stock_list(self) -> pd.DataFrame:
@@ -41,51 +88,165 @@ class UsStockList(StockList):
         res = Request(url)
         cik_data = res.response_data('json')
 
-        cik_list = pd.DataFrame(cik_data['data'], columns=cik_data['fields'])
+        return self._clean_stock_list(cik_data)
 
-        cik_list['exchange'] = cik_list['exchange'].str.upper()
-        exchange = cik_list['exchange']
-        cik_list = cik_list[(exchange == 'NASDAQ') | (exchange == 'NYSE')]
-        cik_list = cik_list.reset_index(drop=True)
-        cik_list = cik_list.drop('exchange', axis=1)
+    @staticmethod
+    def _clean_stock_list(cik_data: dict) -> pd.DataFrame:
+        """Clean the stock list received from SEC.
 
-        cik_list['cik'] = cik_list['cik'].astype(str)
+        :param cik_data: company_tickers_exchange.json from SEC.
+        :type cik_data: dict
+        :return: Dataframe with CIK, company name, and ticker for its columns.
+        :rtype: pandas.DataFrame
+        """
+        fields = cik_data['fields']
+        cik = fields.index('cik')
+        name = fields.index('name')
+        exchange = fields.index('exchange')
+        columns = [i for i, x in enumerate(fields) if x != 'exchange']
+        listed = {'NASDAQ', 'NYSE'}
 
-        # remove all characters after '\' or '/' in a company name
-        # ex) Qualcomm inc\de -> Qualcomm inc
-        pattern = r'\s?(\/|\\)[a-zA-Z]*'
-        regex = re.compile(pattern, flags=re.I)
-        cik_list['name'] = [regex.sub('', x) for x in cik_list['name']]
+        # filter and clean each row in a single pass before building the
+        # dataframe, so rows of other exchanges are never converted.
+        rows = []
+        for row in cik_data['data']:
+            if str(row[exchange]).upper() not in listed:
+                continue
+            row = list(row)
+            # cik number received from source excludes 0s that comes first.
+            # Since cik is a 10-digit number, concatenate 0s.
+            row[cik] = str(row[cik]).zfill(10)
+            row[name] = _clean_company_name(row[name])
+            rows.append([row[i] for i in columns])
 
-        cik_list['name'] = [capwords(x) for x in cik_list['name']]
+        cik_list = pd.DataFrame(rows, columns=[fields[i] for i in columns])
 
         return cik_list
 
+    @cached_property
+    def _ticker_index(self) -> dict[str, str]:
+        """Index of CIK mapped with ticker, built once from the stock list.
+
+        :return: CIK of each ticker.
+        :rtype: dict[str, str]
+        """
+        return self._build_index(self.stock_list['ticker'],
+                                 self.stock_list['cik'])
+
+    @cached_property
+    def _cik_index(self) -> dict[str, str]:
+        """Index of ticker mapped with CIK, built once from the stock list.
+
+        A company listing several classes of stock keeps the ticker listed
+        first.
+
+        :return: Ticker of each CIK.
+        :rtype: dict[str, str]
+        """
+        return self._build_index(self.stock_list['cik'],
+                                 self.stock_list['ticker'])
+
+    @cached_property
+    def _name_index(self) -> dict[str, str]:
+        """Index of CIK mapped with company name, built once from the list.
+
+        :return: CIK of each normalized company name.
+        :rtype: dict[str, str]
+        """
+        names = self.stock_list['name'].map(self._normalize_name)
+        return self._build_index(names, self.stock_list['cik'])
+
+    @staticmethod
+    def _build_index(keys: pd.Series, values: pd.Series) -> dict[str, str]:
+        """Map keys with values, keeping the first value of a duplicate key.
+
+        :param keys: Keys of the index.
+        :type keys: pandas.Series
+        :param values: Values of the index.
+        :type values: pandas.Series
+        :return: Index.
+        :rtype: dict[str, str]
+        """
+        return dict(zip(keys[::-1], values[::-1]))
+
+    @staticmethod
+    def _normalize_name(name: str) -> str:
+        """Normalize a company name for looking up the name index.
+
+        :param name: Company name.
+        :type name: str
+        :return: Uppercased company name with single spaces.
+        :rtype: str
+        """
+        return ' '.join(name.upper().split())
+
     def search_cik(self, symbol: str) -> str:
         """Search CIK of specific a company.
 
         :param symbol: Company symbol to search.
         :type symbol: str
+        :raises EmptyDataFrameError: If the symbol is not in the stock list.
         :return: CIK of the company searching for.
         :rtype: str
         """
-        symbol_uppercase = symbol.upper()
-        cik_list = self.stock_list
-        symbol_df = cik_list[cik_list['ticker'] == symbol_uppercase]
-        if symbol_df.empty:
+        try:
+            return self._ticker_index[symbol.upper()]
+        except KeyError:
             raise EmptyDataFrameError('Cannot search for the symbol.')
-        cik = symbol_df['cik'].item()
 
-        # cik number received from source excludes 0s that comes first.
-        # Since cik is a 10-digit number, concatenate 0s.
-        zeros = 10 - len(str(cik))
-        cik = ('0' * zeros) + str(cik)
+    def search_ticker(self, cik: str | int) -> str:
+        """Search ticker of a company with its CIK.
+
+        :param cik: CIK of the company, with or without leading 0s.
+        :type cik: str or int
+        :raises EmptyDataFrameError: If the CIK is not in the stock list.
+        :return: Ticker of the company.
+        :rtype: str
+        """
+        try:
+            return self._cik_index[str(cik).zfill(10)]
+        except KeyError:
+            raise EmptyDataFrameError('Cannot search for the CIK.')
+
+    def search_cik_by_name(self, name: str) -> str:
+        """Search CIK of a company with its exact name.
 
-        return cik
+        Letter case and spacing of the name are ignored.
+
+        :param name: Company name to search.
+        :type name: str
+        :raises EmptyDataFrameError: If the name is not in the stock list.
+        :return: CIK of the company.
+        :rtype: str
+        """
+        try:
+            return self._name_index[self._normalize_name(name)]
+        except KeyError:
+            raise EmptyDataFrameError('Cannot search for the company name.')
 
 
 class KorStockList(StockList):
-    """This class represents stock list in KOR exchange."""
+    """This class represents stock list in KOR exchange.
+
+    :param listed_only: Whether to keep only companies listed in Korea
+        Exchange, defaults to True.
+    :type listed_only: bool, optional
+    """
+
+    def __init__(self, listed_only: bool = True) -> None:
+        """Initialize KorStockList."""
+        self.listed_only = listed_only
+
+    @property
+    def snapshot_name(self) -> str:
+        """Name the stock list is stored with in the snapshot store.
+
+        :return: Name of the snapshot.
+        :rtype: str
+        """
+        if self.listed_only:
+            return 'KorStockList'
+        return 'KorStockList-all'
 
     def get_stock_list(self) -> pd.DataFrame:
         """Retrieve company code list of stocks listed in Korea Exchange.
@@ -99,17 +260,51 @@ class KorStockList(StockList):
         try:
             xml_zip_file = ZipFile(BytesIO(corp_code_file))
             extracted_filename = 'CORPCODE.xml'
-            xml_file = xml_zip_file.read(extracted_filename).decode('utf-8')
-            raw_corp_code = xmltodict.parse(xml_file)
-            encoded_corp_code = json.dumps(raw_corp_code)
-            corp_code_list = json.loads(encoded_corp_code)
+            with xml_zip_file.open(extracted_filename) as xml_file:
+                corp_code_list = self._parse_corp_code(xml_file)
         except Exception:
             raise DartError('Failed in getting data from Dart.')
         else:
-            corp_code_list = pd.DataFrame(corp_code_list['result']['list'])
-            corp_code_list.dropna(inplace=True)
             return corp_code_list
-    
+
+    def _parse_corp_code(self, xml_file: IO[bytes]) -> pd.DataFrame:
+        """Parse CORPCODE.xml into a dataframe while streaming it.
+
+        Each <list> element is read into columns and discarded right away,
+        so the whole document is never held in memory.
+
+        :param xml_file: CORPCODE.xml opened in binary mode.
+        :type xml_file: IO[bytes]
+        :return: List of company codes.
+        :rtype: pandas.DataFrame
+        """
+        columns = {}
+        n_rows = 0
+        root = None
+
+        for event, element in ElementTree.iterparse(xml_file,
+                                                    events=('start', 'end')):
+            if root is None:
+                root = element
+            if event != 'end' or element.tag != 'list':
+                continue
+
+            # blank values such as stock code of unlisted companies are None
+            row = {x.tag: (x.text or '').strip() or None for x in element}
+            root.clear()
+
+            if self.listed_only and row.get('stock_code') is None:
+                continue
+
+            for tag in row:
+                if tag not in columns:
+                    columns[tag] = [None] * n_rows
+            for tag, values in columns.items():
+                values.append(row.get(tag))
+            n_rows += 1
+
+        return pd.DataFrame(columns)
+
     def search_corp_code(self, symbol: str) -> str:
         """Get corporate code from dart.fss.or.kr.
 
@@ -149,3 +344,99 @@ class KorStockList(StockList):
         company_code = comp_info_first_result['repisusrtcd2']
 
         return company_code
+
+
+class StockListRegistry:
+    """A class sharing one loaded instance of each stock list in a process.
+
+    A stock list is downloaded on the first request for it, and again once
+    it is older than ``ttl`` or invalidated. Threads asking for a list being
+    loaded wait for that download instead of starting their own.
+
+    :param ttl: Seconds a loaded stock list is reused, defaults to one day.
+        If None, it is reused until invalidated.
+    :type ttl: Optional[float], optional
+    :param clock: Function returning the current time in seconds,
+        defaults to :func:`time.monotonic`.
+    :type clock: Callable, optional
+    """
+
+    def __init__(self, ttl: Optional[float] = 24 * 60 * 60,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize StockListRegistry."""
+        self.ttl = ttl
+        self._clock = clock
+        self._stock_lists = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _get_lock(self, stock_list_class: type) -> threading.Lock:
+        """Get the lock guarding the loading of a stock list.
+
+        :param stock_list_class: Class of the stock list.
+        :type stock_list_class: type
+        :return: Lock of the stock list.
+        :rtype: threading.Lock
+        """
+        with self._lock:
+            return self._locks.setdefault(stock_list_class, threading.Lock())
+
+    def get(self, stock_list_class: type[StockList]) -> StockList:
+        """Get the shared instance of a stock list, loading it if needed.
+
+        :param stock_list_class: Class of the stock list, e.g.
+            :class:`UsStockList`.
+        :type stock_list_class: type[StockList]
+        :return: Instance whose stock list is loaded.
+        :rtype: StockList
+        """
+        with self._get_lock(stock_list_class):
+            entry = self._stock_lists.get(stock_list_class)
+
+            if entry is not None:
+                stock_list, loaded_at = entry
+                if self.ttl is None or self._clock() - loaded_at < self.ttl:
+                    return stock_list
+
+            stock_list = stock_list_class()
+            stock_list.stock_list
+            self._stock_lists[stock_list_class] = (stock_list, self._clock())
+
+        return stock_list
+
+    def invalidate(self, stock_list_class: Optional[type] = None) -> None:
+        """Drop a loaded stock list, or every one, so it is loaded again.
+
+        :param stock_list_class: Class of the stock list, defaults to None.
+            If None, every stock list is dropped.
+        :type stock_list_class: Optional[type], optional
+        """
+        with self._lock:
+            if stock_list_class is None:
+                self._stock_lists.clear()
+            else:
+                self._stock_lists.pop(stock_list_class, None)
+
+
+_registry = StockListRegistry()
+
+
+def get_registry() -> StockListRegistry:
+    """Get the stock list registry shared in the process.
+
+    :return: Shared stock list registry.
+    :rtype: StockListRegistry
+    """
+    return _registry
+
+
+def get_shared_stock_list(stock_list_class: type[StockList]) -> StockList:
+    """Get the instance of a stock list shared in the process.
+
+    :param stock_list_class: Class of the stock list, e.g.
+        :class:`UsStockList`.
+    :type stock_list_class: type[StockList]
+    :return: Instance whose stock list is loaded.
+    :rtype: StockList
+    """
+    return _registry.get(stock_list_class)
@@ -0,0 +1,249 @@
+"""This module builds financial statements from XBRL facts in EDGAR."""
+import pandas as pd
+from financialdatapy.bulk import get_bulk_store
+from financialdatapy.exception import EmptyDataFrameError
+from financialdatapy.request import Request
+
+#: US GAAP concepts of each financial statement, in the order of the rows.
+#: A row with more than one concept takes the first one the company reports.
+STATEMENT_CONCEPTS = {
+    'income_statement': {
+        'Revenue': [
+            'Revenues',
+            'RevenueFromContractWithCustomerExcludingAssessedTax',
+            'SalesRevenueNet',
+        ],
+        'Cost of Revenue': [
+            'CostOfGoodsAndServicesSold',
+            'CostOfRevenue',
+        ],
+        'Gross Profit': ['GrossProfit'],
+        'Research and Development': ['ResearchAndDevelopmentExpense'],
+        'Selling, General and Administrative': [
+            'SellingGeneralAndAdministrativeExpense',
+        ],
+        'Operating Expenses': ['OperatingExpenses'],
+        'Operating Income': ['OperatingIncomeLoss'],
+        'Nonoperating Income': ['NonoperatingIncomeExpense'],
+        'Income Before Taxes': [
+            'IncomeLossFromContinuingOperationsBeforeIncomeTaxes'
+            'ExtraordinaryItemsNoncontrollingInterest',
+            'IncomeLossFromContinuingOperationsBeforeIncomeTaxes'
+            'MinorityInterestAndIncomeLossFromEquityMethodInvestments',
+        ],
+        'Income Tax': ['IncomeTaxExpenseBenefit'],
+        'Net Income': ['NetIncomeLoss'],
+        'EPS Basic': ['EarningsPerShareBasic'],
+        'EPS Diluted': ['EarningsPerShareDiluted'],
+        'Shares Basic': ['WeightedAverageNumberOfSharesOutstandingBasic'],
+        'Shares Diluted': [
+            'WeightedAverageNumberOfDilutedSharesOutstanding',
+        ],
+    },
+    'balance_sheet': {
+        'Cash and Cash Equivalents': [
+            'CashAndCashEquivalentsAtCarryingValue',
+        ],
+        'Accounts Receivable': ['AccountsReceivableNetCurrent'],
+        'Inventories': ['InventoryNet'],
+        'Total Current Assets': ['AssetsCurrent'],
+        'Property, Plant and Equipment': [
+            'PropertyPlantAndEquipmentNet',
+        ],
+        'Total Assets': ['Assets'],
+        'Accounts Payable': ['AccountsPayableCurrent'],
+        'Total Current Liabilities': ['LiabilitiesCurrent'],
+        'Long-Term Debt': ['LongTermDebtNoncurrent'],
+        'Total Liabilities': ['Liabilities'],
+        'Total Equity': [
+            'StockholdersEquity',
+            'StockholdersEquityIncludingPortionAttributableTo'
+            'NoncontrollingInterest',
+        ],
+        'Total Liabilities and Equity': ['LiabilitiesAndStockholdersEquity'],
+    },
+    'cash_flow': {
+        'Net Income': ['NetIncomeLoss'],
+        'Depreciation and Amortization': [
+            'DepreciationDepletionAndAmortization',
+            'DepreciationAndAmortization',
+        ],
+        'Share-Based Compensation': ['ShareBasedCompensation'],
+        'Cash from Operating Activities': [
+            'NetCashProvidedByUsedInOperatingActivities',
+        ],
+        'Capital Expenditure': [
+            'PaymentsToAcquirePropertyPlantAndEquipment',
+        ],
+        'Cash from Investing Activities': [
+            'NetCashProvidedByUsedInInvestingActivities',
+        ],
+        'Repurchase of Common Stock': ['PaymentsForRepurchaseOfCommonStock'],
+        'Dividends Paid': ['PaymentsOfDividends'],
+        'Cash from Financing Activities': [
+            'NetCashProvidedByUsedInFinancingActivities',
+        ],
+    },
+}
+
+#: Days a period of each length may last, for facts of a duration.
+PERIOD_DAYS = {
+    'annual': (350, 380),
+    'quarter': (80, 100),
+}
+
+#: Days the year to date of the second or third quarter may last.
+YEAR_TO_DATE_DAYS = (170, 290)
+
+#: Forms the facts of each period are reported in.
+PERIOD_FORMS = {
+    'annual': ('10-K', '10-K/A'),
+    'quarter': ('10-Q', '10-Q/A'),
+}
+
+
+def get_company_facts(cik: str) -> dict:
+    """Retrieve every XBRL fact a company reported to SEC EDGAR.
+
+    The facts are read from the bulk store if it is set and holds the
+    company.
+
+    :param cik: CIK of a company.
+    :type cik: str
+    :return: Facts in the format of EDGAR companyfacts.
+    :rtype: dict
+    """
+    bulk_store = get_bulk_store()
+    if bulk_store is not None:
+        facts = bulk_store.get_company_facts(cik)
+        if facts is not None:
+            return facts
+
+    url = f'https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json'
+    res = Request(url)
+    return res.response_data('json')
+
+
+def _get_records(facts: dict, concepts: dict) -> pd.DataFrame:
+    """Collect the values of the concepts reported in US GAAP.
+
+    :param facts: Facts in the format of EDGAR companyfacts.
+    :type facts: dict
+    :param concepts: Concepts of each row.
+    :type concepts: dict
+    :return: One value per row, rank of the concept in the row, and unit.
+    :rtype: pandas.DataFrame
+    """
+    us_gaap = facts.get('facts', {}).get('us-gaap', {})
+    frames = []
+
+    for row, names in concepts.items():
+        for rank, name in enumerate(names):
+            units = us_gaap.get(name, {}).get('units', {})
+            for unit, values in units.items():
+                frame = pd.DataFrame.from_records(values)
+                frame['row'] = row
+                frame['rank'] = rank
+                frame['unit'] = unit
+                frames.append(frame)
+
+    columns = ['row', 'rank', 'unit', 'start', 'end', 'val', 'form', 'filed']
+    if not frames:
+        return pd.DataFrame(columns=columns)
+
+    records = pd.concat(frames, ignore_index=True)
+    if 'start' not in records:
+        records['start'] = None
+
+    return records.reindex(columns=columns)
+
+
+def _get_quarters_to_date(records: pd.DataFrame) -> pd.DataFrame:
+    """Derive values of a quarter from values of the year to date.
+
+    A value of the second or third quarter is the one of the year to date
+    less the one reported a quarter earlier from the same start.
+
+    :param records: Values with start and end as datetime and days they
+        last.
+    :type records: pandas.DataFrame
+    :return: Values of the quarters derived.
+    :rtype: pandas.DataFrame
+    """
+    low, high = PERIOD_DAYS['quarter']
+    keys = ['row', 'rank', 'unit', 'start']
+    to_date = (
+        records[records['days'].between(low, YEAR_TO_DATE_DAYS[1])]
+        .sort_values('filed', ascending=False)
+        .drop_duplicates(keys + ['end'])
+        .sort_values(keys + ['end'])
+    )
+
+    previous = to_date.groupby(keys)[['end', 'val']].shift()
+    gap = (to_date['end'] - previous['end']).dt.days
+    is_quarter = (to_date['days'].between(*YEAR_TO_DATE_DAYS)
+                  & gap.between(low, high))
+
+    quarters = to_date.assign(val=to_date['val'] - previous['val'])
+    return quarters[is_quarter]
+
+
+def build_statement(facts: dict, financial: str,
+                    period: str = 'annual') -> pd.DataFrame:
+    """Build a financial statement from XBRL facts of a company.
+
+    Every period the company reported is kept, the latest first. A value
+    amended by a later filing is replaced by the later one.
+
+    Cash flows in 10-Q are reported for the year to date, so a quarter
+    without a value of its own three months takes the year to date less
+    the quarter before it. The fourth quarter is reported only for the
+    year in 10-K and is left out.
+
+    :param facts: Facts in the format of EDGAR companyfacts.
+    :type facts: dict
+    :param financial: 'income_statement' or 'balance_sheet' or 'cash_flow'.
+    :type financial: str
+    :param period: Either 'annual' or 'quarter', defaults to 'annual'.
+    :type period: str, optional
+    :raises EmptyDataFrameError: If the company reported none of the
+        concepts for the period.
+    :return: Financial statement with a row per item, a column per end date
+        of the periods, and float values.
+    :rtype: pandas.DataFrame
+    """
+    concepts = STATEMENT_CONCEPTS[financial]
+    records = _get_records(facts, concepts)
+    records = records[records['form'].isin(PERIOD_FORMS[period])]
+
+    end = pd.to_datetime(records['end'], format='%Y-%m-%d')
+    start = pd.to_datetime(records['start'], format='%Y-%m-%d')
+    days = (end - start).dt.days
+    low, high = PERIOD_DAYS[period]
+    records = records.assign(start=start, end=end, days=days, derived=False)
+    # balance sheet items are reported at an instant without a start
+    is_period = start.isna() | days.between(low, high)
+
+    if period == 'quarter':
+        derived = _get_quarters_to_date(records).assign(derived=True)
+        records = pd.concat([records[is_period], derived])
+    else:
+        records = records[is_period]
+
+    if records.empty:
+        raise EmptyDataFrameError('Failed in getting XBRL facts.')
+
+    records = (
+        records.sort_values(['row', 'end', 'rank', 'derived', 'filed'],
+                            ascending=[True, True, True, True, False])
+        .drop_duplicates(['row', 'end'])
+    )
+
+    statement = records.pivot(index='row', columns='end', values='val')
+    rows = [x for x in concepts if x in statement.index]
+    statement = statement.loc[rows, statement.columns[::-1]]
+    statement = statement.astype('float64')
+    statement.index.name = None
+    statement.columns.name = None
+
+    return statement
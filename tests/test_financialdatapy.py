@@ -1,12 +1,59 @@
+import asyncio
+import datetime
+import io
+from concurrent.futures import ThreadPoolExecutor
+import json
+import numpy as np
 import pandas as pd
+import shutil
 import pytest
+import requests
+import zipfile
 from financialdatapy import date
+from financialdatapy import batch
 from financialdatapy import filings
+from financialdatapy import cache as cache_module
+from financialdatapy.cache import ResponseCache
+from financialdatapy.cache import make_cache_key
 from financialdatapy.dartapi import DartApiKey
+from financialdatapy.ratelimit import RateLimiter
+from financialdatapy.ratelimit import TokenBucket
+from financialdatapy.ratelimit import parse_retry_after
+from financialdatapy.request import AsyncRequest
+from financialdatapy.request import Request
+from financialdatapy.retry import RetryPolicy
+from financialdatapy import session as session_module
+from financialdatapy.session import SessionManager
 from financialdatapy.date import IntegerDateInputError
+from financialdatapy.exception import EmptyDataFrameError
+from financialdatapy.exception import NotAvailable
+from financialdatapy.market import AsyncMarket
+from financialdatapy.stock import AsyncStock
 from financialdatapy.stock import Stock
 from financialdatapy.stocklist import UsStockList
+from financialdatapy.stocklist import _clean_company_name
+from financialdatapy import snapshot as snapshot_module
+from financialdatapy.snapshot import SnapshotStore
+from financialdatapy.searchindex import NameIndex
+from financialdatapy.searchindex import normalize_name
+from financialdatapy import stocklist as stocklist_module
+from financialdatapy import search
+from financialdatapy.search import PairIdCache
+from financialdatapy.financials import CompanyContext
+from financialdatapy.financials import UsFinancials
+from financialdatapy.memo import TTLCache
+from financialdatapy import bulk
+from financialdatapy.bulk import BulkStore
+from financialdatapy.xbrl import build_statement
+from financialdatapy.htmltable import find_report_table
+from financialdatapy.htmltable import read_table
+from financialdatapy.numeric import parse_number
+from financialdatapy.numeric import parse_numbers
+from financialdatapy.price import KorMarket
+from financialdatapy.price import UsMarket
+import lxml.html
 from financialdatapy.stocklist import KorStockList
+from financialdatapy.stocklist import StockListRegistry
 
 
 @pytest.fixture(scope='class',
@@ -185,3 +232,1496 @@ class TestDartApi:
     def test_env_file(self, api_key):
         """Tests if Api key is assigned in the .env file."""
         assert api_key is not None
+
+
+class FakeResponse:
+    """Stand-in of :class:`requests.Response` for offline tests."""
+
+    def __init__(self, status_code=200, content=b'{}', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f'{self.status_code} Error')
+
+
+class FakeSession:
+    """Stand-in of :class:`requests.Session` recording requests sent."""
+
+    def __init__(self, responses=None, routes=None):
+        self.responses = list(responses or [FakeResponse()])
+        self.routes = routes or {}
+        self.calls = []
+
+    def _send(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        for part, response in self.routes.items():
+            if part in url:
+                return response
+        if len(self.responses) > 1:
+            response = self.responses.pop(0)
+        else:
+            response = self.responses[0]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def get(self, url, **kwargs):
+        return self._send('get', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._send('post', url, **kwargs)
+
+    def close(self):
+        pass
+
+
+class FakeSessionManager(SessionManager):
+    """Session manager handing out one fake session to every host."""
+
+    def __init__(self, session):
+        super().__init__()
+        self.session = session
+
+    def _create_session(self):
+        return self.session
+
+
+@pytest.fixture
+def fake_session(monkeypatch):
+    """Route every request through a fake session without network."""
+    session = FakeSession()
+    monkeypatch.setattr(session_module, '_session_manager',
+                        FakeSessionManager(session))
+    monkeypatch.setenv('SEC_USER_AGENT', 'financialdatapy test@example.com')
+    monkeypatch.setenv('DART_API_KEY', 'test')
+    return session
+
+
+def sec_tickers():
+    """Build a response body of SEC company_tickers_exchange.json."""
+    body = {
+        'fields': ['cik', 'name', 'ticker', 'exchange'],
+        'data': [
+            [320193, 'Apple Inc.', 'AAPL', 'Nasdaq'],
+            [1652044, 'Alphabet Inc.', 'GOOGL', 'Nasdaq'],
+            [1652044, 'Alphabet Inc.', 'GOOG', 'Nasdaq'],
+            [804328, 'QUALCOMM INC/DE', 'QCOM', 'Nasdaq'],
+            [1000001, 'Over The Counter Corp', 'OTCX', 'OTC'],
+        ],
+    }
+    return FakeResponse(content=json.dumps(body).encode('utf-8'))
+
+
+def dart_corp_code():
+    """Build a response body of DART corpCode.xml zip."""
+    xml = (
+        '<?xml version="1.0" encoding="UTF-8"?><result>'
+        '<list><corp_code>00126380</corp_code><corp_name>삼성전자</corp_name>'
+        '<corp_eng_name>SAMSUNG ELECTRONICS CO,.LTD</corp_eng_name>'
+        '<stock_code>005930</stock_code>'
+        '<modify_date>20240101</modify_date></list>'
+        '<list><corp_code>00999999</corp_code><corp_name>비상장</corp_name>'
+        '<corp_eng_name>UNLISTED</corp_eng_name><stock_code> </stock_code>'
+        '<modify_date>20240101</modify_date></list>'
+        '<list><corp_code>00164779</corp_code>'
+        '<corp_name>에스케이하이닉스</corp_name>'
+        '<stock_code>000660</stock_code>'
+        '<modify_date>20240102</modify_date></list>'
+        '</result>'
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zip_file:
+        zip_file.writestr('CORPCODE.xml', xml.encode('utf-8'))
+    return FakeResponse(content=buffer.getvalue())
+
+
+def yahoo_chart(timestamps, close):
+    """Build a response body of Yahoo chart api."""
+    quote = {
+        'open': close, 'high': close, 'low': close, 'close': close,
+        'volume': [100] * len(close),
+    }
+    result = {
+        'meta': {'exchangeTimezoneName': 'America/New_York'},
+        'timestamp': timestamps,
+        'indicators': {'quote': [quote]},
+    }
+    body = {'chart': {'result': [result], 'error': None}}
+    return FakeResponse(content=json.dumps(body).encode('utf-8'))
+
+
+class TestSession:
+    """Test pooled sessions shared by requests."""
+
+    def test_session_shared_per_host(self):
+        """Test requests to the same host reuse one session."""
+        manager = SessionManager(pool_maxsize=4)
+        first = manager.get_session('https://www.sec.gov/files/a.json')
+        second = manager.get_session('https://www.sec.gov/cgi-bin/viewer')
+        other = manager.get_session('https://data.sec.gov/submissions/')
+        assert first is second
+        assert first is not other
+        adapter = first.get_adapter('https://www.sec.gov/')
+        assert adapter._pool_maxsize == 4
+        manager.close()
+
+    def test_session_shared_across_threads(self):
+        """Test requests from several threads get the same session."""
+        manager = SessionManager()
+        url = 'https://www.sec.gov/files/a.json'
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            sessions = list(executor.map(manager.get_session, [url] * 32))
+        assert all(session is sessions[0] for session in sessions)
+        manager.close()
+
+    def test_cookies_not_kept(self):
+        """Test a shared session does not keep cookies by default."""
+        session = SessionManager().get_session('https://www.investing.com')
+        cookie = requests.cookies.create_cookie('id', '1',
+                                                domain='www.investing.com')
+        request = requests.Request('GET', 'https://www.investing.com/')
+        mock_request = requests.cookies.MockRequest(request)
+        assert not session.cookies._policy.set_ok(cookie, mock_request)
+
+    def test_custom_session_injected(self):
+        """Test a custom session is used instead of the pooled one."""
+        session = FakeSession()
+        res = Request('https://example.com/data', headers={}, session=session)
+        assert res.response_data('json') == {}
+        assert session.calls[0][:2] == ('get', 'https://example.com/data')
+
+
+class TestRequest:
+    """Test sending a request and keeping its response."""
+
+    def test_response_sent_once(self):
+        """Test accessing response repeatedly sends one request."""
+        session = FakeSession([FakeResponse(content=b'{"a": 1}')])
+        res = Request('https://example.com/data', headers={}, session=session)
+        assert res.size is None
+        assert res.response_data('json') == {'a': 1}
+        assert res.response_data('text') == '{"a": 1}'
+        assert res.response is res.response
+        assert len(session.calls) == 1
+        assert res.size == 8
+        assert res.elapsed >= 0
+        assert res.fetched_at is not None
+
+    def test_refresh(self):
+        """Test refresh sends the request again and replaces the response."""
+        session = FakeSession([
+            FakeResponse(content=b'{"a": 1}'),
+            FakeResponse(content=b'{"a": 2}'),
+        ])
+        res = Request('https://example.com/data', headers={}, session=session)
+        assert res.response_data('json') == {'a': 1}
+        res.refresh()
+        assert res.response_data('json') == {'a': 2}
+        assert len(session.calls) == 2
+
+
+class TestResponseCache:
+    """Test caching responses on disk."""
+
+    url = 'https://www.sec.gov/files/company_tickers_exchange.json'
+
+    def test_fresh_response_served_from_cache(self, tmp_path):
+        """Test a fresh cached response is reused by a new request."""
+        cache = ResponseCache(tmp_path / 'cache.sqlite')
+        session = FakeSession([FakeResponse(content=b'{"a": 1}')])
+        first = Request(self.url, headers={}, session=session, cache=cache)
+        second = Request(self.url, headers={}, session=session, cache=cache)
+        assert first.response_data('json') == {'a': 1}
+        assert second.response_data('json') == {'a': 1}
+        assert second.from_cache
+        assert len(session.calls) == 1
+
+    def test_stale_response_revalidated(self, tmp_path):
+        """Test a stale response is revalidated with its ETag."""
+        cache = ResponseCache(tmp_path / 'cache.sqlite',
+                              ttl={'www.sec.gov': 0})
+        session = FakeSession([
+            FakeResponse(content=b'{"a": 1}', headers={'ETag': '"v1"'}),
+            FakeResponse(status_code=304, content=b''),
+        ])
+        Request(self.url, headers={}, session=session, cache=cache).response
+        res = Request(self.url, headers={}, session=session, cache=cache)
+        assert res.response_data('json') == {'a': 1}
+        assert res.from_cache
+        assert session.calls[1][2]['headers']['If-None-Match'] == '"v1"'
+
+    def test_request_opts_out_of_shared_cache(self, tmp_path, monkeypatch):
+        """Test cache=False skips the shared cache for one request."""
+        cache = ResponseCache(tmp_path / 'cache.sqlite')
+        monkeypatch.setattr(cache_module, '_response_cache', cache)
+        session = FakeSession([FakeResponse(content=b'{"a": 1}')])
+        Request(self.url, headers={}, session=session).response
+        res = Request(self.url, headers={}, session=session, cache=False)
+        assert res.cache is None
+        assert res.response_data('json') == {'a': 1}
+        assert not res.from_cache
+        assert len(session.calls) == 2
+
+    def test_only_200_cached(self, tmp_path):
+        """Test a 2xx response other than 200 is not cached."""
+        cache = ResponseCache(tmp_path / 'cache.sqlite')
+        session = FakeSession([FakeResponse(status_code=203)])
+        Request(self.url, headers={}, session=session, cache=cache).response
+        key = make_cache_key('get', self.url)
+        assert cache.get(key) is None
+
+    def test_host_without_ttl_not_cached(self, tmp_path):
+        """Test responses of a host not given a TTL are not cached."""
+        cache = ResponseCache(tmp_path / 'cache.sqlite')
+        assert not cache.is_cacheable('get', 'https://query1.finance.yahoo.com')
+        assert not cache.is_cacheable('post', self.url)
+
+    def test_least_recently_used_evicted(self, tmp_path):
+        """Test the least recently used response is evicted when full."""
+        cache = ResponseCache(tmp_path / 'cache.sqlite', max_size=10)
+        cache.set('old', self.url, FakeResponse(content=b'123456'))
+        cache.set('new', self.url, FakeResponse(content=b'123456'))
+        assert cache.get('old') is None
+        assert cache.get('new').content == b'123456'
+
+
+class TestAsyncStock:
+    """Test retrieving data with the asyncio api."""
+
+    def test_async_price_matches_sync(self, fake_session):
+        """Test awaited prices are the same as the ones from Stock."""
+        fake_session.responses = [
+            yahoo_chart([1627997400, 1628083800], [147.36, 147.36]),
+        ]
+
+        async def fetch_prices():
+            stocks = [AsyncStock('AAPL'), AsyncStock('MSFT')]
+            prices = [s.price('2021-8-3', '2021-8-4') for s in stocks]
+            return await asyncio.gather(*prices)
+
+        async_prices = asyncio.run(fetch_prices())
+        sync_price = Stock('AAPL').price('2021-8-3', '2021-8-4')
+        for price in async_prices:
+            pd.testing.assert_frame_equal(price, sync_price)
+        assert len(fake_session.calls) == 3
+
+    def test_company_name_resolved_in_worker(self, fake_session,
+                                             monkeypatch):
+        """Test a KOR company name is converted on the first call only."""
+        monkeypatch.setattr(stocklist_module, '_registry',
+                            StockListRegistry())
+        fake_session.responses = [dart_corp_code()]
+        stock = AsyncStock('삼성전자', 'KOR')
+        assert fake_session.calls == []
+        assert asyncio.run(stock._resolve_symbol()) == '005930'
+        assert stock.symbol == '005930'
+        assert len(fake_session.calls) == 1
+
+    def test_company_name_searched_in_krx(self, fake_session, monkeypatch):
+        """Test a name missing from the stock list is searched in KRX."""
+        monkeypatch.setattr(stocklist_module, '_registry',
+                            StockListRegistry())
+        fake_session.responses = [dart_corp_code()]
+        fake_session.routes = {
+            'kind.krx.co.kr': FakeResponse(
+                content='[{"repisusrtcd2": "035420"}]'.encode()),
+        }
+        stock = AsyncStock('네이버', 'KOR')
+        assert asyncio.run(stock._resolve_symbol()) == '035420'
+        assert 'kind.krx.co.kr' in fake_session.calls[-1][1]
+
+    def test_max_workers_resize_pools(self, monkeypatch):
+        """Test resizing the workers resizes the connection pools too."""
+        monkeypatch.setattr(session_module, '_executor', None)
+        monkeypatch.setattr(session_module, '_session_manager',
+                            SessionManager())
+        session_module.set_max_workers(64)
+        manager = session_module.get_session_manager()
+        assert manager.pool_maxsize == 64
+        assert session_module.get_executor()._max_workers == 64
+        session_module.set_max_workers(session_module.DEFAULT_MAX_WORKERS)
+
+    def test_async_request(self, fake_session):
+        """Test a request is awaited and sent once."""
+        fake_session.responses = [FakeResponse(content=b'{"a": 1}')]
+
+        async def fetch():
+            request = AsyncRequest('https://example.com/a.json', cache=False)
+            return [await request.response_data('json'),
+                    await request.response_data('json')]
+
+        assert asyncio.run(fetch()) == [{'a': 1}, {'a': 1}]
+        assert len(fake_session.calls) == 1
+
+    def test_async_market_keeps_sync_methods(self, fake_session):
+        """Test AsyncMarket works where a Market is expected."""
+        fake_session.responses = [
+            yahoo_chart([1627997400, 1628083800], [147.36, 147.36]),
+        ]
+        market = AsyncMarket('USA')
+        price = market.historical_price('AAPL', *PRICE_PERIOD)
+        assert not asyncio.iscoroutinefunction(market.financial_statement)
+        assert price.get_price_data()['Close'].tolist() == [147.36, 147.36]
+
+
+class TestBatch:
+    """Test retrieving price data of many stocks at once."""
+
+    def test_get_prices_reports_failures(self, fake_session):
+        """Test prices are stacked and a failed symbol does not abort."""
+        chart = yahoo_chart([1627997400, 1628083800], [147.36, 147.36])
+        fake_session.routes = {
+            '/AAPL?': chart,
+            '/MSFT?': chart,
+            '/BAD?': FakeResponse(status_code=404),
+        }
+        prices, failures = batch.get_prices(
+            ['AAPL', 'MSFT', 'BAD', 'aapl '], '2021-8-3', '2021-8-4',
+            max_workers=2,
+        )
+        assert prices['Symbol'].tolist() == ['AAPL', 'AAPL', 'MSFT', 'MSFT']
+        assert list(failures) == ['BAD']
+        assert isinstance(failures['BAD'], requests.HTTPError)
+        assert prices.columns.tolist() == batch.PRICE_COLUMNS
+
+    def test_get_prices_all_failed(self, fake_session):
+        """Test the columns are the same when every symbol failed."""
+        fake_session.responses = [FakeResponse(status_code=404)]
+        prices, failures = batch.get_prices(['BAD'], '2021-8-3', '2021-8-4')
+        assert prices.empty
+        assert prices.columns.tolist() == batch.PRICE_COLUMNS
+        assert list(failures) == ['BAD']
+
+
+class FakeClock:
+    """Clock advancing only when slept on."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestRateLimit:
+    """Test throttling requests sent to each data source."""
+
+    def test_token_bucket_rate(self):
+        """Test requests beyond the burst wait for the rate."""
+        clock = FakeClock()
+        bucket = TokenBucket(10, clock=clock, sleep=clock.sleep)
+        for _ in range(30):
+            bucket.acquire()
+        assert clock.now == pytest.approx(2.0)
+
+    def test_penalize_slows_down(self):
+        """Test the rate is halved and requests pause after a 429."""
+        clock = FakeClock()
+        bucket = TokenBucket(10, clock=clock, sleep=clock.sleep)
+        bucket.penalize(retry_after=5)
+        assert bucket.rate == 5
+        bucket.acquire()
+        assert clock.now == pytest.approx(5.0)
+        for _ in range(100):
+            bucket.reward()
+        assert bucket.rate == 10
+
+    def test_domain_shares_bucket(self):
+        """Test subdomains of a domain share one bucket."""
+        limiter = RateLimiter()
+        www = limiter.get_bucket('https://www.sec.gov/files/a.json')
+        data = limiter.get_bucket('http://data.sec.gov/submissions/a.json')
+        assert www is data
+        assert www.rate == 10
+        assert limiter.get_bucket('https://example.com') is None
+
+    def test_daily_quota(self):
+        """Test a spent daily quota spreads requests over the day."""
+        clock = FakeClock()
+        quota = TokenBucket(2 / 86_400, capacity=2, clock=clock,
+                            sleep=clock.sleep)
+        quota.acquire()
+        quota.acquire()
+        quota.acquire()
+        assert clock.now == pytest.approx(43_200)
+        limiter = RateLimiter()
+        dart = limiter.get_quota('https://opendart.fss.or.kr/api/list.json')
+        assert dart.capacity == 20_000
+
+    def test_parse_retry_after(self):
+        """Test Retry-After in seconds and in http date is parsed."""
+        assert parse_retry_after('3') == 3.0
+        assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+        assert parse_retry_after(None) is None
+
+
+class TestRetry:
+    """Test retrying failed requests."""
+
+    url = 'https://example.com/data'
+
+    def test_transient_errors_retried(self):
+        """Test 503 and connection errors are retried until success."""
+        waits = []
+        retry = RetryPolicy(total=3, sleep=waits.append)
+        session = FakeSession([
+            FakeResponse(status_code=503),
+            requests.ConnectionError(),
+            FakeResponse(content=b'{"a": 1}'),
+        ])
+        res = Request(self.url, headers={}, session=session, retry=retry,
+                      timeout=(1, 2))
+        assert res.response_data('json') == {'a': 1}
+        assert len(session.calls) == 3
+        assert len(waits) == 2
+        assert session.calls[0][2]['timeout'] == (1, 2)
+
+    def test_gives_up_after_total(self):
+        """Test the last failure is raised once retries run out."""
+        retry = RetryPolicy(total=2, sleep=lambda x: None)
+        session = FakeSession([FakeResponse(status_code=503)])
+        res = Request(self.url, headers={}, session=session, retry=retry)
+        with pytest.raises(requests.HTTPError):
+            res.response
+        assert len(session.calls) == 3
+
+    def test_not_retryable_status_raised(self):
+        """Test a status not in the forcelist is not retried."""
+        session = FakeSession([FakeResponse(status_code=404)])
+        res = Request(self.url, headers={}, session=session)
+        with pytest.raises(requests.HTTPError):
+            res.response
+        assert len(session.calls) == 1
+
+    def test_backoff(self):
+        """Test the wait grows exponentially and honors Retry-After."""
+        retry = RetryPolicy(backoff_factor=1, backoff_max=5, jitter=False)
+        assert [retry.get_backoff(n) for n in range(4)] == [1, 2, 4, 5]
+        assert retry.get_backoff(0, '7') == 7
+        jittered = RetryPolicy(backoff_factor=1).get_backoff(3)
+        assert 0 <= jittered <= 8
+
+    def test_retry_after_capped(self):
+        """Test a long Retry-After waits no longer than retry_after_max."""
+        retry = RetryPolicy(retry_after_max=30)
+        assert retry.get_backoff(0, '86400') == 30
+        assert retry.get_backoff(0, 'Wed, 21 Oct 2099 07:28:00 GMT') == 30
+        assert retry.get_backoff(0, '12') == 12
+
+
+class TestUsStockListIndex:
+    """Test looking up the US stock list through its indexes."""
+
+    @pytest.fixture
+    def stock_list(self, fake_session):
+        fake_session.responses = [sec_tickers()]
+        return UsStockList()
+
+    def test_stock_list_cleaned(self, stock_list):
+        """Test the stock list keeps NASDAQ/NYSE with padded CIKs."""
+        df = stock_list.stock_list
+        assert df['ticker'].tolist() == ['AAPL', 'GOOGL', 'GOOG', 'QCOM']
+        assert df['cik'].tolist()[0] == '0000320193'
+        assert df['name'].tolist()[3] == 'Qualcomm Inc'
+
+    @pytest.mark.parametrize(
+        'name, cleaned',
+        [
+            ('QUALCOMM INC/DE', 'Qualcomm Inc'),
+            ('Bank of America Corp \\MD', 'Bank Of America Corp'),
+            ("  o'reilly   automotive inc", "O'reilly Automotive Inc"),
+            ('3M CO', '3m Co'),
+        ]
+    )
+    def test_clean_company_name(self, name, cleaned):
+        """Test names are cleaned the same as regex and capwords did."""
+        assert _clean_company_name(name) == cleaned
+
+    def test_lookups(self, stock_list, fake_session):
+        """Test tickers, CIKs and names are resolved with one download."""
+        assert stock_list.search_cik('aapl') == '0000320193'
+        assert stock_list.search_cik('GOOG') == '0001652044'
+        assert stock_list.search_ticker(1652044) == 'GOOGL'
+        assert stock_list.search_cik_by_name('apple  inc.') == '0000320193'
+        with pytest.raises(EmptyDataFrameError):
+            stock_list.search_cik('OTCX')
+        assert len(fake_session.calls) == 1
+
+
+class TestStockListRegistry:
+    """Test sharing loaded stock lists in a process."""
+
+    def test_shared_until_expired(self, fake_session):
+        """Test a stock list is downloaded once until its TTL passes."""
+        fake_session.responses = [sec_tickers()]
+        clock = FakeClock()
+        registry = StockListRegistry(ttl=60, clock=clock)
+        first = registry.get(UsStockList)
+        assert registry.get(UsStockList) is first
+        assert len(fake_session.calls) == 1
+        clock.sleep(61)
+        assert registry.get(UsStockList) is not first
+        assert len(fake_session.calls) == 2
+
+    def test_invalidate(self, fake_session):
+        """Test an invalidated stock list is loaded again."""
+        fake_session.responses = [sec_tickers()]
+        registry = StockListRegistry()
+        first = registry.get(UsStockList)
+        registry.invalidate(UsStockList)
+        assert registry.get(UsStockList) is not first
+
+    def test_loaded_once_across_threads(self, fake_session):
+        """Test threads asking together share one download."""
+        fake_session.responses = [sec_tickers()]
+        registry = StockListRegistry()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            lists = list(executor.map(registry.get, [UsStockList] * 16))
+        assert all(x is lists[0] for x in lists)
+        assert len(fake_session.calls) == 1
+
+
+class TestKorStockList:
+    """Test parsing the stock list of Korea Exchange."""
+
+    def test_listed_only(self, fake_session):
+        """Test only listed companies are kept, in columns of the file."""
+        fake_session.responses = [dart_corp_code()]
+        stock_list = KorStockList()
+        df = stock_list.stock_list
+        assert df.columns.tolist() == [
+            'corp_code', 'corp_name', 'corp_eng_name', 'stock_code',
+            'modify_date',
+        ]
+        assert df['stock_code'].tolist() == ['005930', '000660']
+        assert df['corp_eng_name'].isna().tolist() == [False, True]
+        assert stock_list.search_corp_code('005930') == '00126380'
+
+    def test_all_companies(self, fake_session):
+        """Test unlisted companies are kept with listed_only=False."""
+        fake_session.responses = [dart_corp_code()]
+        df = KorStockList(listed_only=False).stock_list
+        assert len(df) == 3
+        assert df['stock_code'].isna().tolist() == [False, True, False]
+
+
+class TestSnapshot:
+    """Test storing stock lists in snapshots."""
+
+    def test_round_trip(self, tmp_path):
+        """Test a stored dataframe is loaded back the same."""
+        store = SnapshotStore(tmp_path)
+        df = pd.DataFrame({
+            'code': ['005930', None, '000660'],
+            'name': ['삼성전자', '비상장', 'SK하이닉스'],
+            'value': [1.5, 2.0, float('nan')],
+        })
+        store.save('sample', df)
+        loaded = store.load('sample')
+        pd.testing.assert_frame_equal(loaded, df, check_dtype=False)
+        assert store.get_manifest('sample')['rows'] == 3
+
+    def test_expired_snapshot_ignored(self, tmp_path):
+        """Test a snapshot older than max_age is not used."""
+        store = SnapshotStore(tmp_path, max_age=datetime.timedelta(0))
+        store.save('sample', pd.DataFrame({'a': [1]}))
+        assert store.load('sample') is None
+
+    def test_replaced(self, tmp_path, monkeypatch):
+        """Test a snapshot is replaced and the old data is removed."""
+        monkeypatch.setattr(snapshot_module, '_GRACE_PERIOD', 0)
+        store = SnapshotStore(tmp_path)
+        store.save('sample', pd.DataFrame({'a': [1]}))
+        store.save('sample', pd.DataFrame({'a': [2]}))
+        assert store.load('sample')['a'].tolist() == [2]
+        data_dirs = [x for x in (tmp_path / 'sample').iterdir() if x.is_dir()]
+        assert len(data_dirs) == 1
+
+    def test_concurrent_saves_and_loads(self, tmp_path):
+        """Test saving from many workers at once never breaks a load."""
+        store = SnapshotStore(tmp_path)
+        store.save('sample', pd.DataFrame({'a': [0], 'b': ['x']}))
+
+        def save_and_load(i):
+            store.save('sample', pd.DataFrame({'a': [i], 'b': ['x']}))
+            return store.load('sample')
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            loaded = list(executor.map(save_and_load, range(32)))
+
+        assert all(x is None or x['b'].tolist() == ['x'] for x in loaded)
+        assert store.load('sample')['a'].tolist()[0] in range(32)
+
+    def test_missing_data_is_a_miss(self, tmp_path):
+        """Test data removed under a manifest is treated as missing."""
+        store = SnapshotStore(tmp_path)
+        store.save('sample', pd.DataFrame({'a': [1]}))
+        manifest = store.get_manifest('sample')
+        shutil.rmtree(tmp_path / 'sample' / manifest['directory'])
+        assert store.load('sample') is None
+
+    def test_numeric_columns_memory_mapped(self, tmp_path):
+        """Test numeric columns are not read into memory on load."""
+        store = SnapshotStore(tmp_path)
+        store.save('sample', pd.DataFrame({'a': [1.5, 2.5]}))
+        values = store.load('sample')['a'].to_numpy()
+        while not isinstance(values, np.memmap) and values.base is not None:
+            values = values.base
+        assert isinstance(values, np.memmap)
+
+    def test_stock_list_loaded_from_snapshot(self, tmp_path, fake_session,
+                                             monkeypatch):
+        """Test a new process loads the stock list without downloading."""
+        monkeypatch.setattr(snapshot_module, '_snapshot_store',
+                            SnapshotStore(tmp_path))
+        fake_session.responses = [sec_tickers()]
+        downloaded = UsStockList().stock_list
+        loaded = UsStockList()
+        pd.testing.assert_frame_equal(loaded.stock_list, downloaded,
+                                      check_dtype=False)
+        assert loaded.search_cik('AAPL') == '0000320193'
+        assert len(fake_session.calls) == 1
+
+
+class TestNameIndex:
+    """Test searching company names without network."""
+
+    @pytest.fixture
+    def index(self):
+        """Build a name index of a few companies."""
+        return NameIndex(
+            ['Apple Inc.', 'Applied Materials Inc', 'Alphabet Inc.',
+             '삼성전자(주)', '삼성SDI', 'SAMSUNG ELECTRONICS CO,.LTD'],
+            ['AAPL', 'AMAT', 'GOOGL', '005930', '006400', '005930'],
+        )
+
+    def test_normalize_name(self):
+        """Test legal forms, punctuation and width are ignored."""
+        assert normalize_name('SAMSUNG ELECTRONICS CO,.LTD') == \
+            'samsungelectronics'
+        assert normalize_name('삼성전자(주)') == '삼성전자'
+        assert normalize_name('ＡＰＰＬＥ Inc.') == 'apple'
+
+    def test_prefix(self, index):
+        """Test names are completed from their beginning."""
+        assert index.prefix('appl') == [
+            ('Apple Inc.', 'AAPL'), ('Applied Materials Inc', 'AMAT'),
+        ]
+        assert [x[1] for x in index.prefix('삼성')] == ['005930', '006400']
+        assert index.prefix('zzz') == []
+
+    def test_exact_match_first(self, index):
+        """Test an exact name scores 1 and comes first."""
+        name, code, score = index.search('Samsung Electronics')[0]
+        assert (code, score) == ('005930', 1.0)
+
+    def test_fuzzy_match(self, index):
+        """Test a misspelled name is suggested, in Hangul too."""
+        assert index.search('Samsung Electronic')[0][1] == '005930'
+        assert index.search('삼성전지')[0][1] == '005930'
+
+    def test_resolve_exact_only(self, index):
+        """Test only an exact name resolves to a code."""
+        assert index.resolve('삼성전자 (주)') == '005930'
+        assert index.resolve('Samsung Electronics Co., Ltd.') == '005930'
+        with pytest.raises(EmptyDataFrameError):
+            index.resolve('삼성전지')
+
+    def test_preferred_share_not_mistaken(self):
+        """Test a preferred share resolves to its own code, not the common."""
+        index = NameIndex(['삼성전자', '삼성전자우'], ['005930', '005935'])
+        assert index.search('삼성전자우')[1][1] == '005930'
+        assert index.resolve('삼성전자우') == '005935'
+        only_common = NameIndex(['삼성전자'], ['005930'])
+        with pytest.raises(EmptyDataFrameError):
+            only_common.resolve('삼성전자우')
+
+    def test_ambiguous_name_not_resolved(self):
+        """Test a name shared by different codes is not resolved."""
+        index = NameIndex(['Acme Inc', 'ACME Corp'], ['ACME', 'ACMC'])
+        with pytest.raises(EmptyDataFrameError):
+            index.resolve('Acme')
+
+    def test_no_match(self, index):
+        """Test an unrelated name is not resolved."""
+        with pytest.raises(EmptyDataFrameError):
+            index.resolve('Berkshire Hathaway')
+
+    def test_stock_resolved_offline(self, fake_session, monkeypatch):
+        """Test a company name in Korea Exchange is resolved locally."""
+        monkeypatch.setattr(stocklist_module, '_registry',
+                            StockListRegistry())
+        fake_session.responses = [dart_corp_code()]
+        stock = Stock('Samsung Electronics', 'KOR')
+        assert stock.symbol == '005930'
+        assert Stock('에스케이하이닉스', 'KOR').symbol == '000660'
+        assert all('opendart' in url for _, url, _ in fake_session.calls)
+
+    def test_preferred_share_searched_in_krx(self, fake_session,
+                                             monkeypatch):
+        """Test a name only similar to a listed one is searched in KRX."""
+        monkeypatch.setattr(stocklist_module, '_registry',
+                            StockListRegistry())
+        fake_session.responses = [dart_corp_code()]
+        fake_session.routes = {
+            'kind.krx.co.kr': FakeResponse(
+                content='[{"repisusrtcd2": "005935"}]'.encode()),
+        }
+        assert Stock('삼성전자우', 'KOR').symbol == '005935'
+        assert 'kind.krx.co.kr' in fake_session.calls[-1][1]
+
+
+def investing_quotes(pair_id):
+    """Build a response body of investing.com search."""
+    body = {'quotes': [{'pairId': pair_id}]}
+    return FakeResponse(content=json.dumps(body).encode('utf-8'))
+
+
+class TestPairIdCache:
+    """Test reusing pair_ids searched from investing.com."""
+
+    def test_searched_once(self, fake_session, monkeypatch):
+        """Test the same symbol is searched once."""
+        monkeypatch.setattr(search, '_pair_id_cache', PairIdCache())
+        fake_session.responses = [investing_quotes(6497)]
+        assert search.Company('AAPL').search_pair_id() == 6497
+        assert search.Company(' aapl').search_pair_id() == 6497
+        assert len(fake_session.calls) == 1
+
+    def test_persisted(self, tmp_path, fake_session, monkeypatch):
+        """Test pair_ids are reused by a new cache on the same file."""
+        path = tmp_path / 'pair_ids.json'
+        monkeypatch.setattr(search, '_pair_id_cache', PairIdCache(path))
+        fake_session.responses = [investing_quotes(6497)]
+        search.Company('AAPL').search_pair_id()
+        assert PairIdCache(path).get('AAPL') == 6497
+
+    def test_expired(self, tmp_path):
+        """Test a pair_id older than ttl is not used."""
+        pair_id_cache = PairIdCache(ttl=datetime.timedelta(0))
+        pair_id_cache.set('AAPL', 6497)
+        assert pair_id_cache.get('AAPL') is None
+
+    def test_prewarm(self, fake_session, monkeypatch):
+        """Test missing pair_ids are searched at once and failures kept."""
+        pair_id_cache = PairIdCache()
+        pair_id_cache.set('AAPL', 6497)
+        monkeypatch.setattr(search, '_pair_id_cache', pair_id_cache)
+        fake_session.routes = {
+            'searchTopBar': investing_quotes(6369),
+        }
+        failures = search.prewarm(['AAPL', 'MSFT', 'MSFT'])
+        assert failures == {}
+        assert pair_id_cache.get('MSFT') == 6369
+        assert len(fake_session.calls) == 1
+
+
+def sec_submissions(forms=('10-K', '10-Q', '8-K'), files=()):
+    """Build a response body of EDGAR submissions."""
+    recent = {
+        'accessionNumber': [
+            f'0000320193-24-00000{i}' for i in range(len(forms))
+        ],
+        'form': list(forms),
+        'primaryDocument': [f'doc{i}.htm' for i in range(len(forms))],
+        'filingDate': [f'2024-0{i + 1}-01' for i in range(len(forms))],
+    }
+    body = {
+        'filings': {'recent': recent, 'files': [{'name': x} for x in files]},
+    }
+    return FakeResponse(content=json.dumps(body).encode('utf-8'))
+
+
+class TestCompanyContext:
+    """Test resolving a company once across calls."""
+
+    def test_market_reused(self):
+        """Test the same market serves every call of a stock."""
+        stock = Stock('AAPL')
+        assert stock.market is stock.market
+        assert stock.context is stock.context
+        assert AsyncStock('AAPL').market.__class__.__name__ == 'AsyncMarket'
+
+    def test_statements_share_lookups(self, fake_session, monkeypatch):
+        """Test statements of a company look it up once."""
+        monkeypatch.setattr(stocklist_module, '_registry',
+                            StockListRegistry())
+        filings.get_filings_list.cache_clear()
+        fake_session.routes = {
+            'company_tickers': sec_tickers(),
+            'submissions': sec_submissions(),
+        }
+        context = CompanyContext('aapl')
+        for financial in ['income_statement', 'balance_sheet', 'cash_flow']:
+            us_financials = UsFinancials('AAPL', financial, context=context)
+            cik, latest_filing = us_financials._get_latest_filing_info()
+            assert cik == '0000320193'
+            assert latest_filing['Form'] == '10-K'
+        assert len(fake_session.calls) == 2
+
+    def test_filings_expire(self, fake_session, monkeypatch):
+        """Test filings are retrieved again after ttl but CIK is kept."""
+        monkeypatch.setattr(stocklist_module, '_registry',
+                            StockListRegistry())
+        filings.get_filings_list.cache_clear()
+        fake_session.routes = {
+            'company_tickers': sec_tickers(),
+            'submissions': sec_submissions(),
+        }
+        now = [0.0]
+        context = CompanyContext('aapl', ttl=60)
+        context._recent = TTLCache(maxsize=64, ttl=60, clock=lambda: now[0])
+        context.get_filings_list()
+        context.get_filings_list()
+        assert len(fake_session.calls) == 2
+        now[0] = 61.0
+        filings.get_filings_list.cache_clear()
+        context.get_filings_list()
+        urls = [url for _, url, _ in fake_session.calls]
+        assert len(urls) == 3
+        assert 'submissions' in urls[-1]
+
+
+def dart_report():
+    """Build a response body of DART fnlttSinglAcntAll.json."""
+    rows = [
+        {
+            'rcept_no': '20240312000736', 'sj_div': sj_div, 'sj_nm': sj_nm,
+            'account_nm': account_nm, 'thstrm_nm': '제 55 기',
+            'thstrm_amount': '100', 'frmtrm_nm': '제 54 기',
+            'frmtrm_amount': '90', 'bfefrmtrm_nm': '제 53 기',
+            'bfefrmtrm_amount': '80',
+        }
+        for sj_div, sj_nm, account_nm in [
+            ('BS', '재무상태표', '자산총계'),
+            ('IS', '손익계산서', '매출액'),
+            ('CF', '현금흐름표', '영업활동현금흐름'),
+        ]
+    ]
+    body = {'status': '000', 'message': '정상', 'list': rows}
+    return FakeResponse(content=json.dumps(body).encode('utf-8'))
+
+
+class TestAllFinancials:
+    """Test retrieving every financial statement in one call."""
+
+    def test_kor_report_retrieved_once(self, fake_session, monkeypatch):
+        """Test the three statements come from one DART report."""
+        monkeypatch.setattr(stocklist_module, '_registry',
+                            StockListRegistry())
+        latest = {'status': '000', 'list': [{'rcept_dt': '20240312'}]}
+        fake_session.routes = {
+            'corpCode': dart_corp_code(),
+            'list.json': FakeResponse(content=json.dumps(latest).encode()),
+            'fnlttSinglAcntAll': dart_report(),
+        }
+        statements = Stock('005930', 'KOR').financials('all')
+        assert list(statements) == [
+            'income_statement', 'balance_sheet', 'cash_flow',
+        ]
+        assert statements['balance_sheet'].iloc[0, 0] == '자산총계'
+        assert statements['cash_flow'].columns[0] == '현금흐름표'
+        assert len(fake_session.calls) == 3
+
+    def test_async_kor(self, fake_session, monkeypatch):
+        """Test every statement of an AsyncStock is a dataframe."""
+        monkeypatch.setattr(stocklist_module, '_registry',
+                            StockListRegistry())
+        latest = {'status': '000', 'list': [{'rcept_dt': '20240312'}]}
+        fake_session.routes = {
+            'corpCode': dart_corp_code(),
+            'list.json': FakeResponse(content=json.dumps(latest).encode()),
+            'fnlttSinglAcntAll': dart_report(),
+        }
+        statements = asyncio.run(AsyncStock('005930', 'KOR').financials('all'))
+        assert list(statements) == [
+            'income_statement', 'balance_sheet', 'cash_flow',
+        ]
+        assert all(isinstance(x, pd.DataFrame) for x in statements.values())
+        assert statements['balance_sheet'].iloc[0, 0] == '자산총계'
+
+    def test_us_viewer_retrieved_once(self, fake_session, monkeypatch):
+        """Test the three statements share one viewer page of a filing."""
+        monkeypatch.setattr(stocklist_module, '_registry',
+                            StockListRegistry())
+        filings.get_filings_list.cache_clear()
+        fake_session.routes = {
+            'company_tickers': sec_tickers(),
+            'submissions': sec_submissions(),
+            'viewer': FakeResponse(content=VIEWER.encode()),
+            '.htm': FakeResponse(content=R_FILE.encode()),
+        }
+        statements = Stock('AAPL').financials('all')
+        assert list(statements) == [
+            'income_statement', 'balance_sheet', 'cash_flow',
+        ]
+        assert all(isinstance(x, pd.DataFrame) for x in statements.values())
+        urls = [url for _, url, _ in fake_session.calls]
+        assert sum('viewer' in url for url in urls) == 1
+        reports = [url.rsplit('/', 1)[-1] for url in urls
+                   if url.endswith('.htm')]
+        assert reports == ['R2.htm', 'R3.htm', 'R5.htm']
+
+
+class TestTTLCache:
+    """Test keeping values in memory for a limited time."""
+
+    def test_least_recently_used_dropped(self):
+        """Test the least recently used value is dropped when full."""
+        cache = TTLCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert len(cache) == 2
+
+    def test_expired(self):
+        """Test a value older than ttl is dropped."""
+        clock = FakeClock()
+        cache = TTLCache(ttl=60, clock=clock)
+        cache.set('a', 1)
+        clock.now += 59
+        assert cache.get('a') == 1
+        clock.now += 1
+        assert cache.get('a') is None
+        assert cache.info() == (1, 1, 128, 0)
+
+    def test_filings_list_copied(self, fake_session):
+        """Test callers of get_filings_list do not share the dataframe."""
+        filings.get_filings_list.cache_clear()
+        fake_session.responses = [sec_submissions()]
+        first = filings.get_filings_list('0000320193')
+        first.loc[0, 'PrimaryDocument'] = 'changed.htm'
+        second = filings.get_filings_list('0000320193')
+        assert second.loc[0, 'PrimaryDocument'] == 'doc0.htm'
+        assert filings.get_filings_list.cache_info().hits == 1
+        assert len(fake_session.calls) == 1
+
+
+class TestFilingsHistory:
+    """Test retrieving filings paged into older submissions files."""
+
+    def test_full_history(self, fake_session):
+        """Test older pages are merged into one typed list."""
+        filings.get_filings_list.cache_clear()
+        older = {
+            'accessionNumber': ['0000320193-19-000001', '0000320193-24-000002'],
+            'form': ['10-K', '8-K'],
+            'primaryDocument': ['old.htm', 'doc2.htm'],
+            'filingDate': ['2019-11-01', '2024-03-01'],
+        }
+        fake_session.routes = {
+            'CIK0000320193-submissions-001.json': FakeResponse(
+                content=json.dumps(older).encode('utf-8')),
+            'CIK0000320193.json': sec_submissions(
+                files=['CIK0000320193-submissions-001.json']),
+        }
+        recent = filings.get_filings_list('0000320193')
+        full = filings.get_filings_list('0000320193', full_history=True)
+        assert len(recent) == 3
+        assert full['PrimaryDocument'].tolist() == [
+            'doc2.htm', 'doc1.htm', 'doc0.htm', 'old.htm',
+        ]
+        assert isinstance(full['Form'].dtype, pd.CategoricalDtype)
+        assert pd.api.types.is_datetime64_any_dtype(full['Date'])
+
+
+def edgar_bulk_zip(path, members):
+    """Write a bulk archive of EDGAR with json members."""
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        for name, body in members.items():
+            zip_file.writestr(name, json.dumps(body))
+    return path
+
+
+class TestBulkStore:
+    """Test reading EDGAR data from bulk archives offline."""
+
+    @pytest.fixture
+    def bulk_store(self, tmp_path):
+        """Load fixture archives into a bulk store."""
+        recent = {
+            'accessionNumber': ['0000320193-24-000002',
+                                '0000320193-24-000001'],
+            'form': ['10-Q', '10-K'],
+            'primaryDocument': ['q.htm', 'k.htm'],
+            'filingDate': ['2024-05-01', '2024-02-01'],
+        }
+        older = {
+            'accessionNumber': ['0000320193-19-000001'],
+            'form': ['10-K'],
+            'primaryDocument': ['old.htm'],
+            'filingDate': ['2019-11-01'],
+        }
+        submissions = edgar_bulk_zip(tmp_path / 'submissions.zip', {
+            'CIK0000320193.json': {'filings': {'recent': recent}},
+            'CIK0000320193-submissions-001.json': older,
+        })
+        facts = {'cik': 320193, 'facts': {'us-gaap': {}}}
+        companyfacts = edgar_bulk_zip(tmp_path / 'companyfacts.zip', {
+            'CIK0000320193.json': facts,
+        })
+        store = BulkStore(tmp_path / 'edgar.sqlite3')
+        assert store.load_submissions(submissions) == 3
+        assert store.load_companyfacts(companyfacts) == 1
+        return store
+
+    def test_stored_data(self, bulk_store):
+        """Test filings and facts are read back by CIK."""
+        recent = bulk_store.get_submissions('0000320193')
+        assert recent['primaryDocument'] == ['q.htm', 'k.htm']
+        full = bulk_store.get_submissions('0000320193', full_history=True)
+        assert full['accessionNumber'][-1] == '000032019319000001'
+        assert bulk_store.get_submissions('0000000001') is None
+        facts = bulk_store.get_company_facts('0000320193')
+        assert facts['cik'] == 320193
+
+    def test_filings_list_offline(self, bulk_store, fake_session,
+                                  monkeypatch):
+        """Test the filings list is read without sending a request."""
+        monkeypatch.setattr(bulk, '_bulk_store', bulk_store)
+        filings.get_filings_list.cache_clear()
+        submission = filings.get_filings_list('0000320193',
+                                              full_history=True)
+        assert submission['Form'].tolist() == ['10-Q', '10-K', '10-K']
+        assert fake_session.calls == []
+
+
+def xbrl_facts():
+    """Build XBRL facts of a company in the format of companyfacts."""
+    def fact(val, end, form, filed, start=None):
+        value = {'end': end, 'val': val, 'form': form, 'filed': filed}
+        if start is not None:
+            value['start'] = start
+        return value
+
+    us_gaap = {
+        'Revenues': {'units': {'USD': [
+            fact(100, '2022-12-31', '10-K', '2023-02-01', '2022-01-01'),
+            fact(120, '2023-12-31', '10-K', '2024-02-01', '2023-01-01'),
+            fact(30, '2023-09-30', '10-Q', '2023-11-01', '2023-07-01'),
+        ]}},
+        'NetIncomeLoss': {'units': {'USD': [
+            fact(10, '2022-12-31', '10-K', '2023-02-01', '2022-01-01'),
+            # restated by the next annual report
+            fact(11, '2022-12-31', '10-K', '2024-02-01', '2022-01-01'),
+            fact(15, '2023-12-31', '10-K', '2024-02-01', '2023-01-01'),
+        ]}},
+        'EarningsPerShareBasic': {'units': {'USD/shares': [
+            fact(1.5, '2023-12-31', '10-K', '2024-02-01', '2023-01-01'),
+        ]}},
+        'Assets': {'units': {'USD': [
+            fact(500, '2023-12-31', '10-K', '2024-02-01'),
+        ]}},
+    }
+    return {'cik': 320193, 'facts': {'us-gaap': us_gaap}}
+
+
+class TestXbrl:
+    """Test building financial statements from XBRL facts."""
+
+    def test_income_statement(self):
+        """Test every annual period is kept with the latest values."""
+        statement = build_statement(xbrl_facts(), 'income_statement')
+        assert statement.index.tolist() == [
+            'Revenue', 'Net Income', 'EPS Basic',
+        ]
+        assert statement.columns.tolist() == [
+            pd.Timestamp('2023-12-31'), pd.Timestamp('2022-12-31'),
+        ]
+        assert statement.loc['Net Income'].tolist() == [15.0, 11.0]
+        assert (statement.dtypes == 'float64').all()
+
+    def test_quarter_and_instant(self):
+        """Test quarterly durations and instant balances are selected."""
+        quarter = build_statement(xbrl_facts(), 'income_statement', 'quarter')
+        assert quarter.loc['Revenue'].tolist() == [30.0]
+        balance = build_statement(xbrl_facts(), 'balance_sheet')
+        assert balance.loc['Total Assets'].tolist() == [500.0]
+
+    def test_missing_facts(self):
+        """Test a statement without facts raises an error."""
+        with pytest.raises(EmptyDataFrameError):
+            build_statement(xbrl_facts(), 'cash_flow', 'quarter')
+
+    def test_cash_flow_quarter(self):
+        """Test quarters of cash flows are derived from the year to date."""
+        def fact(val, start, end, filed):
+            return {'start': start, 'end': end, 'val': val, 'form': '10-Q',
+                    'filed': filed}
+
+        operating = [
+            fact(10, '2023-01-01', '2023-03-31', '2023-05-01'),
+            fact(25, '2023-01-01', '2023-06-30', '2023-08-01'),
+            fact(45, '2023-01-01', '2023-09-30', '2023-11-01'),
+        ]
+        net_income = [
+            # reported for its own three months as well as the year to date
+            fact(12, '2023-04-01', '2023-06-30', '2023-08-01'),
+            fact(100, '2023-01-01', '2023-06-30', '2023-08-01'),
+        ]
+        us_gaap = {
+            'NetCashProvidedByUsedInOperatingActivities': {
+                'units': {'USD': operating},
+            },
+            'NetIncomeLoss': {'units': {'USD': net_income}},
+        }
+        facts = {'facts': {'us-gaap': us_gaap}}
+        statement = build_statement(facts, 'cash_flow', 'quarter')
+        assert statement.columns.tolist() == [
+            pd.Timestamp('2023-09-30'), pd.Timestamp('2023-06-30'),
+            pd.Timestamp('2023-03-31'),
+        ]
+        assert statement.loc['Cash from Operating Activities'].tolist() == [
+            20.0, 15.0, 10.0,
+        ]
+        assert statement.loc['Net Income', pd.Timestamp('2023-06-30')] == 12
+
+    def test_stock_financials(self, fake_session, monkeypatch):
+        """Test every statement of a stock shares one facts request."""
+        monkeypatch.setattr(stocklist_module, '_registry',
+                            StockListRegistry())
+        fake_session.routes = {
+            'company_tickers': sec_tickers(),
+            'companyfacts': FakeResponse(
+                content=json.dumps(xbrl_facts()).encode('utf-8')),
+        }
+        statements = Stock('AAPL').financials('all', engine='xbrl')
+        assert statements['balance_sheet'].iloc[0, 0] == 500.0
+        assert statements['cash_flow'].loc['Net Income'].iloc[0] == 15.0
+        assert len(fake_session.calls) == 2
+
+
+R_FILE = """<html><body><table class="report">
+<tr><th class="tl" rowspan="2"><strong>INCOME STATEMENTS - USD ($)<br>
+ $ in Millions</strong></th><th class="th" colspan="2">12 Months Ended</th></tr>
+<tr><th class="th">Sep. 28, 2024</th><th class="th">Sep. 30, 2023</th></tr>
+<tr><td class="pl">Net sales</td><td class="nump">$ 391,035</td>
+<td class="nump">$ 383,285</td></tr>
+<tr><td class="pl">Earnings per share:</td><td></td><td></td></tr>
+<tr><td class="pl">Other expense</td><td class="nump">(269)</td>
+<td class="nump">(565) <sup>[1]</sup></td></tr>
+</table><table class="outerFootnotes"><tr><td>[1] Note</td></tr></table>
+</body></html>"""
+
+VIEWER = """<html><body><div id="menu"><ul>
+<li><a href="javascript:void(0);">Cover</a><ul>
+<li><a href="javascript:loadReport(1);" id="r1">Cover Page</a></li></ul></li>
+<li><a href="javascript:void(0);">Financial Statements</a><ul>
+<li><a href="javascript:loadReport(2);" id="r2">STATEMENTS OF OPERATIONS</a></li>
+<li><a href="javascript:loadReport(3);" id="r3">BALANCE SHEETS</a></li>
+<li><a href="javascript:loadReport(4);" id="r4">BALANCE SHEETS (Parenthetical)</a></li>
+<li><a href="javascript:loadReport(5);" id="r5">STATEMENTS OF CASH FLOWS</a></li>
+</ul></li></ul></div></body></html>"""
+
+
+class TestHtmlTable:
+    """Test reading EDGAR pages parsed by lxml."""
+
+    def test_same_as_read_html(self):
+        """Test a report table is read like pandas.read_html reads it."""
+        document = lxml.html.fromstring(R_FILE)
+        table = find_report_table(document)
+        expected = pd.read_html(io.StringIO(R_FILE), thousands=None)[0]
+        df = read_table(table)
+        assert df.columns.tolist() == expected.columns.tolist()
+        pd.testing.assert_frame_equal(df.astype(object),
+                                      expected.astype(object))
+
+    def test_statement_values(self, fake_session):
+        """Test values of a statement are read from an R-file."""
+        fake_session.responses = [FakeResponse(content=R_FILE.encode())]
+        statement = UsFinancials('AAPL')._get_values('https://example.com')
+        assert statement.columns[0][0] == 'INCOME STATEMENTS'
+        assert statement.iloc[0, 1] == 391035
+        assert statement.iloc[2, 1] == -269
+        assert statement.iloc[2, 2] == -565
+
+    def test_latest_form_links(self, fake_session):
+        """Test links of the statements are found in the viewer menu."""
+        fake_session.responses = [FakeResponse(content=VIEWER.encode())]
+        links = filings.get_latest_form('320193', '000032019324000001')
+        base = ('https://www.sec.gov/Archives/edgar/data/320193/'
+                '000032019324000001/')
+        assert links == {
+            'income_statement': base + 'R2.htm',
+            'balance_sheet': base + 'R3.htm',
+            'cash_flow': base + 'R5.htm',
+        }
+
+
+class TestNumeric:
+    """Test parsing numbers written in accounting format."""
+
+    @pytest.mark.parametrize(
+        'text, number',
+        [
+            ('$ 391,035', 391035.0),
+            ('(1,234)', -1234.0),
+            ('$ (565) [1]', -565.0),
+            ('-12.5', -12.5),
+            ('—', 0.0),
+            ('-', 0.0),
+            ('1.5B', 1.5e9),
+            ('12.3%', 12.3),
+            (7, 7.0),
+        ]
+    )
+    def test_parse_number(self, text, number):
+        """Test each format is parsed."""
+        assert parse_number(text) == number
+
+    @pytest.mark.parametrize('text', [None, '', 'Net sales', True])
+    def test_not_a_number(self, text):
+        """Test values that are not numbers are NaN."""
+        assert pd.isna(parse_number(text))
+
+    def test_parse_abbreviated_block(self):
+        """Test a block of abbreviated texts is parsed as one by one."""
+        texts = ['12.34M', '1.2b', '950.5K', '1,234', ' 7 ', '-0.5T']
+        assert parse_numbers(texts).tolist() == [
+            parse_number(x) for x in texts
+        ]
+
+    def test_parse_block(self):
+        """Test a block keeps its shape and becomes float64."""
+        numbers = parse_numbers(pd.DataFrame([['1,000', None], ['(2)', '3']]))
+        assert numbers.dtype == 'float64'
+        assert numbers.shape == (2, 2)
+        assert numbers[1].tolist() == [-2.0, 3.0]
+
+    def test_standard_financials_per_share(self):
+        """Test values are in millions except the ones per share."""
+        html = """<table><tr><th>Period Ending:</th><th>2023</th>
+        <th>2022</th></tr>
+        <tr><td>Total Revenue</td><td>383,285</td><td>-</td></tr>
+        <tr><td>Diluted Normalized EPS</td><td>6.13</td><td>(0.5)</td></tr>
+        <tr><td>Period</td><td>2023/30/09</td><td>2022/24/09</td></tr>
+        </table>"""
+        table = UsFinancials('AAPL')._convert_to_table(html, 'INC')
+        assert table.loc['Total Revenue'].tolist() == [383_285e6, 0.0]
+        assert table.loc['Diluted Normalized EPS'].tolist() == [6.13, -0.5]
+
+
+PRICE_PERIOD = (pd.Timestamp('2021-08-03'), pd.Timestamp('2021-08-04'))
+
+
+class TestUsPrice:
+    """Test converting Yahoo chart data to a dataframe."""
+
+    def test_price_columns(self, fake_session):
+        """Test prices are rounded floats and volumes are integers."""
+        fake_session.responses = [
+            yahoo_chart([1627997400, 1628083800], [147.364, 146.951]),
+        ]
+        price = UsMarket('AAPL', *PRICE_PERIOD).get_price_data()
+        assert price.columns.tolist() == [
+            'Date', 'Close', 'Open', 'High', 'Low', 'Volume',
+        ]
+        assert price['Close'].tolist() == [147.36, 146.95]
+        assert price['Close'].dtype == 'float64'
+        assert price['Volume'].dtype == 'int64'
+        assert price['Date'].tolist() == [
+            pd.Timestamp('2021-08-03'), pd.Timestamp('2021-08-04'),
+        ]
+
+    def test_float32(self, fake_session):
+        """Test prices are in the data type asked for."""
+        fake_session.responses = [
+            yahoo_chart([1627997400, 1628083800], [147.36, 147.36]),
+        ]
+        price = Stock('AAPL').price('2021-8-3', '2021-8-4', dtype='float32')
+        assert (price.dtypes[['Close', 'Open', 'High', 'Low']]
+                == 'float32').all()
+
+    def test_date_of_exchange(self, fake_session):
+        """Test a timestamp is dated in the timezone of the exchange."""
+        # 2021-08-04 02:00 in UTC is still 2021-08-03 in New York
+        fake_session.responses = [yahoo_chart([1628042400], [147.36])]
+        price = UsMarket('AAPL', *PRICE_PERIOD).get_price_data()
+        assert price['Date'].tolist() == [pd.Timestamp('2021-08-03')]
+
+    def test_missing_values(self, fake_session):
+        """Test null prices are NaN and keep the volumes as floats."""
+        response = yahoo_chart([1627997400, 1628083800], [147.36, None])
+        body = json.loads(response.content)
+        body['chart']['result'][0]['indicators']['quote'][0]['volume'] = [
+            100, None,
+        ]
+        fake_session.responses = [
+            FakeResponse(content=json.dumps(body).encode('utf-8')),
+        ]
+        price = UsMarket('AAPL', *PRICE_PERIOD).get_price_data()
+        assert pd.isna(price.loc[1, 'Close'])
+        assert price['Volume'].dtype == 'float64'
+
+
+def investing_prices(rows):
+    """Build a response body of investing.com historical data."""
+    cells = ''.join(
+        '<tr>' + ''.join(f'<td>{x}</td>' for x in row) + '</tr>'
+        for row in rows
+    )
+    html = (
+        '<table><thead><tr><th>Date</th><th>Price</th><th>Open</th>'
+        '<th>High</th><th>Low</th><th>Vol.</th><th>Change %</th></tr>'
+        f'</thead><tbody>{cells}</tbody></table>'
+    )
+    return FakeResponse(content=html.encode('utf-8'))
+
+
+class TestKorPrice:
+    """Test converting investing.com historical data to a dataframe."""
+
+    def test_volume_suffixes(self, fake_session, monkeypatch):
+        """Test volumes with any suffix, or none, are parsed."""
+        monkeypatch.setattr(search, '_pair_id_cache', PairIdCache())
+        fake_session.responses = [
+            investing_quotes(102047),
+            investing_prices([
+                ['Aug 04, 2021', '81,500', '82,200', '82,300', '81,400',
+                 '12.34M', '-0.12%'],
+                ['Aug 03, 2021', '82,000', '81,100', '82,100', '81,000',
+                 '1.2B', '1.24%'],
+                ['Aug 02, 2021', '81,000', '80,000', '81,000', '80,000',
+                 '950.5K', '0.50%'],
+                ['Jul 30, 2021', '80,600', '80,500', '80,900', '80,400',
+                 '123', '0.00%'],
+            ]),
+        ]
+        price = KorMarket('005930', *PRICE_PERIOD).get_price_data()
+        assert price['Volume'].tolist() == [
+            12_340_000, 1_200_000_000, 950_500, 123,
+        ]
+        assert price['Volume'].dtype == 'int64'
+        assert price['Close'].tolist()[:2] == [81500.0, 82000.0]
+
+    def test_missing_volume_dropped(self, fake_session, monkeypatch):
+        """Test a day without volume is left out."""
+        monkeypatch.setattr(search, '_pair_id_cache', PairIdCache())
+        fake_session.responses = [
+            investing_quotes(102047),
+            investing_prices([
+                ['Aug 04, 2021', '81,500', '82,200', '82,300', '81,400',
+                 '12.34M', '-0.12%'],
+                ['Aug 03, 2021', '82,000', '81,100', '82,100', '81,000',
+                 '-', '1.24%'],
+            ]),
+        ]
+        price = KorMarket('005930', *PRICE_PERIOD).get_price_data()
+        assert price['Date'].tolist() == [pd.Timestamp('2021-08-04')]
+
+
+class TestPriceInterval:
+    """Test retrieving prices of other intervals than a day."""
+
+    def test_daily_in_one_request(self, fake_session):
+        """Test a long range of daily prices is retrieved at once."""
+        fake_session.responses = [yahoo_chart([1627997400], [147.36])]
+        start = pd.Timestamp('2001-08-03')
+        UsMarket('AAPL', start, PRICE_PERIOD[1]).get_price_data()
+        assert len(fake_session.calls) == 1
+        assert 'interval=1d' in fake_session.calls[0][1]
+
+    def test_windows(self):
+        """Test a range is split into windows Yahoo returns at once."""
+        price = UsMarket('AAPL', pd.Timestamp('2021-08-01'),
+                         pd.Timestamp('2021-08-16'), interval='1m')
+        assert price._get_windows() == [
+            (pd.Timestamp('2021-08-01'), pd.Timestamp('2021-08-08')),
+            (pd.Timestamp('2021-08-08'), pd.Timestamp('2021-08-15')),
+            (pd.Timestamp('2021-08-15'), pd.Timestamp('2021-08-17')),
+        ]
+
+    def test_windows_stitched(self, fake_session):
+        """Test prices of the windows are joined once each, in order."""
+        # 2021-08-03 09:30 and 09:31 in New York, the latter in both windows
+        first = yahoo_chart([1627997400, 1627997460], [147.36, 147.4])
+        second = yahoo_chart([1627997460, 1627997520], [147.4, 147.5])
+        fake_session.routes = {
+            f'period1={date.date_to_timestamp(pd.Timestamp("2021-08-01"))}':
+                first,
+            f'period1={date.date_to_timestamp(pd.Timestamp("2021-08-08"))}':
+                second,
+        }
+        fake_session.responses = [yahoo_chart([], [])]
+        price = Stock('AAPL').price('2021-8-1', '2021-8-10', interval='1m')
+        assert len(fake_session.calls) == 2
+        assert all('interval=1m' in x[1] for x in fake_session.calls)
+        assert price['Date'].tolist() == [
+            pd.Timestamp('2021-08-03 09:30'),
+            pd.Timestamp('2021-08-03 09:31'),
+            pd.Timestamp('2021-08-03 09:32'),
+        ]
+        assert price['Close'].tolist() == [147.36, 147.4, 147.5]
+
+    def test_empty_windows_skipped(self, fake_session):
+        """Test a window without prices, e.g. a holiday, is left out."""
+        empty = {'chart': {'result': [{'meta': {}}], 'error': None}}
+        fake_session.routes = {
+            f'period1={date.date_to_timestamp(pd.Timestamp("2021-08-01"))}':
+                FakeResponse(content=json.dumps(empty).encode('utf-8')),
+        }
+        fake_session.responses = [yahoo_chart([1628602200], [145.6])]
+        price = UsMarket('AAPL', pd.Timestamp('2021-08-01'),
+                         pd.Timestamp('2021-08-10'),
+                         interval='1m').get_price_data()
+        assert price['Date'].tolist() == [pd.Timestamp('2021-08-10 09:30')]
+
+    def test_windows_beyond_lookback(self, fake_session):
+        """Test windows older than Yahoo keeps are left out."""
+        null = {'chart': {'result': None, 'error': None}}
+        fake_session.routes = {
+            f'period1={date.date_to_timestamp(pd.Timestamp("2021-08-01"))}':
+                FakeResponse(status_code=422),
+            f'period1={date.date_to_timestamp(pd.Timestamp("2021-08-08"))}':
+                FakeResponse(content=json.dumps(null).encode('utf-8')),
+        }
+        fake_session.responses = [yahoo_chart([1628861400], [148.9])]
+        price = UsMarket('AAPL', pd.Timestamp('2021-08-01'),
+                         pd.Timestamp('2021-08-16'),
+                         interval='1m').get_price_data()
+        assert len(fake_session.calls) == 3
+        assert price['Date'].tolist() == [pd.Timestamp('2021-08-13 09:30')]
+
+    def test_every_window_failed(self, fake_session):
+        """Test the error is raised when no window could be retrieved."""
+        fake_session.responses = [FakeResponse(status_code=422)]
+        price = UsMarket('AAPL', pd.Timestamp('2021-08-01'),
+                         pd.Timestamp('2021-08-16'), interval='1m')
+        with pytest.raises(requests.HTTPError):
+            price.get_price_data()
+
+    def test_kor_weekly(self, fake_session, monkeypatch):
+        """Test investing.com is asked for weekly prices."""
+        monkeypatch.setattr(search, '_pair_id_cache', PairIdCache())
+        fake_session.responses = [
+            investing_quotes(102047),
+            investing_prices([
+                ['Aug 01, 2021', '81,500', '82,200', '82,300', '81,400',
+                 '52.34M', '-0.12%'],
+            ]),
+        ]
+        KorMarket('005930', *PRICE_PERIOD, interval='1wk').get_price_data()
+        assert fake_session.calls[-1][2]['data']['interval_sec'] == 'Weekly'
+
+    @pytest.mark.parametrize('market', [UsMarket, KorMarket])
+    def test_interval_not_available(self, market):
+        """Test an interval the source does not support is rejected."""
+        with pytest.raises(NotAvailable):
+            market('AAPL', *PRICE_PERIOD, interval='7m')